@@ -0,0 +1,69 @@
+# =============================================================
+# CongregaFiel — Armazenamento (FastAPI)
+# Ponto único de acesso aos dados das rotas e relatórios.
+# A implementação é escolhida pela variável ARMAZENAMENTO:
+#   supabase (padrão) — PostgREST pelo cliente assíncrono do Supabase
+#   sqlite            — banco embutido (SQLITE_CAMINHO) criado a
+#                       partir de database/schema.sql
+# As duas expõem o mesmo subconjunto do query builder do
+# postgrest-py, então o código chamador não muda.
+# A autenticação continua sempre no Supabase Auth.
+# =============================================================
+
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Protocol
+
+from supabase_client import supabase
+
+ARMAZENAMENTO = os.getenv("ARMAZENAMENTO", "supabase").lower()
+SQLITE_CAMINHO = os.getenv("SQLITE_CAMINHO", str(Path(__file__).resolve().parent / "congregafiel.db"))
+
+
+class Resposta(Protocol):
+    data: Any
+
+
+class Consulta(Protocol):
+    """Formas de consulta usadas pela API (subconjunto do postgrest-py)."""
+
+    def select(self, *colunas: str, **opcoes: Any) -> "Consulta": ...
+    def insert(self, dados: Any, **opcoes: Any) -> "Consulta": ...
+    def update(self, dados: Dict[str, Any], **opcoes: Any) -> "Consulta": ...
+    def delete(self, **opcoes: Any) -> "Consulta": ...
+    def eq(self, coluna: str, valor: Any) -> "Consulta": ...
+    def neq(self, coluna: str, valor: Any) -> "Consulta": ...
+    def gt(self, coluna: str, valor: Any) -> "Consulta": ...
+    def gte(self, coluna: str, valor: Any) -> "Consulta": ...
+    def lt(self, coluna: str, valor: Any) -> "Consulta": ...
+    def lte(self, coluna: str, valor: Any) -> "Consulta": ...
+    def in_(self, coluna: str, valores: Iterable[Any]) -> "Consulta": ...
+    def or_(self, filtros: str) -> "Consulta": ...
+    def order(self, coluna: str, *, desc: bool = False, **opcoes: Any) -> "Consulta": ...
+    def limit(self, quantidade: int, **opcoes: Any) -> "Consulta": ...
+    async def execute(self) -> Resposta: ...
+
+
+class Armazenamento(Protocol):
+    def table(self, nome: str) -> Consulta: ...
+    def rpc(self, funcao: str, parametros: Dict[str, Any]) -> Consulta: ...
+
+
+def criar_armazenamento() -> Armazenamento:
+    """Instancia o armazenamento configurado em ARMAZENAMENTO."""
+    if ARMAZENAMENTO == "sqlite":
+        from armazenamento_sqlite import ArmazenamentoSQLite
+        return ArmazenamentoSQLite(SQLITE_CAMINHO)
+    if ARMAZENAMENTO != "supabase":
+        raise RuntimeError(f"ARMAZENAMENTO inválido: {ARMAZENAMENTO} (use supabase ou sqlite)")
+    # O AsyncClient do Supabase já implementa table() e rpc() com esse builder
+    return supabase
+
+
+banco: Armazenamento = criar_armazenamento()
+
+
+def fechar_armazenamento() -> None:
+    """Fecha a conexão do banco local (modo SQLite) no encerramento do servidor."""
+    if ARMAZENAMENTO == "sqlite":
+        banco.fechar()
@@ -0,0 +1,662 @@
+# =============================================================
+# CongregaFiel — Armazenamento SQLite (modo local / nó único)
+# Banco embutido com o schema de database/schema.sql traduzido
+# para o SQLite, um query builder compatível com o do postgrest-py
+# e as funções RPC dos relatórios e do registro reescritas aqui.
+# Usado para rodar a API offline, em CI e em testes de carga.
+# =============================================================
+
+import asyncio
+import json
+import re
+import sqlite3
+import threading
+import zlib
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+_RAIZ = Path(__file__).resolve().parent.parent
+ARQUIVO_SCHEMA = _RAIZ / "database" / "schema.sql"
+PASTA_MIGRACOES = _RAIZ / "database" / "migrations"
+
+_IDENTIFICADOR = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+# -------------------- Tradução do schema (PostgreSQL -> SQLite) --------------------
+_EXPR_UUID = (
+    "(lower(hex(randomblob(4)) || '-' || hex(randomblob(2)) || '-4' || "
+    "substr(hex(randomblob(2)), 2) || '-' || substr('89ab', 1 + abs(random()) % 4, 1) || "
+    "substr(hex(randomblob(2)), 2) || '-' || hex(randomblob(6))))"
+)
+_EXPR_AGORA = "(strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))"
+
+_TRADUCOES = (
+    (r"DEFAULT\s+uuid_generate_v4\(\)", "DEFAULT " + _EXPR_UUID),
+    (r"DEFAULT\s+NOW\(\)", "DEFAULT " + _EXPR_AGORA),
+    (r"\bUUID\b", "TEXT"),
+    (r"\bTIMESTAMPTZ\b|\bTIMESTAMP\b|\bDATE\b", "TEXT"),
+    (r"\bVARCHAR\(\d+\)", "TEXT"),
+    (r"\bDECIMAL\(\d+,\s*\d+\)|\bNUMERIC\(\d+,\s*\d+\)|\bDOUBLE PRECISION\b", "REAL"),
+)
+
+# Statements do schema.sql que têm equivalente no SQLite; o resto
+# (extensões, funções plpgsql, triggers, RLS) é recriado abaixo ou não se aplica
+_STATEMENTS_SUPORTADOS = ("CREATE TABLE", "CREATE INDEX", "INSERT INTO")
+
+
+def _dividir_statements(sql: str) -> List[str]:
+    """Separa os statements por ';' respeitando blocos $$ ... $$ e comentários."""
+    sql = "\n".join(linha for linha in sql.splitlines() if not linha.strip().startswith("--"))
+    statements, atual, em_bloco = [], [], False
+    for parte in re.split(r"(\$\$|;)", sql):
+        if parte == "$$":
+            em_bloco = not em_bloco
+        if parte == ";" and not em_bloco:
+            statements.append("".join(atual).strip())
+            atual = []
+        else:
+            atual.append(parte)
+    if "".join(atual).strip():
+        statements.append("".join(atual).strip())
+    return [s for s in statements if s]
+
+
+def traduzir_statement(statement: str) -> str:
+    for padrao, substituto in _TRADUCOES:
+        statement = re.sub(padrao, substituto, statement)
+    return statement
+
+
+def _identificador(nome: str) -> str:
+    nome = nome.strip()
+    if not _IDENTIFICADOR.match(nome):
+        raise ValueError(f"Identificador inválido: {nome!r}")
+    return f'"{nome}"'
+
+
+class RespostaSQLite:
+    def __init__(self, data: Any):
+        self.data = data
+        self.count = None
+
+
+# Equivalente a aplicar_saldo_mensal(): cria o ponto do mês a partir do
+# anterior e soma o valor nele e nos meses seguintes da igreja
+_SALDO_MENSAL = """
+    INSERT OR IGNORE INTO saldos_mensais (igreja_id, mes, saldo)
+    SELECT {linha}.igreja_id, strftime('%Y-%m-01', {linha}.data), COALESCE((
+             SELECT s.saldo FROM saldos_mensais s
+              WHERE s.igreja_id = {linha}.igreja_id AND s.mes < strftime('%Y-%m-01', {linha}.data)
+              ORDER BY s.mes DESC LIMIT 1
+           ), 0)
+     WHERE {linha}.igreja_id IS NOT NULL AND {linha}.data IS NOT NULL;
+    UPDATE saldos_mensais SET saldo = saldo + {sinal}COALESCE({linha}.valor, 0)
+     WHERE igreja_id = {linha}.igreja_id AND mes >= strftime('%Y-%m-01', {linha}.data);
+"""
+
+
+# =============================================
+# QUERY BUILDER
+# =============================================
+
+_OPERADORES = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+def _dividir_nivel_superior(texto: str) -> List[str]:
+    """Divide por vírgulas fora de parênteses e aspas (sintaxe do PostgREST)."""
+    partes, atual, profundidade, aspas = [], [], 0, False
+    for caractere in texto:
+        if caractere == '"':
+            aspas = not aspas
+        elif not aspas and caractere == "(":
+            profundidade += 1
+        elif not aspas and caractere == ")":
+            profundidade -= 1
+        elif not aspas and caractere == "," and profundidade == 0:
+            partes.append("".join(atual))
+            atual = []
+            continue
+        atual.append(caractere)
+    partes.append("".join(atual))
+    return [p.strip() for p in partes if p.strip()]
+
+
+def _traduzir_logica(expressao: str, juncao: str, parametros: List[Any]) -> str:
+    """Converte filtros lógicos do PostgREST (or=(a.eq.1,and(b.gt.2,...))) em SQL."""
+    condicoes = []
+    for parte in _dividir_nivel_superior(expressao):
+        aninhada = re.match(r"^(and|or)\((.*)\)$", parte, re.S)
+        if aninhada:
+            sub = _traduzir_logica(aninhada.group(2), aninhada.group(1).upper(), parametros)
+            condicoes.append(f"({sub})")
+            continue
+        coluna, operador, valor = parte.split(".", 2)
+        if operador == "is" and valor.lower() == "null":
+            condicoes.append(f"{_identificador(coluna)} IS NULL")
+            continue
+        if operador == "not" and valor.lower() == "is.null":
+            condicoes.append(f"{_identificador(coluna)} IS NOT NULL")
+            continue
+        if operador not in _OPERADORES:
+            raise ValueError(f"Operador não suportado no modo SQLite: {operador}")
+        if len(valor) >= 2 and valor[0] == valor[-1] == '"':
+            valor = valor[1:-1]
+        condicoes.append(f"{_identificador(coluna)} {_OPERADORES[operador]} ?")
+        parametros.append(valor)
+    return f" {juncao} ".join(condicoes)
+
+
+class ConsultaSQLite:
+    """Query builder com a mesma interface encadeável do postgrest-py."""
+
+    def __init__(self, banco: "ArmazenamentoSQLite", tabela: str):
+        self._banco = banco
+        self.tabela = tabela
+        self.operacao = "select"
+        self._colunas: List[str] = []
+        self._embutidos: List[str] = []
+        self._condicoes: List[str] = []
+        self._parametros: List[Any] = []
+        self._ordem: List[str] = []
+        self._limite: Optional[int] = None
+        self._dados: Any = None
+
+    # -------------------- Operações --------------------
+
+    def select(self, *colunas: str, **_: Any) -> "ConsultaSQLite":
+        self.operacao = "select"
+        for coluna in _dividir_nivel_superior(",".join(colunas) or "*"):
+            embutido = re.match(r"^(\w+)\((.*)\)$", coluna, re.S)
+            if embutido:
+                self._colunas.append(self._subconsulta_embutida(embutido.group(1), embutido.group(2)))
+                self._embutidos.append(embutido.group(1))
+            elif coluna == "*":
+                self._colunas.append(f"{_identificador(self.tabela)}.*")
+            else:
+                self._colunas.append(f"{_identificador(self.tabela)}.{_identificador(coluna)}")
+        return self
+
+    def _subconsulta_embutida(self, tabela: str, colunas: str) -> str:
+        """Recurso embutido muitos-para-um (ex.: membros -> igrejas(nome)) via FK <singular>_id."""
+        chave = _identificador(tabela[:-1] + "_id" if tabela.endswith("s") else tabela + "_id")
+        pares = ", ".join(
+            f"'{c}', e.{_identificador(c)}" for c in (c.strip() for c in colunas.split(",")) if c
+        )
+        return (
+            f"(SELECT json_object({pares}) FROM {_identificador(tabela)} e "
+            f"WHERE e.id = {_identificador(self.tabela)}.{chave}) AS {_identificador(tabela)}"
+        )
+
+    def insert(self, dados: Any, **_: Any) -> "ConsultaSQLite":
+        self.operacao = "insert"
+        self._dados = dados
+        return self
+
+    def update(self, dados: Dict[str, Any], **_: Any) -> "ConsultaSQLite":
+        self.operacao = "update"
+        self._dados = dados
+        return self
+
+    def delete(self, **_: Any) -> "ConsultaSQLite":
+        self.operacao = "delete"
+        return self
+
+    # -------------------- Filtros --------------------
+
+    def _comparar(self, coluna: str, operador: str, valor: Any) -> "ConsultaSQLite":
+        self._condicoes.append(f"{_identificador(coluna)} {operador} ?")
+        self._parametros.append(valor)
+        return self
+
+    def eq(self, coluna: str, valor: Any) -> "ConsultaSQLite":
+        return self._comparar(coluna, "=", valor)
+
+    def neq(self, coluna: str, valor: Any) -> "ConsultaSQLite":
+        return self._comparar(coluna, "<>", valor)
+
+    def gt(self, coluna: str, valor: Any) -> "ConsultaSQLite":
+        return self._comparar(coluna, ">", valor)
+
+    def gte(self, coluna: str, valor: Any) -> "ConsultaSQLite":
+        return self._comparar(coluna, ">=", valor)
+
+    def lt(self, coluna: str, valor: Any) -> "ConsultaSQLite":
+        return self._comparar(coluna, "<", valor)
+
+    def lte(self, coluna: str, valor: Any) -> "ConsultaSQLite":
+        return self._comparar(coluna, "<=", valor)
+
+    def in_(self, coluna: str, valores: Iterable[Any]) -> "ConsultaSQLite":
+        valores = list(valores)
+        if not valores:
+            self._condicoes.append("0")
+            return self
+        self._condicoes.append(f"{_identificador(coluna)} IN ({', '.join('?' * len(valores))})")
+        self._parametros.extend(valores)
+        return self
+
+    def or_(self, filtros: str, **_: Any) -> "ConsultaSQLite":
+        self._condicoes.append(f"({_traduzir_logica(filtros, 'OR', self._parametros)})")
+        return self
+
+    def order(
+        self, coluna: str, *, desc: bool = False, nullsfirst: Optional[bool] = None, **_: Any
+    ) -> "ConsultaSQLite":
+        # Sem nullsfirst, o padrão do PostgreSQL: nulos por último em ASC e primeiro em DESC
+        if nullsfirst is None:
+            nullsfirst = desc
+        direcao = f"{'DESC' if desc else 'ASC'} NULLS {'FIRST' if nullsfirst else 'LAST'}"
+        self._ordem.append(f"{_identificador(self.tabela)}.{_identificador(coluna)} {direcao}")
+        return self
+
+    def limit(self, quantidade: int, **_: Any) -> "ConsultaSQLite":
+        self._limite = int(quantidade)
+        return self
+
+    # -------------------- Execução --------------------
+
+    def rotulos(self) -> Tuple[str, str]:
+        """(tabela, operacao) para as métricas."""
+        return self.tabela, self.operacao
+
+    def _where(self) -> str:
+        return f" WHERE {' AND '.join(self._condicoes)}" if self._condicoes else ""
+
+    def montar_sql(self) -> Tuple[str, List[Any]]:
+        tabela = _identificador(self.tabela)
+
+        if self.operacao == "select":
+            colunas = ", ".join(self._colunas) or f"{tabela}.*"
+            sql = f"SELECT {colunas} FROM {tabela}{self._where()}"
+            if self._ordem:
+                sql += f" ORDER BY {', '.join(self._ordem)}"
+            if self._limite is not None:
+                sql += f" LIMIT {self._limite}"
+            return sql, list(self._parametros)
+
+        if self.operacao == "insert":
+            linhas = self._dados if isinstance(self._dados, list) else [self._dados]
+            # Como no postgrest-py: em lote, chaves ausentes viram NULL
+            nomes = list(dict.fromkeys(c for linha in linhas for c in linha))
+            grupo = f"({', '.join('?' * len(nomes))})"
+            sql = (
+                f"INSERT INTO {tabela} ({', '.join(_identificador(c) for c in nomes)}) "
+                f"VALUES {', '.join([grupo] * len(linhas))} RETURNING *"
+            )
+            return sql, [_valor_sql(linha.get(c)) for linha in linhas for c in nomes]
+
+        if self.operacao == "update":
+            atribuicoes = ", ".join(f"{_identificador(c)} = ?" for c in self._dados)
+            sql = f"UPDATE {tabela} SET {atribuicoes}{self._where()} RETURNING *"
+            return sql, [_valor_sql(v) for v in self._dados.values()] + list(self._parametros)
+
+        sql = f"DELETE FROM {tabela}{self._where()} RETURNING *"
+        return sql, list(self._parametros)
+
+    async def execute(self) -> RespostaSQLite:
+        sql, parametros = self.montar_sql()
+        linhas = await self._banco.executar(sql, parametros)
+        for linha in linhas:
+            for embutido in self._embutidos:
+                if linha.get(embutido) is not None:
+                    linha[embutido] = json.loads(linha[embutido])
+        return RespostaSQLite(linhas)
+
+
+def _valor_sql(valor: Any) -> Any:
+    """Listas e dicts (colunas JSON) são gravados como texto JSON."""
+    if isinstance(valor, (list, dict)):
+        return json.dumps(valor, ensure_ascii=False)
+    return valor
+
+
+class RpcSQLite:
+    """Chamada de função (equivalente a supabase.rpc(...))."""
+
+    def __init__(self, banco: "ArmazenamentoSQLite", funcao: str, parametros: Dict[str, Any]):
+        self._banco = banco
+        self.funcao = funcao
+        self._parametros = parametros
+
+    def rotulos(self) -> Tuple[str, str]:
+        return self.funcao, "rpc"
+
+    async def execute(self) -> RespostaSQLite:
+        implementacao = _FUNCOES_RPC.get(self.funcao)
+        if implementacao is None:
+            raise ValueError(f"Função RPC não disponível no modo SQLite: {self.funcao}")
+        return RespostaSQLite(await self._banco.em_transacao(implementacao, **self._parametros))
+
+
+# =============================================
+# BANCO
+# =============================================
+
+class ArmazenamentoSQLite:
+    """
+    Uma conexão compartilhada, usada por uma thread de cada vez: as chamadas
+    rodam no pool de threads para não bloquear o event loop.
+    """
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        self._conexao: Optional[sqlite3.Connection] = None
+        self._trava = threading.Lock()
+
+    def table(self, nome: str) -> ConsultaSQLite:
+        return ConsultaSQLite(self, nome)
+
+    def rpc(self, funcao: str, parametros: Dict[str, Any]) -> RpcSQLite:
+        return RpcSQLite(self, funcao, parametros)
+
+    # -------------------- Conexão e schema --------------------
+
+    def _conectar(self) -> sqlite3.Connection:
+        if self._conexao is not None:
+            return self._conexao
+
+        # A impressão das contribuições usa a mesma fórmula da API (import tardio:
+        # contribuicoes_utils depende deste armazenamento)
+        from contribuicoes_utils import impressao_contribuicao
+
+        def impressao(membro_id, tipo, valor, data):
+            if None in (membro_id, tipo, valor, data):
+                return None
+            return impressao_contribuicao(membro_id, tipo, valor, date.fromisoformat(data))
+
+        conexao = sqlite3.connect(self.caminho, check_same_thread=False, isolation_level=None)
+        conexao.row_factory = sqlite3.Row
+        conexao.create_function("impressao_contribuicao", 4, impressao, deterministic=True)
+        conexao.execute("PRAGMA foreign_keys = ON")
+        if self.caminho != ":memory:":
+            conexao.execute("PRAGMA journal_mode = WAL")
+            conexao.execute("PRAGMA synchronous = NORMAL")
+        self._preparar_schema(conexao)
+        self._conexao = conexao
+        return conexao
+
+    def _preparar_schema(self, conexao: sqlite3.Connection) -> None:
+        """Cria o schema (e os dados de exemplo) num banco novo e aplica os complementos."""
+        novo = conexao.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'igrejas'"
+        ).fetchone() is None
+
+        conexao.execute("BEGIN")
+        try:
+            if novo:
+                for statement in _dividir_statements(ARQUIVO_SCHEMA.read_text(encoding="utf-8")):
+                    if statement.upper().startswith(_STATEMENTS_SUPORTADOS):
+                        conexao.execute(traduzir_statement(statement))
+            self._aplicar_complementos(conexao)
+            conexao.execute("COMMIT")
+        except Exception:
+            conexao.execute("ROLLBACK")
+            raise
+
+    def _aplicar_complementos(self, conexao: sqlite3.Connection) -> None:
+        """Colunas, triggers e índices que no Supabase vêm das migrações."""
+        from campos_utils import CAMPOS_PERMITIDOS
+
+        for tabela, colunas in CAMPOS_PERMITIDOS.items():
+            existentes = {c["name"] for c in conexao.execute(f"PRAGMA table_info({_identificador(tabela)})")}
+            for coluna in colunas:
+                if coluna not in existentes:
+                    conexao.execute(f"ALTER TABLE {_identificador(tabela)} ADD COLUMN {_identificador(coluna)}")
+
+            # atualizado_em (no PostgreSQL: trigger atualizar_atualizado_em)
+            if "atualizado_em" in existentes or "atualizado_em" in colunas:
+                conexao.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trigger_{tabela}_atualizado_em
+                    AFTER UPDATE ON {_identificador(tabela)} FOR EACH ROW
+                    WHEN NEW.atualizado_em IS OLD.atualizado_em
+                    BEGIN
+                      UPDATE {_identificador(tabela)} SET atualizado_em = {_EXPR_AGORA} WHERE rowid = NEW.rowid;
+                    END
+                """)
+
+        # 012-create-contribuicoes-impressao.sql
+        colunas = {c["name"] for c in conexao.execute("PRAGMA table_xinfo(contribuicoes)")}
+        if "impressao" not in colunas:
+            conexao.execute(
+                "ALTER TABLE contribuicoes ADD COLUMN impressao TEXT GENERATED ALWAYS AS "
+                "(impressao_contribuicao(membro_id, tipo, valor, data)) VIRTUAL"
+            )
+
+        # 014-create-codigos-igreja.sql
+        conexao.execute("""
+            CREATE TABLE IF NOT EXISTS codigos_igreja_prefixos (
+              prefixo TEXT PRIMARY KEY,
+              digitos INTEGER NOT NULL DEFAULT 4,
+              proximo INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        # 015-create-saldos-mensais.sql (sem o livro-razão diário: os triggers
+        # ficam direto em contribuicoes)
+        novo_saldos = conexao.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'saldos_mensais'"
+        ).fetchone() is None
+        conexao.execute("""
+            CREATE TABLE IF NOT EXISTS saldos_mensais (
+              igreja_id TEXT NOT NULL REFERENCES igrejas(id) ON DELETE CASCADE,
+              mes TEXT NOT NULL,
+              saldo REAL NOT NULL DEFAULT 0,
+              PRIMARY KEY (igreja_id, mes)
+            )
+        """)
+        if novo_saldos:
+            conexao.execute("""
+                INSERT INTO saldos_mensais (igreja_id, mes, saldo)
+                SELECT igreja_id, mes, SUM(total) OVER (PARTITION BY igreja_id ORDER BY mes)
+                  FROM (
+                    SELECT igreja_id, strftime('%Y-%m-01', data) AS mes, SUM(valor) AS total
+                      FROM contribuicoes
+                     WHERE igreja_id IS NOT NULL AND data IS NOT NULL
+                     GROUP BY 1, 2
+                  )
+            """)
+        for nome, evento, linhas in (
+            ("insert", "INSERT", ("NEW",)),
+            ("update", "UPDATE OF igreja_id, data, valor", ("OLD", "NEW")),
+            ("delete", "DELETE", ("OLD",)),
+        ):
+            corpo = "".join(_SALDO_MENSAL.format(linha=linha, sinal="-" if linha == "OLD" else "")
+                            for linha in linhas)
+            conexao.execute(
+                f"CREATE TRIGGER IF NOT EXISTS trigger_saldos_mensais_{nome} "
+                f"AFTER {evento} ON contribuicoes FOR EACH ROW BEGIN {corpo} END"
+            )
+
+        # Índices das migrações; os de tabelas que só existem no Supabase
+        # (pagamentos, tokens...) são ignorados
+        for arquivo in sorted(PASTA_MIGRACOES.glob("*.sql")):
+            for statement in _dividir_statements(arquivo.read_text(encoding="utf-8")):
+                if statement.upper().startswith(("CREATE INDEX", "CREATE UNIQUE INDEX")):
+                    try:
+                        conexao.execute(traduzir_statement(statement))
+                    except sqlite3.OperationalError:
+                        pass
+
+    # -------------------- Execução --------------------
+
+    def _executar(self, sql: str, parametros: List[Any]) -> List[Dict[str, Any]]:
+        with self._trava:
+            return [dict(linha) for linha in self._conectar().execute(sql, parametros).fetchall()]
+
+    async def executar(self, sql: str, parametros: List[Any]) -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._executar, sql, parametros)
+
+    def _em_transacao(self, funcao: Callable[..., Any], **parametros: Any) -> Any:
+        with self._trava:
+            conexao = self._conectar()
+            conexao.execute("BEGIN IMMEDIATE")
+            try:
+                resultado = funcao(conexao, **parametros)
+                conexao.execute("COMMIT")
+                return resultado
+            except Exception:
+                conexao.execute("ROLLBACK")
+                raise
+
+    async def em_transacao(self, funcao: Callable[..., Any], **parametros: Any) -> Any:
+        return await asyncio.to_thread(self._em_transacao, funcao, **parametros)
+
+    def fechar(self) -> None:
+        with self._trava:
+            if self._conexao is not None:
+                self._conexao.close()
+                self._conexao = None
+
+
+# =============================================
+# FUNÇÕES RPC (equivalentes às de database/migrations)
+# =============================================
+
+def _linhas(conexao: sqlite3.Connection, sql: str, parametros: Iterable[Any] = ()) -> List[Dict[str, Any]]:
+    return [dict(linha) for linha in conexao.execute(sql, list(parametros)).fetchall()]
+
+
+def _relatorio_totais_mensais(conexao, p_igreja_id, p_data_inicio, p_data_fim):
+    # Sem o livro-razão diário: no SQLite o GROUP BY direto pelo índice (igreja_id, data) basta
+    return _linhas(conexao, """
+        SELECT strftime('%Y-%m', data) AS mes, tipo, SUM(valor) AS total, COUNT(*) AS quantidade
+          FROM contribuicoes
+         WHERE igreja_id = ?
+           AND data BETWEEN ? AND ?
+         GROUP BY 1, 2
+         ORDER BY 1, 2
+    """, (p_igreja_id, p_data_inicio, p_data_fim))
+
+
+def _relatorio_top_contribuintes(conexao, p_igreja_id, p_limite=10, p_data_inicio=None, p_data_fim=None):
+    return _linhas(conexao, """
+        SELECT c.membro_id,
+               COALESCE(m.nome_completo, 'Desconhecido') AS nome,
+               COALESCE(m.email, '') AS email,
+               SUM(c.valor) AS total,
+               COUNT(*) AS contribuicoes
+          FROM contribuicoes c
+          LEFT JOIN membros m ON m.id = c.membro_id
+         WHERE c.igreja_id = ?
+           AND (? IS NULL OR c.data >= ?)
+           AND (? IS NULL OR c.data <= ?)
+         GROUP BY c.membro_id, m.nome_completo, m.email
+         ORDER BY total DESC
+         LIMIT ?
+    """, (p_igreja_id, p_data_inicio, p_data_inicio, p_data_fim, p_data_fim, p_limite))
+
+
+def _relatorio_inadimplentes(conexao, p_igreja_id, p_data_limite):
+    return _linhas(conexao, """
+        SELECT m.id AS membro_id,
+               m.nome_completo AS nome,
+               COALESCE(m.email, '') AS email,
+               (SELECT MAX(c.data) FROM contribuicoes c
+                 WHERE c.membro_id = m.id AND c.igreja_id = m.igreja_id) AS ultima_contribuicao
+          FROM membros m
+         WHERE m.igreja_id = ?
+           AND (ultima_contribuicao IS NULL OR ultima_contribuicao < ?)
+         ORDER BY m.criado_em
+    """, (p_igreja_id, p_data_limite))
+
+
+def _relatorio_saldo_ate(conexao, p_igreja_id, p_data):
+    mes = p_data[:7] + "-01"
+    return conexao.execute("""
+        SELECT COALESCE((
+                 SELECT s.saldo FROM saldos_mensais s
+                  WHERE s.igreja_id = ? AND s.mes < ?
+                  ORDER BY s.mes DESC LIMIT 1
+               ), 0)
+             + COALESCE((
+                 SELECT SUM(valor) FROM contribuicoes
+                  WHERE igreja_id = ? AND data >= ? AND data <= ?
+               ), 0)
+    """, (p_igreja_id, mes, p_igreja_id, mes, p_data)).fetchone()[0]
+
+
+def _relatorio_fluxo_caixa(conexao, p_igreja_id, p_data_inicio, p_data_fim):
+    vespera = (date.fromisoformat(p_data_inicio) - timedelta(days=1)).isoformat()
+    abertura = _relatorio_saldo_ate(conexao, p_igreja_id, vespera)
+    linhas = _linhas(conexao, """
+        SELECT d.dia,
+               d.entrada,
+               d.quantidade,
+               ? + SUM(d.entrada) OVER (ORDER BY d.dia) AS saldo_acumulado,
+               d.detalhes
+          FROM (
+            SELECT c.data AS dia,
+                   SUM(c.valor) AS entrada,
+                   COUNT(*) AS quantidade,
+                   json_group_array(json_object(
+                     'membro_id', c.membro_id,
+                     'tipo', c.tipo,
+                     'valor', c.valor
+                   )) AS detalhes
+              FROM (
+                SELECT membro_id, tipo, valor, data
+                  FROM contribuicoes
+                 WHERE igreja_id = ?
+                   AND data BETWEEN ? AND ?
+                 ORDER BY data, criado_em
+              ) c
+             GROUP BY c.data
+          ) d
+         ORDER BY d.dia
+    """, (abertura, p_igreja_id, p_data_inicio, p_data_fim))
+    for linha in linhas:
+        linha["detalhes"] = json.loads(linha["detalhes"])
+    return linhas
+
+
+def _alocar_codigo_igreja(conexao, p_prefixo):
+    """Mesmo algoritmo de 014-create-codigos-igreja.sql (contador permutado por prefixo)."""
+    prefixo = p_prefixo.upper()
+    conexao.execute("INSERT OR IGNORE INTO codigos_igreja_prefixos (prefixo) VALUES (?)", (prefixo,))
+    while True:
+        digitos, n = conexao.execute(
+            "UPDATE codigos_igreja_prefixos SET proximo = proximo + 1 WHERE prefixo = ? "
+            "RETURNING digitos, proximo - 1",
+            (prefixo,),
+        ).fetchone()
+        base = 10 ** (digitos - 1)
+        capacidade = 9 * base
+        if n >= capacidade:
+            if digitos >= 8:
+                raise ValueError(f"Códigos esgotados para o prefixo {prefixo}")
+            conexao.execute(
+                "UPDATE codigos_igreja_prefixos SET digitos = digitos + 1, proximo = 0 WHERE prefixo = ?",
+                (prefixo,),
+            )
+            continue
+        codigo = f"{prefixo}{base + (7919 * n + zlib.crc32(prefixo.encode()) % capacidade) % capacidade}"
+        if conexao.execute("SELECT 1 FROM igrejas WHERE codigo = ?", (codigo,)).fetchone() is None:
+            return codigo
+
+
+def _registrar_igreja(conexao, p_id, p_nome, p_nome_pastor, p_email, p_prefixo,
+                      p_endereco=None, p_latitude=None, p_longitude=None):
+    codigo = _alocar_codigo_igreja(conexao, p_prefixo)
+    igreja = dict(conexao.execute(
+        "INSERT INTO igrejas (id, nome, nome_pastor, email, codigo, endereco, latitude, longitude) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?) RETURNING *",
+        (p_id, p_nome, p_nome_pastor, p_email, codigo, p_endereco or "", p_latitude, p_longitude),
+    ).fetchone())
+    conexao.execute(
+        "INSERT INTO membros (id, nome_completo, email, telefone, tipo, igreja_id, codigo_igreja) "
+        "VALUES (?, ?, ?, '', 'pastor', ?, ?)",
+        (p_id, p_nome_pastor, p_email, p_id, codigo),
+    )
+    igreja.pop("senha_hash", None)
+    return igreja
+
+
+_FUNCOES_RPC: Dict[str, Callable[..., Any]] = {
+    "relatorio_totais_mensais": _relatorio_totais_mensais,
+    "relatorio_top_contribuintes": _relatorio_top_contribuintes,
+    "relatorio_inadimplentes": _relatorio_inadimplentes,
+    "relatorio_fluxo_caixa": _relatorio_fluxo_caixa,
+    "relatorio_saldo_ate": _relatorio_saldo_ate,
+    "alocar_codigo_igreja": _alocar_codigo_igreja,
+    "registrar_igreja": _registrar_igreja,
+}
@@ -0,0 +1,184 @@
+# =============================================================
+# Benchmarks — Gerador de dados sintéticos
+# Gera igrejas, membros e contribuições no formato de dados.json,
+# em escala (10^5 a 10^7 contribuições). As contribuições ficam
+# em colunas (array) ordenadas por data para caber na memória;
+# as linhas (dicts) só são montadas quando uma consulta as pede.
+# =============================================================
+
+import json
+import math
+import random
+from array import array
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ARQUIVO_SEMENTE = Path(__file__).resolve().parent.parent / "dados.json"
+
+TIPOS = ("dizimo", "oferta", "doacao", "outro")
+
+# Valor típico e peso de cada tipo quando dados.json não tem exemplos dele
+_VALOR_PADRAO = {"dizimo": 150.0, "oferta": 50.0, "doacao": 100.0, "outro": 30.0}
+_PESO_PADRAO = {"dizimo": 1, "oferta": 1, "doacao": 0.2, "outro": 0.1}
+
+CONTRIBUICOES_POR_MEMBRO = 40
+MEMBROS_POR_IGREJA = 200
+
+
+def _uuid(prefixo: int, indice: int) -> str:
+    """UUID determinístico: o prefixo separa as tabelas, o índice a linha."""
+    return f"{prefixo:08x}-0000-4000-8000-{indice:012x}"
+
+
+def id_igreja(indice: int) -> str:
+    return _uuid(1, indice)
+
+
+def id_membro(indice: int) -> str:
+    return _uuid(2, indice)
+
+
+def id_contribuicao(indice: int) -> str:
+    return _uuid(3, indice)
+
+
+def indice_do_id(id_texto: str) -> int:
+    return int(id_texto.rsplit("-", 1)[1], 16)
+
+
+class DadosSinteticos:
+    """
+    Base sintética com as colunas das contribuições:
+    dia (ordinal), membro (índice), tipo (índice em TIPOS) e centavos.
+    """
+
+    def __init__(
+        self,
+        contribuicoes: int,
+        semente: int = 42,
+        data_fim: date = date(2026, 3, 31),
+        anos: int = 5,
+        igrejas: Optional[int] = None,
+        membros: Optional[int] = None,
+    ):
+        modelo = json.loads(ARQUIVO_SEMENTE.read_text(encoding="utf-8"))
+        rng = random.Random(semente)
+
+        self.total = contribuicoes
+        self.data_fim = data_fim
+        self.data_inicio = data_fim - timedelta(days=365 * anos - 1)
+        self.qtd_membros = membros or max(len(modelo["membros"]), contribuicoes // CONTRIBUICOES_POR_MEMBRO)
+        self.qtd_igrejas = igrejas or max(len(modelo["igrejas"]), self.qtd_membros // MEMBROS_POR_IGREJA)
+
+        self._modelo_igreja = modelo["igrejas"][0]
+        self._modelos_membro = modelo["membros"]
+        self._descricoes = {c["tipo"]: c.get("descricao", "") for c in modelo["contribuicoes"]}
+
+        # Proporção e valor médio por tipo a partir dos exemplos
+        exemplos = Counter(c["tipo"] for c in modelo["contribuicoes"])
+        valores = {c["tipo"]: c["valor"] for c in modelo["contribuicoes"]}
+        self._pesos = [exemplos.get(t, 0) + _PESO_PADRAO[t] for t in TIPOS]
+        self._medias = [valores.get(t, _VALOR_PADRAO[t]) for t in TIPOS]
+
+        # Membro -> igreja: os primeiros são os pastores, um por igreja;
+        # os demais se concentram nas primeiras (igrejas de tamanhos variados)
+        self.igreja_do_membro = array("i", (
+            i if i < self.qtd_igrejas else int(self.qtd_igrejas * rng.random() ** 2)
+            for i in range(self.qtd_membros)
+        ))
+        self.criado_em_membro = array("i", (
+            self.data_inicio.toordinal() + rng.randrange(365 * anos) // 2
+            for _ in range(self.qtd_membros)
+        ))
+
+        # Contribuições em ordem de data (como o índice idx_contribuicoes_data)
+        self.dia = array("i")
+        self.membro = array("i")
+        self.tipo = array("b")
+        self.centavos = array("q")
+        dias = (data_fim - self.data_inicio).days + 1
+        primeiro = self.data_inicio.toordinal()
+        gerados = 0
+        for d in range(dias):
+            # Distribui o restante de forma uniforme entre os dias que faltam
+            meta = (contribuicoes - gerados) // (dias - d)
+            tipos = rng.choices(range(len(TIPOS)), self._pesos, k=meta)
+            for t in tipos:
+                self.dia.append(primeiro + d)
+                self.membro.append(rng.randrange(self.qtd_membros))
+                self.tipo.append(t)
+                valor = rng.lognormvariate(math.log(self._medias[t]), 0.6)
+                self.centavos.append(max(100, round(valor * 100)))
+            gerados += meta
+
+        # Índices (membro_id, data) e (igreja_id, data): posições das contribuições
+        # de cada membro/igreja, já em ordem de data
+        self.inicio_membro, self.por_membro = self._indexar(self.membro, self.qtd_membros)
+        self.inicio_igreja, self.por_igreja = self._indexar(
+            (self.igreja_do_membro[m] for m in self.membro), self.qtd_igrejas,
+        )
+
+    def _indexar(self, chaves, quantidade: int):
+        """Ordenação por contagem estável: (início de cada chave, posições agrupadas por chave)."""
+        chaves = array("i", chaves)
+        contagem = array("i", bytes(4 * (quantidade + 1)))
+        for chave in chaves:
+            contagem[chave + 1] += 1
+        for i in range(1, len(contagem)):
+            contagem[i] += contagem[i - 1]
+        inicio = array("i", contagem)
+        proxima = array("i", contagem)
+        posicoes = array("i", bytes(4 * self.total))
+        for posicao, chave in enumerate(chaves):
+            posicoes[proxima[chave]] = posicao
+            proxima[chave] += 1
+        return inicio, posicoes
+
+    # -------------------- Linhas --------------------
+
+    def igreja(self, indice: int) -> Dict[str, Any]:
+        return {
+            **self._modelo_igreja,
+            "id": id_igreja(indice),
+            "nome": f"{self._modelo_igreja['nome']} {indice + 1}",
+            "codigo": f"IG{1000 + indice % 9000}",
+            "pastor_id": id_membro(indice),
+        }
+
+    def nome_membro(self, indice: int) -> str:
+        return f"{self._modelos_membro[indice % len(self._modelos_membro)]['nome']} {indice + 1}"
+
+    def membro_linha(self, indice: int) -> Dict[str, Any]:
+        modelo = self._modelos_membro[indice % len(self._modelos_membro)]
+        igreja = self.igreja_do_membro[indice]
+        return {
+            **{k: v for k, v in modelo.items() if k != "nome"},
+            "id": id_membro(indice),
+            "nome_completo": self.nome_membro(indice),
+            "email": f"membro{indice + 1}@email.com",
+            "tipo": "pastor" if indice < self.qtd_igrejas else "membro",
+            "igreja_id": id_igreja(igreja),
+            "codigo_igreja": f"IG{1000 + igreja % 9000}",
+            "criado_em": date.fromordinal(self.criado_em_membro[indice]).isoformat() + "T10:00:00Z",
+        }
+
+    def contribuicao(self, posicao: int) -> Dict[str, Any]:
+        m = self.membro[posicao]
+        tipo = TIPOS[self.tipo[posicao]]
+        data = date.fromordinal(self.dia[posicao]).isoformat()
+        return {
+            "id": id_contribuicao(posicao),
+            "membro_id": id_membro(m),
+            "igreja_id": id_igreja(self.igreja_do_membro[m]),
+            "membro_nome": self.nome_membro(m),
+            "tipo": tipo,
+            "valor": self.centavos[posicao] / 100,
+            "data": data,
+            "descricao": self._descricoes.get(tipo, ""),
+            "criado_em": data + "T11:00:00Z",
+        }
+
+    def contribuicoes(self, posicoes) -> List[Dict[str, Any]]:
+        return [self.contribuicao(p) for p in posicoes]
@@ -0,0 +1,134 @@
+# =============================================================
+# Benchmarks — Relatórios financeiros (relatorios_utils)
+# Mede tempo, pico de memória, idas ao banco e bytes trafegados
+# de cada relatório sobre dados sintéticos, sem rede nem Supabase.
+#
+# Uso (a partir de api-fastapi/):
+#   python -m benchmarks.relatorios
+#   python -m benchmarks.relatorios --escala 100000 1000000 --repeticoes 5
+#   python -m benchmarks.relatorios --funcoes resumo_mensal fluxo_caixa --saida resultado.json
+# =============================================================
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List
+
+# supabase_client exige as variáveis; o cliente real nunca é usado aqui
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SECRET_KEY", "benchmark")
+
+import relatorios_utils  # noqa: E402
+from benchmarks.dados_sinteticos import DadosSinteticos, id_igreja, id_membro  # noqa: E402
+from benchmarks.supabase_falso import SupabaseFalso  # noqa: E402
+
+FUNCOES = (
+    "resumo_mensal", "historico_membro", "comparativo_anual",
+    "top_contribuintes", "inadimplentes", "fluxo_caixa",
+)
+
+
+def montar_casos(dados: DadosSinteticos) -> Dict[str, Callable[[], Any]]:
+    """Chamadas representativas de cada relatório para a base gerada (na maior igreja)."""
+    inicio = dados.data_inicio.isoformat()
+    fim = dados.data_fim.isoformat()
+    ano = dados.data_fim.year
+    # A igreja 0 concentra mais membros; o histórico é o do primeiro membro comum dela
+    igreja = id_igreja(0)
+    membro = next(
+        (m for m in range(dados.qtd_igrejas, dados.qtd_membros) if dados.igreja_do_membro[m] == 0), 0,
+    )
+    return {
+        "resumo_mensal": lambda: relatorios_utils.resumo_mensal(igreja, inicio, fim),
+        "historico_membro": lambda: relatorios_utils.historico_membro(igreja, id_membro(membro)),
+        "comparativo_anual": lambda: relatorios_utils.comparativo_anual(igreja, str(ano - 2), str(ano - 1)),
+        "top_contribuintes": lambda: relatorios_utils.top_contribuintes(igreja, 10, inicio, fim),
+        "inadimplentes": lambda: relatorios_utils.inadimplentes(igreja, 30),
+        "fluxo_caixa": lambda: relatorios_utils.fluxo_caixa(
+            igreja, (dados.data_fim - timedelta(days=89)).isoformat(), fim,
+        ),
+    }
+
+
+async def medir(falso: SupabaseFalso, chamada: Callable[[], Any], repeticoes: int) -> Dict[str, Any]:
+    tempos, tempos_banco = [], []
+    for _ in range(repeticoes):
+        falso.estatisticas.zerar()
+        inicio = time.perf_counter()
+        resultado = await chamada()
+        tempos.append(time.perf_counter() - inicio)
+        tempos_banco.append(falso.estatisticas.segundos_banco)
+        if isinstance(resultado, dict) and "erro" in resultado:
+            raise RuntimeError(resultado["erro"])
+    idas, trafego = falso.estatisticas.idas, falso.estatisticas.bytes
+
+    # Memória numa rodada à parte: o tracemalloc deixa tudo mais lento
+    tracemalloc.start()
+    await chamada()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = statistics.median(tempos)
+    banco = statistics.median(tempos_banco)
+    return {
+        "ms_total": total * 1000,
+        "ms_api": (total - banco) * 1000,
+        "ms_banco": banco * 1000,
+        "pico_mb": pico / 1e6,
+        "idas_banco": idas,
+        "kb_json": trafego / 1e3,
+    }
+
+
+def imprimir(escala: int, resultados: Dict[str, Dict[str, Any]]) -> None:
+    colunas = ("ms_total", "ms_api", "ms_banco", "pico_mb", "idas_banco", "kb_json")
+    print(f"\n== {escala:,} contribuições ==".replace(",", "."))
+    print(f"{'relatório':<20}" + "".join(f"{c:>13}" for c in colunas))
+    for nome, medidas in resultados.items():
+        print(f"{nome:<20}" + "".join(
+            f"{medidas[c]:>13d}" if isinstance(medidas[c], int) else f"{medidas[c]:>13.2f}"
+            for c in colunas
+        ))
+
+
+async def executar(escalas: List[int], funcoes: List[str], repeticoes: int, semente: int) -> Dict[str, Any]:
+    relatorio = {}
+    for escala in escalas:
+        inicio = time.perf_counter()
+        dados = DadosSinteticos(escala, semente=semente, data_fim=date.today())
+        falso = SupabaseFalso(dados)
+        print(
+            f"\nBase gerada em {time.perf_counter() - inicio:.1f}s: "
+            f"{dados.qtd_igrejas} igrejas, {dados.qtd_membros} membros, {dados.total} contribuições"
+        )
+
+        relatorios_utils.banco = falso
+        casos = montar_casos(dados)
+        resultados = {nome: await medir(falso, casos[nome], repeticoes) for nome in funcoes}
+        imprimir(escala, resultados)
+        relatorio[str(escala)] = resultados
+    return relatorio
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark dos relatórios financeiros com dados sintéticos")
+    parser.add_argument("--escala", type=int, nargs="+", default=[100_000], help="Quantidades de contribuições")
+    parser.add_argument("--funcoes", nargs="+", choices=FUNCOES, default=list(FUNCOES))
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="Grava os resultados em JSON")
+    args = parser.parse_args()
+
+    relatorio = asyncio.run(executar(args.escala, args.funcoes, args.repeticoes, args.semente))
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+# =============================================================
+# Benchmarks — Supabase falso (local)
+# Imita o query builder assíncrono do postgrest-py sobre os dados
+# sintéticos: table().select().eq().gte().lte().order().limit(),
+# rpc() das funções de relatórios e execute() aguardável.
+# Cada execute() conta uma ida ao banco; o tempo gasto "no banco"
+# e o tamanho do JSON trafegado são medidos à parte.
+# =============================================================
+
+import json
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from benchmarks.dados_sinteticos import TIPOS, DadosSinteticos, id_membro, indice_do_id
+
+
+class RespostaFalsa:
+    def __init__(self, data: Any):
+        self.data = data
+
+
+class Estatisticas:
+    """Idas ao banco, tempo dentro do banco falso e bytes de JSON devolvidos."""
+
+    def __init__(self):
+        self.zerar()
+
+    def zerar(self) -> None:
+        self.idas = 0
+        self.segundos_banco = 0.0
+        self.bytes = 0
+
+
+def _ordinal(data: Optional[str]) -> Optional[int]:
+    return date.fromisoformat(data).toordinal() if data else None
+
+
+class _Requisicao:
+    """Base comum: execute() mede o tempo do banco e simula o tráfego JSON."""
+
+    def __init__(self, cliente: "SupabaseFalso"):
+        self._cliente = cliente
+
+    def _executar(self) -> Any:
+        raise NotImplementedError
+
+    async def execute(self) -> RespostaFalsa:
+        estatisticas = self._cliente.estatisticas
+        inicio = time.perf_counter()
+        corpo = json.dumps(self._executar(), ensure_ascii=False)
+        estatisticas.segundos_banco += time.perf_counter() - inicio
+        estatisticas.idas += 1
+        estatisticas.bytes += len(corpo)
+        # A decodificação do JSON é custo da API, como no cliente real
+        return RespostaFalsa(json.loads(corpo))
+
+
+class ConsultaFalsa(_Requisicao):
+    """Subconjunto de filtros do PostgREST usado pelos relatórios."""
+
+    def __init__(self, cliente: "SupabaseFalso", tabela: str):
+        super().__init__(cliente)
+        self._tabela = tabela
+        self._colunas: Optional[List[str]] = None
+        self._filtros: List[Callable[[Dict[str, Any]], bool]] = []
+        self._iguais: Dict[str, Any] = {}
+        self._data_min: Optional[str] = None
+        self._data_max: Optional[str] = None
+        self._ordem: Optional[tuple] = None
+        self._limite: Optional[int] = None
+
+    def select(self, colunas: str = "*", **_: Any) -> "ConsultaFalsa":
+        nomes = [c.strip() for c in colunas.split(",")]
+        # Recursos embutidos (ex.: igrejas(nome)) não são simulados
+        self._colunas = None if "*" in nomes else [c for c in nomes if "(" not in c]
+        return self
+
+    def eq(self, coluna: str, valor: Any) -> "ConsultaFalsa":
+        self._iguais[coluna] = valor
+        self._filtros.append(lambda linha: linha.get(coluna) == valor)
+        return self
+
+    def in_(self, coluna: str, valores: Iterable[Any]) -> "ConsultaFalsa":
+        conjunto = set(valores)
+        self._filtros.append(lambda linha: linha.get(coluna) in conjunto)
+        return self
+
+    def gte(self, coluna: str, valor: Any) -> "ConsultaFalsa":
+        if coluna == "data":
+            self._data_min = max(self._data_min or valor, valor)
+        self._filtros.append(lambda linha: linha.get(coluna) is not None and linha[coluna] >= valor)
+        return self
+
+    def lte(self, coluna: str, valor: Any) -> "ConsultaFalsa":
+        if coluna == "data":
+            self._data_max = min(self._data_max or valor, valor)
+        self._filtros.append(lambda linha: linha.get(coluna) is not None and linha[coluna] <= valor)
+        return self
+
+    def order(self, coluna: str, desc: bool = False, **_: Any) -> "ConsultaFalsa":
+        self._ordem = (coluna, desc)
+        return self
+
+    def limit(self, quantidade: int, **_: Any) -> "ConsultaFalsa":
+        self._limite = quantidade
+        return self
+
+    # -------------------- Execução --------------------
+
+    def _candidatas(self) -> List[Dict[str, Any]]:
+        """Usa os "índices" disponíveis antes de filtrar linha a linha."""
+        dados = self._cliente.dados
+        if self._tabela == "igrejas":
+            if "id" in self._iguais:
+                i = indice_do_id(self._iguais["id"])
+                return [dados.igreja(i)] if 0 <= i < dados.qtd_igrejas else []
+            return [dados.igreja(i) for i in range(dados.qtd_igrejas)]
+
+        if self._tabela == "membros":
+            if "id" in self._iguais:
+                i = indice_do_id(self._iguais["id"])
+                return [dados.membro_linha(i)] if 0 <= i < dados.qtd_membros else []
+            return [dados.membro_linha(i) for i in range(dados.qtd_membros)]
+
+        if self._tabela == "contribuicoes":
+            if "membro_id" in self._iguais:
+                m = indice_do_id(self._iguais["membro_id"])
+                if not 0 <= m < dados.qtd_membros:
+                    return []
+                posicoes = dados.por_membro[dados.inicio_membro[m]:dados.inicio_membro[m + 1]]
+            elif "igreja_id" in self._iguais:
+                posicoes = self._cliente.faixa_igreja(self._iguais["igreja_id"], self._data_min, self._data_max)
+            else:
+                primeira = bisect_left(dados.dia, _ordinal(self._data_min)) if self._data_min else 0
+                ultima = bisect_right(dados.dia, _ordinal(self._data_max)) if self._data_max else dados.total
+                posicoes = range(primeira, ultima)
+            return dados.contribuicoes(posicoes)
+
+        raise ValueError(f"Tabela não simulada: {self._tabela}")
+
+    def _executar(self) -> List[Dict[str, Any]]:
+        linhas = [l for l in self._candidatas() if all(f(l) for f in self._filtros)]
+        if self._ordem:
+            coluna, desc = self._ordem
+            linhas.sort(key=lambda l: (l.get(coluna) is None, l.get(coluna)), reverse=desc)
+        if self._limite is not None:
+            linhas = linhas[:self._limite]
+        if self._colunas:
+            linhas = [{c: l.get(c) for c in self._colunas} for l in linhas]
+        return linhas
+
+
+class RpcFalsa(_Requisicao):
+    def __init__(self, cliente: "SupabaseFalso", funcao: Callable[..., Any], parametros: Dict[str, Any]):
+        super().__init__(cliente)
+        self._funcao = funcao
+        self._parametros = parametros
+
+    def _executar(self) -> Any:
+        return self._funcao(**self._parametros)
+
+
+class SupabaseFalso:
+    """
+    Substituto do armazenamento (`banco`) para os relatórios. As funções RPC seguem as
+    migrações (008-create-relatorios-rpc.sql, 009-create-relatorio-inadimplentes-rpc.sql,
+    011-create-contribuicoes-diarias.sql, 015-create-saldos-mensais.sql,
+    016-create-relatorios-por-igreja.sql), inclusive o livro-razão diário e o saldo
+    acumulado, todos por igreja.
+    """
+
+    def __init__(self, dados: DadosSinteticos):
+        self.dados = dados
+        self.estatisticas = Estatisticas()
+        self._funcoes = {
+            "relatorio_totais_mensais": self._totais_mensais,
+            "relatorio_top_contribuintes": self._top_contribuintes,
+            "relatorio_inadimplentes": self._inadimplentes,
+            "relatorio_fluxo_caixa": self._fluxo_caixa,
+            "relatorio_saldo_ate": self._saldo_ate,
+        }
+
+        # Livro-razão (contribuicoes_diarias), mantido por trigger no banco real
+        self._diario: Dict[int, Dict[tuple, List[int]]] = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+        for dia, membro, tipo, centavos in zip(dados.dia, dados.membro, dados.tipo, dados.centavos):
+            item = self._diario[dados.igreja_do_membro[membro]][(dia, tipo)]
+            item[0] += centavos
+            item[1] += 1
+
+        # Soma acumulada ao longo do índice por igreja (em ordem de dia); a diferença
+        # entre duas posições da mesma igreja faz o papel de saldos_mensais + livro-razão
+        self._acumulado = array("q", bytes(8 * (dados.total + 1)))
+        for i, p in enumerate(dados.por_igreja):
+            self._acumulado[i + 1] = self._acumulado[i] + dados.centavos[p]
+
+        # Membros de cada igreja por criado_em (índice igreja_id, criado_em)
+        self._membros_igreja: Dict[int, List[int]] = defaultdict(list)
+        for m in sorted(range(dados.qtd_membros), key=dados.criado_em_membro.__getitem__):
+            self._membros_igreja[dados.igreja_do_membro[m]].append(m)
+
+        # Última contribuição de cada membro (índice membro_id, data DESC)
+        self._ultima = {}
+        for m in range(dados.qtd_membros):
+            fim = dados.inicio_membro[m + 1]
+            if fim > dados.inicio_membro[m]:
+                self._ultima[m] = dados.dia[dados.por_membro[fim - 1]]
+
+    def table(self, nome: str) -> ConsultaFalsa:
+        return ConsultaFalsa(self, nome)
+
+    def rpc(self, nome: str, parametros: Dict[str, Any]) -> RpcFalsa:
+        return RpcFalsa(self, self._funcoes[nome], parametros)
+
+    # -------------------- Índice (igreja_id, data) --------------------
+
+    def _intervalo_igreja(self, igreja_id: str, data_inicio: Optional[str], data_fim: Optional[str]) -> range:
+        """Intervalo do índice por igreja (dados.por_igreja) dentro do período."""
+        dados = self.dados
+        g = indice_do_id(igreja_id)
+        if not 0 <= g < dados.qtd_igrejas:
+            return range(0)
+        inicio, fim = dados.inicio_igreja[g], dados.inicio_igreja[g + 1]
+        dia = dados.dia.__getitem__
+        if data_inicio:
+            inicio = bisect_left(dados.por_igreja, _ordinal(data_inicio), inicio, fim, key=dia)
+        if data_fim:
+            fim = bisect_right(dados.por_igreja, _ordinal(data_fim), inicio, fim, key=dia)
+        return range(inicio, fim)
+
+    def faixa_igreja(self, igreja_id: str, data_inicio: Optional[str], data_fim: Optional[str]) -> List[int]:
+        """Posições das contribuições da igreja no período, em ordem de data."""
+        intervalo = self._intervalo_igreja(igreja_id, data_inicio, data_fim)
+        return self.dados.por_igreja[intervalo.start:intervalo.stop]
+
+    # -------------------- Funções RPC --------------------
+
+    def _totais_mensais(self, p_igreja_id: str, p_data_inicio: str, p_data_fim: str) -> List[Dict[str, Any]]:
+        inicio, fim = _ordinal(p_data_inicio), _ordinal(p_data_fim)
+        grupos: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0])
+        diario = self._diario.get(indice_do_id(p_igreja_id), {})
+        for (dia, tipo), (centavos, quantidade) in diario.items():
+            if inicio <= dia <= fim:
+                grupo = grupos[(date.fromordinal(dia).strftime("%Y-%m"), TIPOS[tipo])]
+                grupo[0] += centavos
+                grupo[1] += quantidade
+        return [
+            {"mes": mes, "tipo": tipo, "total": centavos / 100, "quantidade": quantidade}
+            for (mes, tipo), (centavos, quantidade) in sorted(grupos.items())
+        ]
+
+    def _top_contribuintes(
+        self, p_igreja_id: str, p_limite: int = 10, p_data_inicio: str = None, p_data_fim: str = None,
+    ):
+        dados = self.dados
+        totais: Dict[int, List[int]] = defaultdict(lambda: [0, 0])
+        for p in self.faixa_igreja(p_igreja_id, p_data_inicio, p_data_fim):
+            item = totais[dados.membro[p]]
+            item[0] += dados.centavos[p]
+            item[1] += 1
+        ranking = sorted(totais.items(), key=lambda par: par[1][0], reverse=True)[:p_limite]
+        return [
+            {
+                "membro_id": id_membro(m),
+                "nome": dados.nome_membro(m),
+                "email": f"membro{m + 1}@email.com",
+                "total": centavos / 100,
+                "contribuicoes": quantidade,
+            }
+            for m, (centavos, quantidade) in ranking
+        ]
+
+    def _inadimplentes(self, p_igreja_id: str, p_data_limite: str) -> List[Dict[str, Any]]:
+        dados = self.dados
+        limite = _ordinal(p_data_limite)
+        resultado = []
+        for m in self._membros_igreja.get(indice_do_id(p_igreja_id), []):
+            ultima = self._ultima.get(m)
+            if ultima is None or ultima < limite:
+                resultado.append({
+                    "membro_id": id_membro(m),
+                    "nome": dados.nome_membro(m),
+                    "email": f"membro{m + 1}@email.com",
+                    "ultima_contribuicao": date.fromordinal(ultima).isoformat() if ultima else None,
+                })
+        return resultado
+
+    def _saldo_ate(self, p_igreja_id: str, p_data: str) -> float:
+        intervalo = self._intervalo_igreja(p_igreja_id, None, p_data)
+        return (self._acumulado[intervalo.stop] - self._acumulado[intervalo.start]) / 100
+
+    def _fluxo_caixa(self, p_igreja_id: str, p_data_inicio: str, p_data_fim: str) -> List[Dict[str, Any]]:
+        dados = self.dados
+        dias: List[Dict[str, Any]] = []
+        intervalo = self._intervalo_igreja(p_igreja_id, p_data_inicio, p_data_fim)
+        historico = self._intervalo_igreja(p_igreja_id, None, None)
+        saldo = self._acumulado[intervalo.start] - self._acumulado[historico.start]
+        atual = None
+        for p in dados.por_igreja[intervalo.start:intervalo.stop]:
+            if atual is None or dados.dia[p] != atual["ordinal"]:
+                atual = {"ordinal": dados.dia[p], "centavos": 0, "detalhes": []}
+                dias.append(atual)
+            atual["centavos"] += dados.centavos[p]
+            atual["detalhes"].append({
+                "membro_id": id_membro(dados.membro[p]),
+                "tipo": TIPOS[dados.tipo[p]],
+                "valor": dados.centavos[p] / 100,
+            })
+        resultado = []
+        for d in dias:
+            saldo += d["centavos"]
+            resultado.append({
+                "dia": date.fromordinal(d["ordinal"]).isoformat(),
+                "entrada": d["centavos"] / 100,
+                "quantidade": len(d["detalhes"]),
+                "saldo_acumulado": saldo / 100,
+                "detalhes": d["detalhes"],
+            })
+        return resultado
@@ -0,0 +1,315 @@
+# =============================================================
+# Utilitários de Cache
+# Cache em memória (TTL + LRU) para leituras quentes que mudam
+# pouco, como os dados das igrejas e os relatórios financeiros.
+# =============================================================
+
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from armazenamento import banco
+from campos_utils import CAMPOS_PERMITIDOS
+from metricas_utils import CACHE_ACERTOS, CACHE_FALHAS, CACHE_ITENS
+
+_AUSENTE = object()
+
+
+class CacheTTL:
+    """
+    Dicionário com expiração por tempo e descarte do item menos usado.
+    Acertos, falhas e ocupação saem em /metrics com o rótulo cache=<nome>.
+    """
+
+    def __init__(self, nome: str, max_itens: int = 1000, ttl_segundos: float = 300):
+        self.nome = nome
+        self.max_itens = max_itens
+        self.ttl_segundos = ttl_segundos
+        self._itens: "OrderedDict[str, tuple]" = OrderedDict()
+        self._acertos = CACHE_ACERTOS.labels(nome)
+        self._falhas = CACHE_FALHAS.labels(nome)
+        CACHE_ITENS.labels(nome).set_function(lambda: len(self._itens))
+
+    def obter(self, chave: str, padrao: Any = None) -> Any:
+        item = self._itens.get(chave)
+        if item is None or item[0] < time.monotonic():
+            if item is not None:
+                del self._itens[chave]
+            self._falhas.inc()
+            return padrao
+        self._itens.move_to_end(chave)
+        self._acertos.inc()
+        return item[1]
+
+    def espiar(self, chave: str, padrao: Any = None) -> Any:
+        """Lê o valor sem mexer nos contadores, na expiração ou na ordem LRU."""
+        item = self._itens.get(chave)
+        return padrao if item is None else item[1]
+
+    def definir(self, chave: str, valor: Any, ttl_segundos: Optional[float] = None) -> None:
+        """Guarda o valor; ttl_segundos substitui o TTL padrão do cache."""
+        ttl = self.ttl_segundos if ttl_segundos is None else ttl_segundos
+        self._itens[chave] = (time.monotonic() + ttl, valor)
+        self._itens.move_to_end(chave)
+        while len(self._itens) > self.max_itens:
+            self._itens.popitem(last=False)
+
+    def invalidar(self, *chaves: str) -> None:
+        for chave in chaves:
+            self._itens.pop(chave, None)
+
+    def limpar(self) -> None:
+        self._itens.clear()
+
+# =============================================
+# ETAG / GET CONDICIONAL
+# =============================================
+
+def gerar_etag(conteudo: Any) -> str:
+    """ETag forte derivado do hash do conteúdo serializado."""
+    bruto = json.dumps(conteudo, sort_keys=True, separators=(",", ":"), default=str).encode()
+    return '"' + hashlib.sha256(bruto).hexdigest()[:32] + '"'
+
+
+def etag_corresponde(if_none_match: Optional[str], etag: str) -> bool:
+    """Compara o cabeçalho If-None-Match com o ETag atual (comparação fraca, RFC 9110)."""
+    if not if_none_match:
+        return False
+    for candidato in if_none_match.split(","):
+        candidato = candidato.strip()
+        if candidato == "*":
+            return True
+        if candidato.startswith("W/"):
+            candidato = candidato[2:]
+        if candidato == etag:
+            return True
+    return False
+
+
+# =============================================
+# CACHE DE IGREJAS
+# =============================================
+
+cache_igrejas = CacheTTL(
+    "igrejas",
+    max_itens=int(os.getenv("CACHE_IGREJAS_MAX_ITENS", "1000")),
+    ttl_segundos=float(os.getenv("CACHE_IGREJAS_TTL_SEGUNDOS", "300")),
+)
+
+_COLUNAS_IGREJA = ",".join(CAMPOS_PERMITIDOS["igrejas"])
+_COLUNAS_PUBLICAS = "id, nome, endereco, codigo, nome_pastor, latitude, longitude"
+_CHAVE_PUBLICAS = "publicas"
+
+
+def _guardar_igreja(igreja: Dict[str, Any]) -> None:
+    cache_igrejas.definir(f"id:{igreja['id']}", igreja)
+    if igreja.get("codigo"):
+        cache_igrejas.definir(f"codigo:{igreja['codigo']}", igreja)
+
+
+async def obter_igreja_por_id(igreja_id: str) -> Optional[Dict[str, Any]]:
+    """Busca a igreja pelo id, passando pelo cache. Retorna None se não existir."""
+    igreja = cache_igrejas.obter(f"id:{igreja_id}", _AUSENTE)
+    if igreja is not _AUSENTE:
+        return igreja
+
+    resposta = await banco.table("igrejas").select(_COLUNAS_IGREJA).eq("id", igreja_id).execute()
+    if not resposta.data:
+        return None
+    _guardar_igreja(resposta.data[0])
+    return resposta.data[0]
+
+
+async def obter_igreja_por_codigo(codigo: str) -> Optional[Dict[str, Any]]:
+    """Busca a igreja pelo código de convite, passando pelo cache."""
+    igreja = cache_igrejas.obter(f"codigo:{codigo}", _AUSENTE)
+    if igreja is not _AUSENTE:
+        return igreja
+
+    resposta = await banco.table("igrejas").select(_COLUNAS_IGREJA).eq("codigo", codigo).execute()
+    if not resposta.data:
+        return None
+    _guardar_igreja(resposta.data[0])
+    return resposta.data[0]
+
+
+async def obter_igrejas_publicas() -> Tuple[List[Dict[str, Any]], str]:
+    """Lista pública das igrejas (mapa) e seu ETag, passando pelo cache."""
+    publicas = cache_igrejas.obter(_CHAVE_PUBLICAS, _AUSENTE)
+    if publicas is not _AUSENTE:
+        return publicas
+
+    resposta = await banco.table("igrejas").select(_COLUNAS_PUBLICAS).order("nome").execute()
+    publicas = (resposta.data, gerar_etag(resposta.data))
+    cache_igrejas.definir(_CHAVE_PUBLICAS, publicas)
+    return publicas
+
+
+def invalidar_igreja(igreja: Optional[Dict[str, Any]] = None, igreja_id: Optional[str] = None) -> None:
+    """Remove a igreja alterada do cache (por id e código) e a lista pública."""
+    chaves = [_CHAVE_PUBLICAS]
+    igreja_id = igreja_id or (igreja or {}).get("id")
+    if igreja_id:
+        anterior = cache_igrejas.espiar(f"id:{igreja_id}")
+        chaves.append(f"id:{igreja_id}")
+        if anterior and anterior.get("codigo"):
+            chaves.append(f"codigo:{anterior['codigo']}")
+    if igreja and igreja.get("codigo"):
+        chaves.append(f"codigo:{igreja['codigo']}")
+    cache_igrejas.invalidar(*chaves)
+    # Perfis de membros carregam o nome da igreja
+    cache_perfis.limpar()
+
+
+# =============================================
+# CACHE DE PERFIS (LOGIN)
+# =============================================
+
+cache_perfis = CacheTTL(
+    "perfis",
+    max_itens=int(os.getenv("CACHE_PERFIS_MAX_ITENS", "5000")),
+    ttl_segundos=float(os.getenv("CACHE_PERFIS_TTL_SEGUNDOS", "60")),
+)
+
+# Membro + nome da igreja numa única consulta (embed pela FK igreja_id)
+_COLUNAS_PERFIL_MEMBRO = "id, nome_completo, igreja_id, codigo_igreja, igrejas(nome)"
+
+
+async def obter_perfil(usuario_id: str, tipo: str) -> Optional[Dict[str, Any]]:
+    """
+    Dados de perfil devolvidos no login (nome, igreja, código), passando
+    pelo cache. No máximo uma consulta ao banco. Retorna None se não existir.
+    """
+    chave = f"{tipo}:{usuario_id}"
+    perfil = cache_perfis.obter(chave, _AUSENTE)
+    if perfil is not _AUSENTE:
+        return perfil
+
+    if tipo == "igreja":
+        igreja = await obter_igreja_por_id(usuario_id)
+        if igreja is None:
+            return None
+        perfil = {
+            "nome": igreja.get("nome_pastor", ""),
+            "igrejaId": igreja["id"],
+            "nomeIgreja": igreja["nome"],
+            "codigoIgreja": igreja.get("codigo", ""),
+        }
+    else:
+        resposta = await banco.table("membros").select(_COLUNAS_PERFIL_MEMBRO).eq("id", usuario_id).execute()
+        if not resposta.data:
+            return None
+        membro = resposta.data[0]
+        perfil = {
+            "nome": membro.get("nome_completo", ""),
+            "igrejaId": membro.get("igreja_id", ""),
+            "nomeIgreja": (membro.get("igrejas") or {}).get("nome", ""),
+            "codigoIgreja": membro.get("codigo_igreja", ""),
+        }
+
+    cache_perfis.definir(chave, perfil)
+    return perfil
+
+
+def invalidar_perfil(usuario_id: str) -> None:
+    """Remove o perfil do usuário do cache (após alterar ou remover o membro)."""
+    cache_perfis.invalidar(f"igreja:{usuario_id}", f"membro:{usuario_id}")
+
+
+# =============================================
+# CACHE DE RELATÓRIOS
+# =============================================
+# Cada resultado é guardado com a versão dos dados de que depende:
+# (igreja, ano) para cada ano do período e (igreja, None) para a
+# igreja inteira. Escritas em contribuições incrementam as versões
+# dos anos das linhas alteradas; enquanto as versões batem, o
+# relatório é servido sem ir ao banco. Anos já encerrados ficam
+# mais tempo (CACHE_RELATORIOS_TTL_ENCERRADOS_SEGUNDOS).
+# As versões vivem na memória do processo, como os demais caches:
+# escritas de outras instâncias ou de outros serviços (finance e
+# payment gravam contribuicoes direto no banco) não as incrementam,
+# então o TTL é o limite do atraso também para os anos encerrados.
+
+cache_relatorios = CacheTTL(
+    "relatorios",
+    max_itens=int(os.getenv("CACHE_RELATORIOS_MAX_ITENS", "500")),
+    ttl_segundos=float(os.getenv("CACHE_RELATORIOS_TTL_SEGUNDOS", "600")),
+)
+TTL_RELATORIOS_ENCERRADOS = float(os.getenv("CACHE_RELATORIOS_TTL_ENCERRADOS_SEGUNDOS", "21600"))
+
+_TODAS_IGREJAS = "*"
+_MAX_ANOS_EM_CACHE = 50
+_versoes_dados: Dict[Tuple[str, Optional[int]], int] = {}
+
+
+def _incrementar_versao(igreja_id: Optional[str], ano: Optional[int]) -> None:
+    # Relatórios de todas as igrejas dependem de qualquer escrita
+    for igreja in {igreja_id or _TODAS_IGREJAS, _TODAS_IGREJAS}:
+        chave = (igreja, ano)
+        _versoes_dados[chave] = _versoes_dados.get(chave, 0) + 1
+
+
+def anos_informados(*anos: Any) -> Optional[List[int]]:
+    """Anos YYYY (ou datas YYYY-MM-DD) como inteiros; None se algum for inválido (sem cache)."""
+    try:
+        return sorted({int(str(ano)[:4]) for ano in anos})
+    except ValueError:
+        return None
+
+
+def anos_do_periodo(data_inicio: Optional[str], data_fim: Optional[str]) -> Optional[List[int]]:
+    """Anos cobertos por um período YYYY-MM-DD; None se não der para delimitar (sem cache)."""
+    extremos = anos_informados(data_inicio, data_fim)
+    if not extremos or extremos[-1] - extremos[0] >= _MAX_ANOS_EM_CACHE:
+        return None
+    return list(range(extremos[0], extremos[-1] + 1))
+
+
+def _versao_relatorio(igreja_id: Optional[str], anos: Iterable[int]) -> Tuple[int, ...]:
+    igreja = igreja_id or _TODAS_IGREJAS
+    return tuple(_versoes_dados.get((igreja, ano), 0) for ano in (None, *anos))
+
+
+async def obter_relatorio(
+    nome: str,
+    parametros: Dict[str, Any],
+    anos: Optional[List[int]],
+    gerar: Callable[[], Awaitable[Dict[str, Any]]],
+    igreja_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Resultado do relatório `nome` passando pelo cache. A chave é
+    (relatório, parâmetros normalizados, igreja); `anos` são os anos de
+    dados que o resultado cobre. Resultados com "erro" não são guardados.
+    """
+    if not anos:
+        return await gerar()
+
+    chave = json.dumps([nome, igreja_id or _TODAS_IGREJAS, parametros], sort_keys=True, separators=(",", ":"))
+    # Versão lida antes de gerar: uma escrita durante a consulta invalida o resultado
+    versao = _versao_relatorio(igreja_id, anos)
+    item = cache_relatorios.obter(chave)
+    if item is not None and item[0] == versao:
+        return item[1]
+
+    resultado = await gerar()
+    if "erro" not in resultado:
+        encerrado = max(anos) < date.today().year
+        cache_relatorios.definir(chave, (versao, resultado), TTL_RELATORIOS_ENCERRADOS if encerrado else None)
+    return resultado
+
+
+def invalidar_relatorios(*contribuicoes: Optional[Dict[str, Any]]) -> None:
+    """Nova versão dos anos (e igrejas) das contribuições criadas, alteradas ou removidas."""
+    for contribuicao in contribuicoes:
+        if contribuicao and contribuicao.get("data"):
+            _incrementar_versao(contribuicao.get("igreja_id"), int(str(contribuicao["data"])[:4]))
+
+
+def invalidar_relatorios_igreja(igreja_id: Optional[str]) -> None:
+    """Nova versão de todos os anos da igreja (ex.: contribuições removidas em cascata)."""
+    _incrementar_versao(igreja_id, None)
@@ -0,0 +1,99 @@
+# =============================================================
+# Utilitários de Projeção de Campos
+# Define as colunas que cada tabela pode expor pela API e as
+# projeções enxutas usadas por padrão nas listagens.
+# O cliente pode pedir outro conjunto com ?campos=a,b,c
+# =============================================================
+
+from typing import Iterable, Optional
+
+from fastapi import HTTPException
+
+_AUDITORIA = ("criado_em", "atualizado_em", "criado_por", "atualizado_por")
+
+# Colunas expostas por tabela (senha_hash nunca sai da API)
+CAMPOS_PERMITIDOS = {
+    "igrejas": (
+        "id", "nome", "endereco", "descricao", "codigo", "nome_pastor",
+        "email", "latitude", "longitude",
+    ) + _AUDITORIA,
+    "membros": (
+        "id", "nome_completo", "email", "telefone", "tipo", "igreja_id",
+        "codigo_igreja",
+    ) + _AUDITORIA,
+    "eventos": (
+        "id", "titulo", "descricao", "data", "horario", "local", "tipo",
+        "igreja_id",
+    ) + _AUDITORIA,
+    "contribuicoes": (
+        "id", "membro_id", "igreja_id", "membro_nome", "tipo", "valor", "data",
+        "descricao", "usuario_id", "metodo_pagamento", "referencia_externa",
+        "status", "recebido_em",
+    ) + _AUDITORIA,
+    "comunicados": (
+        "id", "igreja_id", "titulo", "conteudo", "prioridade",
+    ) + _AUDITORIA,
+    "pedidos_oracao": (
+        "id", "igreja_id", "membro_id", "membro_nome", "pedido", "status",
+        "resposta", "respondido_em", "respondido_por",
+    ) + _AUDITORIA,
+}
+
+# Projeções padrão das listagens: apenas o que as telas de lista exibem
+CAMPOS_LISTAGEM = {
+    "igrejas": (
+        "id", "nome", "endereco", "codigo", "nome_pastor", "email",
+        "latitude", "longitude", "criado_em",
+    ),
+    "membros": (
+        "id", "nome_completo", "email", "telefone", "tipo", "igreja_id",
+        "codigo_igreja", "criado_em",
+    ),
+    "eventos": (
+        "id", "titulo", "descricao", "data", "horario", "local", "tipo",
+        "igreja_id", "criado_em",
+    ),
+    "contribuicoes": (
+        "id", "membro_id", "membro_nome", "igreja_id", "tipo", "valor", "data",
+        "descricao", "criado_em",
+    ),
+    "comunicados": (
+        "id", "titulo", "conteudo", "prioridade", "igreja_id", "criado_em",
+    ),
+    "pedidos_oracao": (
+        "id", "membro_id", "membro_nome", "igreja_id", "pedido", "status",
+        "resposta", "respondido_em", "respondido_por", "criado_em",
+    ),
+}
+
+
+def resolver_campos(
+    tabela: str,
+    campos: Optional[str] = None,
+    padrao: Optional[Iterable[str]] = None,
+    obrigatorios: Iterable[str] = ("id",),
+) -> str:
+    """
+    Monta a lista de colunas do select a partir de ?campos=.
+    Sem parâmetro usa `padrao` (ou todas as colunas permitidas).
+    Colunas obrigatórias (ex.: as da paginação) são sempre incluídas.
+    """
+    permitidos = CAMPOS_PERMITIDOS[tabela]
+
+    if campos:
+        pedidos = [c.strip() for c in campos.split(",") if c.strip()]
+        invalidos = [c for c in pedidos if c not in permitidos]
+        if invalidos:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Campos inválidos para {tabela}: {', '.join(invalidos)}",
+            )
+    else:
+        pedidos = list(padrao or permitidos)
+
+    for obrigatorio in obrigatorios:
+        if obrigatorio not in pedidos:
+            pedidos.append(obrigatorio)
+
+    # Remove duplicados mantendo a ordem pedida
+    return ",".join(dict.fromkeys(pedidos))
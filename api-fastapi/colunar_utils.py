@@ -0,0 +1,145 @@
+# =============================================================
+# Utilitários Colunares (NumPy)
+# Converte as linhas buscadas (lista de dicts) em colunas
+# tipadas — datas como número do dia, tipo como código
+# categórico, valor em centavos inteiros — e faz agrupamento,
+# soma e ordenação com operações vetorizadas.
+# As somas são feitas em centavos e só viram reais (float) na
+# montagem do dict de saída, que mantém o formato de antes.
+# =============================================================
+
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+Linhas = Sequence[Dict[str, Any]]
+
+
+# -------------------- Conversão linhas -> colunas --------------------
+
+def centavos(linhas: Linhas, coluna: str = "valor") -> np.ndarray:
+    """Coluna monetária em centavos (int64), arredondando o float vindo do banco."""
+    reais = np.fromiter((linha[coluna] for linha in linhas), dtype=np.float64, count=len(linhas))
+    return np.rint(reais * 100).astype(np.int64)
+
+
+def inteiros(linhas: Linhas, coluna: str) -> np.ndarray:
+    return np.fromiter((linha[coluna] for linha in linhas), dtype=np.int64, count=len(linhas))
+
+
+def dias(linhas: Linhas, coluna: str = "data") -> np.ndarray:
+    """Datas YYYY-MM-DD como dias desde 1970-01-01; nulos viram NaT."""
+    return np.array([linha[coluna] for linha in linhas], dtype="datetime64[D]")
+
+
+def meses(linhas: Linhas, coluna: str = "mes") -> np.ndarray:
+    """Meses YYYY-MM como datetime64[M] (contagem de meses desde 1970-01)."""
+    return np.array([linha[coluna] for linha in linhas], dtype="datetime64[M]")
+
+
+def categorias(linhas: Linhas, coluna: str, ordenar: bool = False) -> Tuple[np.ndarray, List[Any]]:
+    """
+    Codifica uma coluna como categórica: (códigos int, rótulos).
+    Por padrão os rótulos seguem a ordem da primeira ocorrência, a mesma
+    ordem de inserção dos dicts montados linha a linha; com ordenar=True
+    seguem a ordem natural dos valores.
+    """
+    valores = np.array([linha[coluna] for linha in linhas], dtype=object)
+    if not len(valores):
+        return np.zeros(0, dtype=np.intp), []
+    rotulos, primeira, codigos = np.unique(valores, return_index=True, return_inverse=True)
+    if not ordenar:
+        ordem = np.argsort(primeira, kind="stable")
+        posicao = np.empty_like(ordem)
+        posicao[ordem] = np.arange(len(ordem))
+        rotulos, codigos = rotulos[ordem], posicao[codigos]
+    return codigos.ravel(), rotulos.tolist()
+
+
+# -------------------- Agrupamento --------------------
+
+def somar_por(codigos: np.ndarray, valores: np.ndarray, grupos: int) -> np.ndarray:
+    """Soma de valores inteiros por código de grupo (exata até 2^53 centavos)."""
+    return np.rint(np.bincount(codigos, weights=valores, minlength=grupos)).astype(np.int64)
+
+
+def contar_por(codigos: np.ndarray, grupos: int) -> np.ndarray:
+    return np.bincount(codigos, minlength=grupos)
+
+
+def em_reais(valor_centavos: Any) -> Any:
+    """Centavos (escalar ou array) de volta para reais em tipos nativos do Python."""
+    if isinstance(valor_centavos, np.ndarray):
+        return (valor_centavos / 100).tolist()
+    return int(valor_centavos) / 100
+
+
+# -------------------- Relatórios --------------------
+
+def consolidar_meses(totais: Linhas) -> Dict[str, Dict[str, Any]]:
+    """
+    Linhas (mes, tipo, total, quantidade) -> {mes: {total, quantidade, tipos}},
+    ordenado por mês, com os tipos de cada mês na ordem das linhas.
+    """
+    if not totais:
+        return {}
+    codigos_mes, rotulos_mes = categorias(totais, "mes", ordenar=True)
+    valores = centavos(totais, "total")
+    grupos = len(rotulos_mes)
+    soma = em_reais(somar_por(codigos_mes, valores, grupos))
+    quantidade = somar_por(codigos_mes, inteiros(totais, "quantidade"), grupos).tolist()
+
+    # Ordenação estável por mês: as linhas de cada mês ficam contíguas
+    ordem = np.argsort(codigos_mes, kind="stable")
+    limites = np.cumsum(contar_por(codigos_mes, grupos))[:-1]
+    tipos = [totais[i]["tipo"] for i in ordem]
+    reais = em_reais(valores[ordem])
+
+    resumo = {}
+    inicio = 0
+    for g, fim in enumerate([*limites.tolist(), len(ordem)]):
+        resumo[rotulos_mes[g]] = {
+            "total": soma[g],
+            "quantidade": quantidade[g],
+            "tipos": dict(zip(tipos[inicio:fim], reais[inicio:fim])),
+        }
+        inicio = fim
+    return resumo
+
+
+def totais_por_mes_do_ano(totais: Linhas) -> Dict[str, float]:
+    """Soma por mês do ano ({"mes_MM": total}), só com os meses presentes."""
+    if not totais:
+        return {}
+    mes_do_ano = meses(totais).astype(np.int64) % 12
+    soma = somar_por(mes_do_ano, centavos(totais, "total"), 12)
+    presentes = np.flatnonzero(contar_por(mes_do_ano, 12))
+    return {f"mes_{m + 1:02d}": v for m, v in zip(presentes.tolist(), em_reais(soma[presentes]))}
+
+
+def totais_por_tipo(contribuicoes: Linhas) -> Dict[str, float]:
+    """Soma de valor por tipo, na ordem em que cada tipo aparece."""
+    if not contribuicoes:
+        return {}
+    codigos, rotulos = categorias(contribuicoes, "tipo")
+    soma = somar_por(codigos, centavos(contribuicoes), len(rotulos))
+    return dict(zip(rotulos, em_reais(soma)))
+
+
+def somar(linhas: Linhas, coluna: str) -> float:
+    """Total de uma coluna monetária, somado em centavos."""
+    if not linhas:
+        return 0
+    return em_reais(centavos(linhas, coluna).sum())
+
+
+def dias_desde(linhas: Linhas, coluna: str, hoje: Optional[date] = None) -> List[Optional[int]]:
+    """Dias corridos entre a data da coluna e hoje; None onde a data é nula."""
+    if not linhas:
+        return []
+    datas = dias(linhas, coluna)
+    diferenca = np.datetime64(hoje or date.today(), "D") - datas
+    nulas = np.isnat(datas)
+    resultado = diferenca.astype(np.int64).tolist()
+    return [None if nula else d for d, nula in zip(resultado, nulas.tolist())]
@@ -0,0 +1,248 @@
+# =============================================================
+# Utilitários de Compressão de Respostas
+# Middleware ASGI que comprime o corpo conforme o Accept-Encoding
+# (zstd, Brotli ou gzip) quando o tipo de conteúdo está na lista
+# permitida e o corpo passa do tamanho mínimo. Respostas em
+# streaming (exportações) são comprimidas parte a parte.
+# O gateway Express repassa Accept-Encoding e o corpo comprimido
+# sem descomprimir, então a economia chega até o cliente.
+# zstd e Brotli usam os pacotes `zstandard` e `brotli` (em
+# requirements.txt); se faltarem, só o gzip (zlib) é oferecido.
+# =============================================================
+
+import os
+import time
+import zlib
+from typing import Callable, Optional, Tuple
+
+import anyio.to_thread
+from starlette.datastructures import MutableHeaders
+
+from metricas_utils import (
+    BYTES_COMPRIMIDOS, BYTES_ORIGINAIS, CPU_COMPRESSAO,
+    RAZAO_COMPRESSAO, RESPOSTAS_NAO_COMPRIMIDAS,
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+TAMANHO_MINIMO = int(os.getenv("COMPRESSAO_TAMANHO_MINIMO", "1024"))
+TIPOS_COMPRIMIVEIS = frozenset(
+    tipo.strip().lower()
+    for tipo in os.getenv(
+        "COMPRESSAO_TIPOS",
+        "application/json,application/x-ndjson,text/csv,text/plain,text/html",
+    ).split(",")
+    if tipo.strip()
+)
+NIVEL_GZIP = int(os.getenv("COMPRESSAO_NIVEL_GZIP", "6"))
+NIVEL_BROTLI = int(os.getenv("COMPRESSAO_NIVEL_BROTLI", "4"))
+NIVEL_ZSTD = int(os.getenv("COMPRESSAO_NIVEL_ZSTD", "3"))
+
+# Corpos maiores que isso são comprimidos no pool de threads
+# (zlib, brotli e zstd liberam o GIL) para não travar o event loop
+LIMITE_COMPRESSAO_EM_THREAD = 256 * 1024
+
+_DISPONIVEIS = {"gzip": True, "br": brotli is not None, "zstd": zstandard is not None}
+
+# Ordem de preferência do servidor, usada quando o cliente aceita várias com o mesmo q
+ALGORITMOS = tuple(
+    algoritmo
+    for algoritmo in (a.strip().lower() for a in os.getenv("COMPRESSAO_ALGORITMOS", "zstd,br,gzip").split(","))
+    if _DISPONIVEIS.get(algoritmo)
+)
+
+Compressor = Tuple[Callable[[bytes], bytes], Callable[[], bytes]]
+
+
+def negociar(accept_encoding: str) -> Optional[str]:
+    """Escolhe a codificação pelo Accept-Encoding (com valores q); None se nenhuma serve."""
+    pesos = {}
+    for item in accept_encoding.split(","):
+        nome, _, parametros = item.partition(";")
+        nome = nome.strip().lower()
+        if not nome:
+            continue
+        q = 1.0
+        for parametro in parametros.split(";"):
+            chave, _, valor = parametro.partition("=")
+            if chave.strip().lower() == "q":
+                try:
+                    q = float(valor)
+                except ValueError:
+                    q = 0.0
+        pesos[nome] = q
+
+    escolhido, melhor_q = None, 0.0
+    for algoritmo in ALGORITMOS:
+        q = pesos.get(algoritmo, pesos.get("*", 0.0))
+        if q > melhor_q:
+            escolhido, melhor_q = algoritmo, q
+    return escolhido
+
+
+def novo_compressor(algoritmo: str) -> Compressor:
+    """(comprimir, finalizar) de um fluxo novo no algoritmo pedido."""
+    if algoritmo == "gzip":
+        fluxo = zlib.compressobj(NIVEL_GZIP, zlib.DEFLATED, 31)
+        return fluxo.compress, fluxo.flush
+    if algoritmo == "br":
+        fluxo = brotli.Compressor(quality=NIVEL_BROTLI)
+        return fluxo.process, fluxo.finish
+    fluxo = zstandard.ZstdCompressor(level=NIVEL_ZSTD).compressobj()
+    return fluxo.compress, fluxo.flush
+
+
+def comprimir_corpo(algoritmo: str, corpo: bytes) -> Tuple[bytes, float]:
+    """Comprime o corpo inteiro; devolve também o tempo de CPU gasto (desta thread)."""
+    inicio = time.thread_time()
+    comprimir, finalizar = novo_compressor(algoritmo)
+    resultado = comprimir(corpo) + finalizar()
+    return resultado, time.thread_time() - inicio
+
+
+def registrar_compressao(algoritmo: str, original: int, comprimido: int, cpu: float) -> None:
+    BYTES_ORIGINAIS.labels(algoritmo).inc(original)
+    BYTES_COMPRIMIDOS.labels(algoritmo).inc(comprimido)
+    if comprimido:
+        RAZAO_COMPRESSAO.labels(algoritmo).observe(original / comprimido)
+    CPU_COMPRESSAO.labels(algoritmo).observe(cpu)
+
+
+def _enfraquecer_etag(cabecalhos: MutableHeaders) -> None:
+    """O corpo pode sair comprimido (outra representação): o ETag forte passa a fraco (W/)."""
+    etag = cabecalhos.get("etag")
+    if etag and not etag.startswith("W/"):
+        cabecalhos["ETag"] = "W/" + etag
+
+
+class _RespostaComprimida:
+    """Estado de uma resposta: decide na primeira parte do corpo se comprime ou repassa."""
+
+    def __init__(self, send, algoritmo: Optional[str]):
+        self.send = send
+        self.algoritmo = algoritmo
+        self.inicio = None
+        self.modo = None  # "repassar" ou "streaming", definido na primeira parte
+        self.compressor: Optional[Compressor] = None
+        self.bytes_originais = 0
+        self.bytes_comprimidos = 0
+        self.cpu = 0.0
+
+    async def __call__(self, mensagem):
+        if mensagem["type"] == "http.response.start":
+            self.inicio = mensagem
+            return
+        if mensagem["type"] != "http.response.body" or self.modo == "repassar":
+            await self.send(mensagem)
+        elif self.modo == "streaming":
+            await self._parte_streaming(mensagem)
+        else:
+            await self._primeira_parte(mensagem)
+
+    def _motivo_para_nao_comprimir(self, cabecalhos: MutableHeaders, corpo: bytes, mais: bool) -> Optional[str]:
+        if "content-encoding" in cabecalhos:
+            return "codificada"
+        if self.inicio["status"] == 304:
+            # Sem corpo nem Content-Type: repete o Vary e o ETag que o 200 enviaria
+            cabecalhos.add_vary_header("Accept-Encoding")
+            if self.algoritmo is not None:
+                _enfraquecer_etag(cabecalhos)
+            return "nao_modificada"
+        tipo = cabecalhos.get("content-type", "").split(";", 1)[0].strip().lower()
+        if tipo not in TIPOS_COMPRIMIVEIS:
+            return "tipo"
+        # Daqui em diante a resposta depende do Accept-Encoding
+        cabecalhos.add_vary_header("Accept-Encoding")
+        if self.algoritmo is None:
+            return "sem_suporte"
+        # Para quem aceita compressão o ETag é sempre fraco, comprimindo ou
+        # não este corpo (tamanho, ganho), igual ao que vai no 304
+        _enfraquecer_etag(cabecalhos)
+        if not mais and len(corpo) < TAMANHO_MINIMO:
+            return "pequena"
+        return None
+
+    async def _repassar(self, mensagem, motivo: str):
+        RESPOSTAS_NAO_COMPRIMIDAS.labels(motivo).inc()
+        self.modo = "repassar"
+        await self.send(self.inicio)
+        await self.send(mensagem)
+
+    async def _primeira_parte(self, mensagem):
+        corpo = mensagem.get("body", b"")
+        mais = mensagem.get("more_body", False)
+        cabecalhos = MutableHeaders(raw=self.inicio["headers"])
+        motivo = self._motivo_para_nao_comprimir(cabecalhos, corpo, mais)
+        if motivo:
+            await self._repassar(mensagem, motivo)
+            return
+
+        if mais:
+            # Streaming: tamanho final desconhecido, comprime parte a parte
+            self.modo = "streaming"
+            self.compressor = novo_compressor(self.algoritmo)
+            del cabecalhos["content-length"]
+            cabecalhos["Content-Encoding"] = self.algoritmo
+            await self.send(self.inicio)
+            await self._parte_streaming(mensagem)
+            return
+
+        if len(corpo) >= LIMITE_COMPRESSAO_EM_THREAD:
+            comprimido, cpu = await anyio.to_thread.run_sync(comprimir_corpo, self.algoritmo, corpo)
+        else:
+            comprimido, cpu = comprimir_corpo(self.algoritmo, corpo)
+        if len(comprimido) >= len(corpo):
+            await self._repassar(mensagem, "sem_ganho")
+            return
+
+        registrar_compressao(self.algoritmo, len(corpo), len(comprimido), cpu)
+        cabecalhos["Content-Encoding"] = self.algoritmo
+        cabecalhos["Content-Length"] = str(len(comprimido))
+        await self.send(self.inicio)
+        await self.send({"type": "http.response.body", "body": comprimido})
+
+    async def _parte_streaming(self, mensagem):
+        corpo = mensagem.get("body", b"")
+        mais = mensagem.get("more_body", False)
+        comprimir, finalizar = self.compressor
+
+        inicio = time.thread_time()
+        saida = comprimir(corpo) if corpo else b""
+        if not mais:
+            saida += finalizar()
+        self.cpu += time.thread_time() - inicio
+        self.bytes_originais += len(corpo)
+        self.bytes_comprimidos += len(saida)
+
+        # O compressor acumula partes pequenas; só envia quando há saída ou no fim
+        if saida or not mais:
+            await self.send({"type": "http.response.body", "body": saida, "more_body": mais})
+        if not mais:
+            registrar_compressao(self.algoritmo, self.bytes_originais, self.bytes_comprimidos, self.cpu)
+
+
+class MiddlewareCompressao:
+    """Middleware ASGI: comprime respostas elegíveis no algoritmo negociado com o cliente."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for nome, valor in scope["headers"]:
+            if nome == b"accept-encoding":
+                accept_encoding = valor.decode("latin-1")
+                break
+        await self.app(scope, receive, _RespostaComprimida(send, negociar(accept_encoding)))
@@ -0,0 +1,75 @@
+# =============================================================
+# Utilitários de Contribuições
+# Regras compartilhadas entre o registro individual e o
+# registro em lote: data padrão, tipos aceitos e detecção de
+# contribuições possivelmente duplicadas.
+# =============================================================
+
+import asyncio
+import hashlib
+from collections import Counter
+from datetime import date, datetime, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, List, Optional
+
+from armazenamento import banco
+
+TIPOS_CONTRIBUICAO = ("dizimo", "oferta", "doacao", "outro")
+
+_DIA_BASE = date(2000, 1, 1)
+
+# Impressões por consulta IN (mantém a URL do PostgREST em tamanho seguro)
+_IMPRESSOES_POR_CONSULTA = 300
+
+
+def data_contribuicao(data: Optional[str]) -> str:
+    """Data informada ou hoje (AAAA-MM-DD)."""
+    return data or datetime.now().strftime("%Y-%m-%d")
+
+
+def mensagem_duplicacao(quantidade: int) -> str:
+    return (
+        f"Aviso: Encontrada {quantidade} contribuição(ões) similar(es) para este membro "
+        "no período. Confirme se deseja registrar novamente."
+    )
+
+
+def impressao_contribuicao(membro_id: str, tipo: str, valor: float, dia: date) -> str:
+    """
+    Impressão digital (membro, tipo, valor, dia) — mesma fórmula da coluna
+    gerada contribuicoes.impressao (ver 012-create-contribuicoes-impressao.sql).
+    """
+    valor_texto = Decimal(str(valor)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    dias = (dia - _DIA_BASE).days
+    # uuid::text no Postgres é sempre minúsculo
+    return hashlib.md5(f"{membro_id.lower()}|{tipo}|{valor_texto}|{dias}".encode()).hexdigest()
+
+
+async def contar_duplicadas(itens: List[Dict[str, Any]]) -> List[int]:
+    """
+    Para cada item (membro_id, tipo, valor, data) conta as contribuições
+    já registradas com mesmo membro, tipo e valor em data ±1 dia.
+    Consulta o índice de impressões com IN (uma consulta para até 100 itens;
+    lotes maiores são divididos e consultados em paralelo).
+    """
+    if not itens:
+        return []
+
+    impressoes_por_item = []
+    for item in itens:
+        dia = datetime.strptime(item["data"], "%Y-%m-%d").date()
+        impressoes_por_item.append([
+            impressao_contribuicao(item["membro_id"], item["tipo"], item["valor"], dia + timedelta(days=delta))
+            for delta in (-1, 0, 1)
+        ])
+
+    todas = sorted({i for impressoes in impressoes_por_item for i in impressoes})
+    respostas = await asyncio.gather(*[
+        banco.table("contribuicoes").select("impressao").in_(
+            "impressao", todas[i:i + _IMPRESSOES_POR_CONSULTA]
+        ).execute()
+        for i in range(0, len(todas), _IMPRESSOES_POR_CONSULTA)
+    ])
+    encontradas = Counter(c["impressao"] for r in respostas for c in r.data or [])
+
+    return [sum(encontradas[i] for i in impressoes) for impressoes in impressoes_por_item]
@@ -0,0 +1,73 @@
+# =============================================================
+# Utilitários de Exportação
+# Percorre tabelas grandes em lotes (paginação por cursor) e
+# gera CSV ou NDJSON linha a linha para StreamingResponse,
+# mantendo a memória constante em exportações de vários anos.
+# =============================================================
+
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Sequence
+
+from paginacao_utils import codificar_cursor, paginar
+
+TAMANHO_LOTE = 1000
+
+TIPOS_MIDIA = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+async def percorrer_em_lotes(
+    criar_query: Callable[[], Any],
+    coluna: str,
+    desc: bool = False,
+    lote: int = TAMANHO_LOTE,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Itera todas as linhas de uma consulta, um lote por requisição.
+    `criar_query` devolve um builder novo a cada lote (os builders do
+    PostgREST são mutáveis e não podem ser reaproveitados).
+    """
+    cursor = None
+    while True:
+        resposta = await paginar(criar_query(), coluna, lote, cursor, desc=desc).execute()
+        linhas = resposta.data or []
+        for linha in linhas[:lote]:
+            yield linha
+        if len(linhas) <= lote:
+            return
+        ultima = linhas[lote - 1]
+        cursor = codificar_cursor(ultima[coluna], ultima["id"])
+
+
+async def gerar_csv(linhas: AsyncIterator[Dict[str, Any]], colunas: Sequence[str]) -> AsyncIterator[str]:
+    """Cabeçalho + uma linha CSV por registro."""
+    buffer = io.StringIO()
+    escritor = csv.DictWriter(buffer, fieldnames=list(colunas), extrasaction="ignore")
+    escritor.writeheader()
+    yield buffer.getvalue()
+    async for linha in linhas:
+        buffer.seek(0)
+        buffer.truncate()
+        escritor.writerow(linha)
+        yield buffer.getvalue()
+
+
+async def gerar_ndjson(linhas: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Um objeto JSON por linha."""
+    async for linha in linhas:
+        yield json.dumps(linha, ensure_ascii=False, default=str) + "\n"
+
+
+def gerar_arquivo(
+    linhas: AsyncIterator[Dict[str, Any]],
+    formato: str,
+    colunas: Sequence[str],
+) -> AsyncIterator[str]:
+    """Escolhe o gerador conforme o formato pedido (csv ou ndjson)."""
+    if formato == "csv":
+        return gerar_csv(linhas, colunas)
+    return gerar_ndjson(linhas)
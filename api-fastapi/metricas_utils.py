@@ -0,0 +1,188 @@
+# =============================================================
+# Utilitários de Métricas (Prometheus)
+# Middleware ASGI com contagem/latência por rota e requisições
+# em andamento, instrumentação do execute() do armazenamento
+# (PostgREST ou SQLite: tempo e linhas por tabela/operação) e
+# ocupação do pool de threads, compressão das respostas
+# (bytes antes/depois, razão e CPU por algoritmo) e acertos,
+# falhas e ocupação dos caches em memória.
+# Exposto em GET /metrics.
+# =============================================================
+
+import time
+from typing import Any, Tuple
+
+import anyio.to_thread
+from postgrest._async.request_builder import AsyncQueryRequestBuilder, AsyncSingleRequestBuilder
+from armazenamento_sqlite import ConsultaSQLite, RpcSQLite
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+TIPO_MIDIA_METRICAS = CONTENT_TYPE_LATEST
+
+# -------------------- HTTP --------------------
+REQUISICOES = Counter(
+    "http_requisicoes_total",
+    "Requisições HTTP atendidas",
+    ["metodo", "rota", "status"],
+)
+DURACAO_REQUISICAO = Histogram(
+    "http_requisicao_duracao_segundos",
+    "Latência das requisições HTTP (até o fim do corpo da resposta)",
+    ["metodo", "rota"],
+)
+EM_ANDAMENTO = Gauge(
+    "http_requisicoes_em_andamento",
+    "Requisições HTTP sendo atendidas agora",
+)
+
+# -------------------- Compressão de respostas --------------------
+BYTES_ORIGINAIS = Counter(
+    "http_compressao_bytes_originais_total",
+    "Bytes das respostas comprimidas, antes da compressão",
+    ["algoritmo"],
+)
+BYTES_COMPRIMIDOS = Counter(
+    "http_compressao_bytes_comprimidos_total",
+    "Bytes das respostas comprimidas, como enviados",
+    ["algoritmo"],
+)
+RAZAO_COMPRESSAO = Histogram(
+    "http_compressao_razao",
+    "Tamanho original / tamanho comprimido de cada resposta",
+    ["algoritmo"],
+    buckets=(1, 1.5, 2, 3, 4, 6, 8, 12, 16, 24, 32),
+)
+CPU_COMPRESSAO = Histogram(
+    "http_compressao_cpu_segundos",
+    "Tempo de CPU gasto comprimindo cada resposta",
+    ["algoritmo"],
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+RESPOSTAS_NAO_COMPRIMIDAS = Counter(
+    "http_compressao_ignoradas_total",
+    "Respostas enviadas sem compressão, por motivo",
+    ["motivo"],
+)
+
+# -------------------- Caches em memória (cache_utils) --------------------
+CACHE_ACERTOS = Counter("cache_acertos_total", "Leituras atendidas pelo cache", ["cache"])
+CACHE_FALHAS = Counter("cache_falhas_total", "Leituras sem item válido no cache (ausente ou expirado)", ["cache"])
+CACHE_ITENS = Gauge("cache_itens", "Itens guardados no cache", ["cache"])
+
+# -------------------- Pool de threads (AnyIO) --------------------
+THREADS_EM_USO = Gauge("threadpool_threads_em_uso", "Threads do pool do AnyIO ocupadas")
+THREADS_CAPACIDADE = Gauge("threadpool_threads_capacidade", "Limite de threads do pool do AnyIO")
+THREADS_FILA = Gauge("threadpool_tarefas_aguardando", "Tarefas aguardando uma thread livre")
+
+# -------------------- Armazenamento (PostgREST ou SQLite) --------------------
+# backend: "supabase" ou "sqlite", conforme a classe que executou a consulta
+DURACAO_BANCO = Histogram(
+    "banco_consulta_duracao_segundos",
+    "Latência das consultas ao armazenamento",
+    ["backend", "tabela", "operacao"],
+)
+LINHAS_BANCO = Counter(
+    "banco_consulta_linhas_total",
+    "Linhas retornadas pelo armazenamento",
+    ["backend", "tabela", "operacao"],
+)
+ERROS_BANCO = Counter(
+    "banco_consulta_erros_total",
+    "Consultas ao armazenamento que falharam",
+    ["backend", "tabela", "operacao"],
+)
+
+_OPERACOES = {"GET": "select", "HEAD": "select", "POST": "insert", "PATCH": "update", "DELETE": "delete"}
+
+
+def _rotulos_consulta(builder: Any) -> Tuple[str, str]:
+    """(tabela, operacao) a partir do caminho e do método da requisição montada."""
+    if hasattr(builder, "rotulos"):
+        return builder.rotulos()
+    requisicao = builder.request
+    caminho = str(requisicao.path).rstrip("/").rsplit("/rest/v1/", 1)[-1]
+    if caminho.startswith("rpc/"):
+        return caminho[4:], "rpc"
+    operacao = _OPERACOES.get(requisicao.http_method, requisicao.http_method.lower())
+    if operacao == "insert" and "merge-duplicates" in requisicao.headers.get("prefer", ""):
+        operacao = "upsert"
+    return caminho, operacao
+
+
+def _contar_linhas(dados: Any) -> int:
+    if isinstance(dados, list):
+        return len(dados)
+    return 1 if dados else 0
+
+
+def _instrumentar(classe: type, backend: str) -> None:
+    """Envolve classe.execute medindo tempo, linhas e erros (idempotente)."""
+    original = classe.execute
+    if getattr(original, "_instrumentado", False):
+        return
+
+    async def execute(self):
+        tabela, operacao = _rotulos_consulta(self)
+        inicio = time.perf_counter()
+        try:
+            resposta = await original(self)
+        except Exception:
+            ERROS_BANCO.labels(backend, tabela, operacao).inc()
+            raise
+        finally:
+            DURACAO_BANCO.labels(backend, tabela, operacao).observe(time.perf_counter() - inicio)
+        LINHAS_BANCO.labels(backend, tabela, operacao).inc(_contar_linhas(resposta.data))
+        return resposta
+
+    execute._instrumentado = True
+    execute.__doc__ = original.__doc__
+    classe.execute = execute
+
+
+# Consultas, filtros e RPC herdam de AsyncQueryRequestBuilder;
+# maybe_single() delega para AsyncSingleRequestBuilder
+_instrumentar(AsyncQueryRequestBuilder, "supabase")
+_instrumentar(AsyncSingleRequestBuilder, "supabase")
+# Modo SQLite (ARMAZENAMENTO=sqlite)
+_instrumentar(ConsultaSQLite, "sqlite")
+_instrumentar(RpcSQLite, "sqlite")
+
+
+class MiddlewareMetricas:
+    """Middleware ASGI: conta e cronometra cada requisição pela rota declarada."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def enviar(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+
+        EM_ANDAMENTO.inc()
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            EM_ANDAMENTO.dec()
+            # Rótulo pelo molde da rota (/api/membros/{membro_id}), não pela URL
+            rota = getattr(scope.get("route"), "path", "desconhecida")
+            DURACAO_REQUISICAO.labels(scope["method"], rota).observe(time.perf_counter() - inicio)
+            REQUISICOES.labels(scope["method"], rota, str(status)).inc()
+
+
+def gerar_metricas() -> bytes:
+    """Atualiza a ocupação do pool de threads e serializa o registro no formato texto."""
+    limitador = anyio.to_thread.current_default_thread_limiter()
+    THREADS_EM_USO.set(limitador.borrowed_tokens)
+    THREADS_CAPACIDADE.set(limitador.total_tokens)
+    THREADS_FILA.set(limitador.statistics().tasks_waiting)
+    return generate_latest()
@@ -1,10 +1,11 @@
 # =============================================================
 # CongregaFiel — Modelos de Dados (Pydantic)
-# Definição dos schemas de validação para a API
+# Definição dos schemas de validação para a API e dos modelos
+# de resposta (response_model das rotas)
 # =============================================================
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional, Union
 
 
 # -------------------- Igreja --------------------
@@ -137,3 +138,238 @@ class LoginReq(BaseModel):
 
 class RecuperarSenhaReq(BaseModel):
     email: str = Field(..., description="E-mail cadastrado para recuperação")
+
+
+# =============================================
+# MODELOS DE RESPOSTA
+# Com response_model o FastAPI valida e serializa pelo pydantic-core
+# e entrega o resultado direto ao ORJSONResponse, sem passar pelo
+# jsonable_encoder. Campos dos recursos são opcionais porque ?campos=
+# projeta só parte das colunas (as rotas usam exclude_unset); colunas
+# fora de CAMPOS_PERMITIDOS (ex.: senha_hash) são descartadas.
+# Os campos seguem a ordem das colunas da tabela (a do select *) e os
+# numéricos aceitam int ou float para sair como vieram (0, não 0.0).
+# =============================================
+
+Numero = Union[int, float]
+
+
+# -------------------- Recursos --------------------
+class IgrejaResposta(BaseModel):
+    id: Optional[str] = None
+    nome: Optional[str] = None
+    endereco: Optional[str] = None
+    descricao: Optional[str] = None
+    codigo: Optional[str] = None
+    nome_pastor: Optional[str] = None
+    email: Optional[str] = None
+    latitude: Optional[Numero] = None
+    longitude: Optional[Numero] = None
+    criado_em: Optional[str] = None
+    atualizado_em: Optional[str] = None
+    criado_por: Optional[str] = None
+    atualizado_por: Optional[str] = None
+
+
+class MembroResposta(BaseModel):
+    id: Optional[str] = None
+    nome_completo: Optional[str] = None
+    email: Optional[str] = None
+    telefone: Optional[str] = None
+    tipo: Optional[str] = None
+    igreja_id: Optional[str] = None
+    codigo_igreja: Optional[str] = None
+    criado_em: Optional[str] = None
+    atualizado_em: Optional[str] = None
+    criado_por: Optional[str] = None
+    atualizado_por: Optional[str] = None
+
+
+class EventoResposta(BaseModel):
+    id: Optional[str] = None
+    titulo: Optional[str] = None
+    descricao: Optional[str] = None
+    data: Optional[str] = None
+    horario: Optional[str] = None
+    local: Optional[str] = None
+    tipo: Optional[str] = None
+    igreja_id: Optional[str] = None
+    criado_em: Optional[str] = None
+    atualizado_em: Optional[str] = None
+    criado_por: Optional[str] = None
+    atualizado_por: Optional[str] = None
+
+
+class ContribuicaoResposta(BaseModel):
+    id: Optional[str] = None
+    membro_id: Optional[str] = None
+    igreja_id: Optional[str] = None
+    membro_nome: Optional[str] = None
+    tipo: Optional[str] = None
+    valor: Optional[Numero] = None
+    data: Optional[str] = None
+    descricao: Optional[str] = None
+    criado_em: Optional[str] = None
+    atualizado_em: Optional[str] = None
+    criado_por: Optional[str] = None
+    atualizado_por: Optional[str] = None
+    usuario_id: Optional[str] = None
+    metodo_pagamento: Optional[str] = None
+    referencia_externa: Optional[str] = None
+    status: Optional[str] = None
+    recebido_em: Optional[str] = None
+    aviso: Optional[str] = Field(None, description="Possível duplicação detectada no registro")
+
+
+class ComunicadoResposta(BaseModel):
+    id: Optional[str] = None
+    igreja_id: Optional[str] = None
+    titulo: Optional[str] = None
+    conteudo: Optional[str] = None
+    prioridade: Optional[str] = None
+    criado_em: Optional[str] = None
+    atualizado_em: Optional[str] = None
+    criado_por: Optional[str] = None
+    atualizado_por: Optional[str] = None
+
+
+class PedidoOracaoResposta(BaseModel):
+    id: Optional[str] = None
+    igreja_id: Optional[str] = None
+    membro_id: Optional[str] = None
+    membro_nome: Optional[str] = None
+    pedido: Optional[str] = None
+    status: Optional[str] = None
+    resposta: Optional[str] = None
+    respondido_em: Optional[str] = None
+    respondido_por: Optional[str] = None
+    criado_em: Optional[str] = None
+    atualizado_em: Optional[str] = None
+    criado_por: Optional[str] = None
+    atualizado_por: Optional[str] = None
+
+
+class ItemLoteContribuicao(BaseModel):
+    indice: int
+    status: Optional[str] = None
+    erro: Optional[str] = None
+    contribuicao: Optional[ContribuicaoResposta] = None
+    aviso: Optional[str] = None
+
+
+class LoteContribuicoesResposta(BaseModel):
+    total: int
+    criadas: int
+    erros: int
+    resultados: List[ItemLoteContribuicao]
+
+
+class BuscaLoteMembros(BaseModel):
+    itens: List[MembroResposta]
+    nao_encontrados: List[str]
+
+
+class BuscaLoteEventos(BaseModel):
+    itens: List[EventoResposta]
+    nao_encontrados: List[str]
+
+
+class BuscaLoteContribuicoes(BaseModel):
+    itens: List[ContribuicaoResposta]
+    nao_encontrados: List[str]
+
+
+# -------------------- Relatórios --------------------
+class Periodo(BaseModel):
+    inicio: Optional[str] = None
+    fim: Optional[str] = None
+
+
+class ResumoMes(BaseModel):
+    total: Numero
+    quantidade: int
+    tipos: Dict[str, Numero]
+
+
+class RelatorioResumoMensal(BaseModel):
+    tipo: str
+    periodo: Periodo
+    dados: Dict[str, ResumoMes]
+    total_geral: Numero
+
+
+class MembroHistorico(BaseModel):
+    id: str
+    nome: str
+    email: Optional[str] = None
+
+
+class RelatorioHistoricoMembro(BaseModel):
+    tipo: str
+    membro: MembroHistorico
+    periodo: Periodo
+    contribuicoes: List[ContribuicaoResposta]
+    totais_por_tipo: Dict[str, Numero]
+    total_geral: Numero
+    quantidade: int
+
+
+class RelatorioComparativoAnual(BaseModel):
+    tipo: str
+    anos: List[str]
+    por_mes: Dict[str, Dict[str, Numero]]
+    total_ano1: Numero
+    total_ano2: Numero
+
+
+class ContribuinteRanking(BaseModel):
+    membro_id: Optional[str] = None
+    nome: str
+    email: str
+    total: Numero
+    contribuicoes: int
+
+
+class RelatorioTopContribuintes(BaseModel):
+    tipo: str
+    limite: int
+    periodo: Periodo
+    ranking: List[ContribuinteRanking]
+    total_geral: Numero
+
+
+class MembroInadimplente(BaseModel):
+    membro_id: str
+    nome: str
+    email: str
+    dias_atraso: Union[int, str] = Field(..., description="Dias desde a última contribuição ou \"Nunca contribuiu\"")
+    ultima_contribuicao: Optional[str] = None
+
+
+class RelatorioInadimplentes(BaseModel):
+    tipo: str
+    dias_limite: int
+    data_limite: str
+    total: int
+    membros: List[MembroInadimplente]
+
+
+class DetalheFluxo(BaseModel):
+    membro_id: Optional[str] = None
+    tipo: str
+    valor: Numero
+
+
+class DiaFluxo(BaseModel):
+    entrada: Numero
+    quantidade: int
+    detalhes: List[DetalheFluxo]
+    saldo_acumulado: Numero
+
+
+class RelatorioFluxoCaixa(BaseModel):
+    tipo: str
+    periodo: Periodo
+    saldo_inicial: Numero
+    por_dia: Dict[str, DiaFluxo]
+    total_periodo: Numero
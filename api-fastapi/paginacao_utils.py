@@ -0,0 +1,73 @@
+# =============================================================
+# Utilitários de Paginação
+# Paginação por cursor (keyset) para as rotas de listagem:
+# a página seguinte é filtrada a partir da última linha vista,
+# então o custo não cresce com a posição na lista.
+# =============================================================
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Response
+
+LIMITE_PADRAO = 1000
+LIMITE_MAXIMO = 1000
+CABECALHO_PROXIMO_CURSOR = "X-Proximo-Cursor"
+
+
+def codificar_cursor(valor: Any, id_linha: str) -> str:
+    """Gera o cursor opaco a partir do valor da coluna de ordenação e do id."""
+    bruto = json.dumps([valor, id_linha], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(bruto).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> Tuple[Any, str]:
+    """Lê o cursor recebido do cliente; cursores malformados geram erro 400."""
+    try:
+        preenchimento = "=" * (-len(cursor) % 4)
+        valor, id_linha = json.loads(base64.urlsafe_b64decode(cursor + preenchimento))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    # Os valores vão entre aspas no filtro do PostgREST
+    if '"' in str(valor) or '"' in str(id_linha):
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+    return valor, str(id_linha)
+
+
+def _filtro_cursor(coluna: str, valor: Any, id_linha: str, desc: bool) -> str:
+    """
+    Filtro (or_ do PostgREST) das linhas depois do cursor. Os nulos da
+    coluna ficam por último em ASC e primeiro em DESC, como no PostgreSQL,
+    e um cursor sobre um nulo (null no JSON) continua só pelo id.
+    """
+    op = "lt" if desc else "gt"
+    desempate = f'id.{op}."{id_linha}"'
+    if valor is None:
+        if desc:
+            return f"and({coluna}.is.null,{desempate}),{coluna}.not.is.null"
+        return f"and({coluna}.is.null,{desempate})"
+    filtro = f'{coluna}.{op}."{valor}",and({coluna}.eq."{valor}",{desempate})'
+    if not desc:
+        filtro += f",{coluna}.is.null"
+    return filtro
+
+
+def paginar(query, coluna: str, limite: int, cursor: Optional[str] = None, desc: bool = False):
+    """
+    Aplica ordenação (coluna + id como desempate), o filtro do cursor
+    e busca uma linha extra para saber se há próxima página.
+    """
+    if cursor:
+        valor, id_linha = decodificar_cursor(cursor)
+        query = query.or_(_filtro_cursor(coluna, valor, id_linha, desc))
+    return query.order(coluna, desc=desc, nullsfirst=desc).order("id", desc=desc).limit(limite + 1)
+
+
+def montar_pagina(response: Response, linhas: List[Dict[str, Any]], coluna: str, limite: int) -> List[Dict[str, Any]]:
+    """Corta a linha extra e publica o próximo cursor no cabeçalho da resposta."""
+    if len(linhas) > limite:
+        linhas = linhas[:limite]
+        ultima = linhas[-1]
+        response.headers[CABECALHO_PROXIMO_CURSOR] = codificar_cursor(ultima[coluna], ultima["id"])
+    return linhas
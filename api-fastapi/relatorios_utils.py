@@ -1,87 +1,90 @@
 # =============================================================
 # Utilitários de Relatórios Financeiros
-# Funções para gerar relatórios consolidados
+# Funções para gerar relatórios consolidados. Todo relatório é
+# de uma igreja: igreja_id é obrigatório e vai como filtro para
+# o banco (índices compostos por igreja_id e data).
 # =============================================================
 
+import asyncio
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
-from supabase_client import supabase
+from typing import List, Dict, Any, AsyncIterator
+from armazenamento import banco
+from colunar_utils import consolidar_meses, dias_desde, somar, totais_por_mes_do_ano, totais_por_tipo
+from exportacao_utils import percorrer_em_lotes
 
 
-def resumo_mensal(data_inicio: str, data_fim: str) -> Dict[str, Any]:
+async def _totais_mensais(igreja_id: str, data_inicio: str, data_fim: str) -> List[Dict[str, Any]]:
     """
-    Retorna resumo mensal de contribuições.
-    Agrupa por mês e soma valores.
+    Totais (soma e quantidade) por mês YYYY-MM e tipo, agregados no banco
+    a partir do livro-razão diário (contribuicoes_diarias).
     """
-    try:
-        # Query contribuições no período
-        resp = supabase.table("contribuicoes").select(
-            "id,membro_id,tipo,valor,data,membros(nome_completo)"
-        ).gte("data", data_inicio).lte("data", data_fim).execute()
+    resp = await banco.rpc("relatorio_totais_mensais", {
+        "p_igreja_id": igreja_id,
+        "p_data_inicio": data_inicio,
+        "p_data_fim": data_fim,
+    }).execute()
+    return resp.data or []
 
-        contribuicoes = resp.data or []
 
-        # Agrupar por mês
-        resumo = {}
-        for contrib in contribuicoes:
-            # Extrair mês (YYYY-MM)
-            data_parts = contrib["data"].split("-")
-            mes_key = f"{data_parts[0]}-{data_parts[1]}"
+async def _saldo_ate(igreja_id: str, data: str) -> float:
+    """
+    Saldo acumulado das contribuições da igreja até o fim do dia `data`,
+    a partir do último ponto mensal (saldos_mensais) mais os dias do mês.
+    """
+    resp = await banco.rpc("relatorio_saldo_ate", {"p_igreja_id": igreja_id, "p_data": data}).execute()
+    return resp.data or 0
 
-            if mes_key not in resumo:
-                resumo[mes_key] = {"total": 0, "quantidade": 0, "tipos": {}}
 
-            resumo[mes_key]["total"] += contrib["valor"]
-            resumo[mes_key]["quantidade"] += 1
+def _vespera(data: str) -> str:
+    return (datetime.strptime(data, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
 
-            tipo = contrib["tipo"]
-            if tipo not in resumo[mes_key]["tipos"]:
-                resumo[mes_key]["tipos"][tipo] = 0
-            resumo[mes_key]["tipos"][tipo] += contrib["valor"]
 
-        # Ordenar por mês
-        resumo_ordenado = {k: resumo[k] for k in sorted(resumo.keys())}
+async def resumo_mensal(igreja_id: str, data_inicio: str, data_fim: str) -> Dict[str, Any]:
+    """
+    Retorna resumo mensal de contribuições.
+    A soma por mês e tipo é feita no banco (RPC relatorio_totais_mensais);
+    a consolidação dos tipos de cada mês é vetorizada (colunar_utils).
+    """
+    try:
+        totais = await _totais_mensais(igreja_id, data_inicio, data_fim)
 
         return {
             "tipo": "resumo_mensal",
             "periodo": {"inicio": data_inicio, "fim": data_fim},
-            "dados": resumo_ordenado,
-            "total_geral": sum(item["total"] for item in resumo_ordenado.values()),
+            "dados": consolidar_meses(totais),
+            "total_geral": somar(totais, "total"),
         }
     except Exception as e:
         return {"erro": str(e)}
 
 
-def historico_membro(membro_id: str, data_inicio: str = None, data_fim: str = None) -> Dict[str, Any]:
+async def historico_membro(
+    igreja_id: str, membro_id: str, data_inicio: str = None, data_fim: str = None
+) -> Dict[str, Any]:
     """
-    Retorna histórico de contribuições de um membro específico.
+    Retorna histórico de contribuições de um membro específico da igreja.
     """
     try:
-        # Buscar membro
-        resp_membro = supabase.table("membros").select("*").eq("id", membro_id).execute()
+        # Buscar membro (só os da própria igreja)
+        resp_membro = await banco.table("membros").select("*").eq("id", membro_id).eq("igreja_id", igreja_id).execute()
         if not resp_membro.data:
             return {"erro": "Membro não encontrado", "status": 404}
 
         membro = resp_membro.data[0]
 
         # Query contribuições
-        query = supabase.table("contribuicoes").select("*").eq("membro_id", membro_id)
+        query = banco.table("contribuicoes").select("*").eq("igreja_id", igreja_id).eq("membro_id", membro_id)
 
         if data_inicio:
             query = query.gte("data", data_inicio)
         if data_fim:
             query = query.lte("data", data_fim)
 
-        resp = query.order("data", desc=True).execute()
+        resp = await query.order("data", desc=True).execute()
         contribuicoes = resp.data or []
 
-        # Calcular totais por tipo
-        totais = {}
-        for contrib in contribuicoes:
-            tipo = contrib["tipo"]
-            if tipo not in totais:
-                totais[tipo] = 0
-            totais[tipo] += contrib["valor"]
+        # Calcular totais por tipo (em centavos, vetorizado)
+        totais = totais_por_tipo(contribuicoes)
 
         return {
             "tipo": "historico_membro",
@@ -93,14 +96,14 @@ def historico_membro(membro_id: str, data_inicio: str = None, data_fim: str = No
             "periodo": {"inicio": data_inicio or "indefinido", "fim": data_fim or "indefinido"},
             "contribuicoes": contribuicoes,
             "totais_por_tipo": totais,
-            "total_geral": sum(totais.values()),
+            "total_geral": somar(contribuicoes, "valor"),
             "quantidade": len(contribuicoes),
         }
     except Exception as e:
         return {"erro": str(e)}
 
 
-def comparativo_anual(ano1: str, ano2: str) -> Dict[str, Any]:
+async def comparativo_anual(igreja_id: str, ano1: str, ano2: str) -> Dict[str, Any]:
     """
     Compara contribuições entre dois anos.
     """
@@ -110,32 +113,15 @@ def comparativo_anual(ano1: str, ano2: str) -> Dict[str, Any]:
         data2_inicio = f"{ano2}-01-01"
         data2_fim = f"{ano2}-12-31"
 
-        # Query ano 1
-        resp1 = supabase.table("contribuicoes").select("data,valor,tipo").gte(
-            "data", data1_inicio
-        ).lte("data", data1_fim).execute()
-
-        # Query ano 2
-        resp2 = supabase.table("contribuicoes").select("data,valor,tipo").gte(
-            "data", data2_inicio
-        ).lte("data", data2_fim).execute()
-
-        contrib1 = resp1.data or []
-        contrib2 = resp2.data or []
-
-        # Agrupar por mês
-        def agrupar_por_mes(contribuicoes, ano):
-            grupo = {}
-            for contrib in contribuicoes:
-                mes = contrib["data"][5:7]  # MM
-                chave = f"mes_{mes}"
-                if chave not in grupo:
-                    grupo[chave] = 0
-                grupo[chave] += contrib["valor"]
-            return grupo
-
-        meses1 = agrupar_por_mes(contrib1, ano1)
-        meses2 = agrupar_por_mes(contrib2, ano2)
+        # Totais mensais dos dois anos em paralelo
+        totais1, totais2 = await asyncio.gather(
+            _totais_mensais(igreja_id, data1_inicio, data1_fim),
+            _totais_mensais(igreja_id, data2_inicio, data2_fim),
+        )
+
+        # Agrupar por mês (somando os tipos)
+        meses1 = totais_por_mes_do_ano(totais1)
+        meses2 = totais_por_mes_do_ano(totais2)
 
         # Comparação
         comparacao = {}
@@ -156,101 +142,68 @@ def comparativo_anual(ano1: str, ano2: str) -> Dict[str, Any]:
             "tipo": "comparativo_anual",
             "anos": [ano1, ano2],
             "por_mes": comparacao,
-            "total_ano1": sum(meses1.values()),
-            "total_ano2": sum(meses2.values()),
+            "total_ano1": somar(totais1, "total"),
+            "total_ano2": somar(totais2, "total"),
         }
     except Exception as e:
         return {"erro": str(e)}
 
 
-def top_contribuintes(limite: int = 10, data_inicio: str = None, data_fim: str = None) -> Dict[str, Any]:
+async def top_contribuintes(
+    igreja_id: str, limite: int = 10, data_inicio: str = None, data_fim: str = None
+) -> Dict[str, Any]:
     """
     Retorna ranking dos maiores contribuintes.
+    Agrupamento, ordenação e limite são feitos no banco (RPC relatorio_top_contribuintes).
     """
     try:
-        query = supabase.table("contribuicoes").select(
-            "membro_id,valor,membros(nome_completo),membros(email)"
-        )
+        resp = await banco.rpc("relatorio_top_contribuintes", {
+            "p_igreja_id": igreja_id,
+            "p_limite": limite,
+            "p_data_inicio": data_inicio,
+            "p_data_fim": data_fim,
+        }).execute()
 
-        if data_inicio:
-            query = query.gte("data", data_inicio)
-        if data_fim:
-            query = query.lte("data", data_fim)
-
-        resp = query.execute()
-        contrib = resp.data or []
-
-        # Agrupar por membro
-        por_membro = {}
-        for c in contrib:
-            membro_id = c["membro_id"]
-            if membro_id not in por_membro:
-                por_membro[membro_id] = {
-                    "membro_id": membro_id,
-                    "nome": c.get("membros", {}).get("nome_completo", "Desconhecido"),
-                    "email": c.get("membros", {}).get("email", ""),
-                    "total": 0,
-                    "contribuicoes": 0,
-                }
-            por_membro[membro_id]["total"] += c["valor"]
-            por_membro[membro_id]["contribuicoes"] += 1
-
-        # Ordenar e limitar
-        top = sorted(por_membro.values(), key=lambda x: x["total"], reverse=True)[:limite]
+        top = resp.data or []
 
         return {
             "tipo": "top_contribuintes",
             "limite": limite,
             "periodo": {"inicio": data_inicio, "fim": data_fim},
             "ranking": top,
-            "total_geral": sum(item["total"] for item in top),
+            "total_geral": somar(top, "total"),
         }
     except Exception as e:
         return {"erro": str(e)}
 
 
-def inadimplentes(dias_atraso: int = 30) -> Dict[str, Any]:
+async def inadimplentes(igreja_id: str, dias_atraso: int = 30) -> Dict[str, Any]:
     """
-    Retorna membros com pagamentos atrasados.
+    Retorna membros da igreja com pagamentos atrasados.
     (Implementação simplificada - assume data limite do mês)
     """
     try:
         # Data limite (30 dias atrás)
         data_limite = (datetime.now() - timedelta(days=dias_atraso)).strftime("%Y-%m-%d")
 
-        # Buscar membros sem contribuições recentes
-        resp_membros = supabase.table("membros").select("*").execute()
-        membros = resp_membros.data or []
-
-        inadimplentes_list = []
-
-        for membro in membros:
-            # Verificar última contribuição
-            resp_contrib = supabase.table("contribuicoes").select("*").eq(
-                "membro_id", membro["id"]
-            ).order("data", desc=True).limit(1).execute()
-
-            if not resp_contrib.data:
-                # Sem nenhuma contribuição
-                inadimplentes_list.append({
-                    "membro_id": membro["id"],
-                    "nome": membro["nome_completo"],
-                    "email": membro.get("email", ""),
-                    "dias_atraso": "Nunca contribuiu",
-                    "ultima_contribuicao": None,
-                })
-            else:
-                ultima_contrib = resp_contrib.data[0]
-                ultima_data = datetime.strptime(ultima_contrib["data"], "%Y-%m-%d")
-                if ultima_data.strftime("%Y-%m-%d") < data_limite:
-                    dias = (datetime.now() - ultima_data).days
-                    inadimplentes_list.append({
-                        "membro_id": membro["id"],
-                        "nome": membro["nome_completo"],
-                        "email": membro.get("email", ""),
-                        "dias_atraso": dias,
-                        "ultima_contribuicao": ultima_contrib["data"],
-                    })
+        # Membros sem contribuição desde a data limite (uma única consulta no banco)
+        resp = await banco.rpc("relatorio_inadimplentes", {
+            "p_igreja_id": igreja_id,
+            "p_data_limite": data_limite,
+        }).execute()
+
+        membros = resp.data or []
+        atrasos = dias_desde(membros, "ultima_contribuicao")
+        inadimplentes_list = [
+            {
+                "membro_id": membro["membro_id"],
+                "nome": membro["nome"],
+                "email": membro["email"],
+                "dias_atraso": "Nunca contribuiu" if dias is None else dias,
+                "ultima_contribuicao": membro["ultima_contribuicao"],
+            }
+            for membro, dias in zip(membros, atrasos)
+        ]
 
         return {
             "tipo": "inadimplentes",
@@ -263,46 +216,71 @@ def inadimplentes(dias_atraso: int = 30) -> Dict[str, Any]:
         return {"erro": str(e)}
 
 
-def fluxo_caixa(data_inicio: str, data_fim: str) -> Dict[str, Any]:
+async def fluxo_caixa(igreja_id: str, data_inicio: str, data_fim: str) -> Dict[str, Any]:
     """
     Retorna fluxo de caixa dia a dia.
+    Totais diários e saldo acumulado vêm prontos do banco (RPC relatorio_fluxo_caixa);
+    o saldo parte de todo o histórico anterior a data_inicio, não de zero.
     """
     try:
-        resp = supabase.table("contribuicoes").select("*").gte(
-            "data", data_inicio
-        ).lte("data", data_fim).order("data").execute()
-
-        contrib = resp.data or []
-
-        # Agrupar por dia
-        fluxo = {}
-        for c in contrib:
-            data = c["data"]
-            if data not in fluxo:
-                fluxo[data] = {"entrada": 0, "quantidade": 0, "detalhes": []}
-            fluxo[data]["entrada"] += c["valor"]
-            fluxo[data]["quantidade"] += 1
-            fluxo[data]["detalhes"].append({
-                "membro_id": c["membro_id"],
-                "tipo": c["tipo"],
-                "valor": c["valor"],
-            })
-
-        # Calcular saldo acumulado
+        resp, saldo_inicial = await asyncio.gather(
+            banco.rpc("relatorio_fluxo_caixa", {
+                "p_igreja_id": igreja_id,
+                "p_data_inicio": data_inicio,
+                "p_data_fim": data_fim,
+            }).execute(),
+            _saldo_ate(igreja_id, _vespera(data_inicio)),
+        )
+
         fluxo_ordenado = {}
-        saldo_acumulado = 0
-        for data in sorted(fluxo.keys()):
-            saldo_acumulado += fluxo[data]["entrada"]
-            fluxo_ordenado[data] = {
-                **fluxo[data],
-                "saldo_acumulado": saldo_acumulado,
+        for dia in resp.data or []:
+            fluxo_ordenado[dia["dia"]] = {
+                "entrada": dia["entrada"],
+                "quantidade": dia["quantidade"],
+                "detalhes": dia["detalhes"],
+                "saldo_acumulado": dia["saldo_acumulado"],
             }
 
         return {
             "tipo": "fluxo_caixa",
             "periodo": {"inicio": data_inicio, "fim": data_fim},
+            "saldo_inicial": saldo_inicial,
             "por_dia": fluxo_ordenado,
-            "total_periodo": sum(item["entrada"] for item in fluxo_ordenado.values()),
+            "total_periodo": somar(resp.data or [], "entrada"),
         }
     except Exception as e:
         return {"erro": str(e)}
+
+
+async def fluxo_caixa_por_dia(igreja_id: str, data_inicio: str, data_fim: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Versão em streaming do fluxo de caixa (exportação).
+    Percorre as contribuições do período em lotes, ordenadas por data,
+    e emite cada dia com o saldo acumulado assim que ele termina
+    (a partir do saldo de abertura do período).
+    """
+    def criar_query():
+        return banco.table("contribuicoes").select(
+            "id,membro_id,tipo,valor,data"
+        ).eq("igreja_id", igreja_id).gte("data", data_inicio).lte("data", data_fim)
+
+    dia = None
+    saldo_acumulado = await _saldo_ate(igreja_id, _vespera(data_inicio))
+    async for c in percorrer_em_lotes(criar_query, "data"):
+        if dia is not None and c["data"] != dia["data"]:
+            saldo_acumulado += dia["entrada"]
+            yield {**dia, "saldo_acumulado": saldo_acumulado}
+            dia = None
+        if dia is None:
+            dia = {"data": c["data"], "entrada": 0, "quantidade": 0, "detalhes": []}
+        dia["entrada"] += c["valor"]
+        dia["quantidade"] += 1
+        dia["detalhes"].append({
+            "membro_id": c["membro_id"],
+            "tipo": c["tipo"],
+            "valor": c["valor"],
+        })
+
+    if dia is not None:
+        saldo_acumulado += dia["entrada"]
+        yield {**dia, "saldo_acumulado": saldo_acumulado}
@@ -4,12 +4,14 @@
 # Documentação automática em /docs (Swagger) e /redoc
 # =============================================================
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Header, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from contextlib import asynccontextmanager
+from typing import List, Optional
 from datetime import datetime
-import random
 import re
+import uuid
 
 from modelos import (
     IgrejaCriar, IgrejaAtualizar,
@@ -20,18 +22,52 @@ from modelos import (
     PedidoOracaoCriar, PedidoOracaoAtualizar,
     RegistrarIgrejaReq, RegistrarMembroReq,
     LoginReq, RecuperarSenhaReq,
+    IgrejaResposta, MembroResposta, EventoResposta, ContribuicaoResposta,
+    ComunicadoResposta, PedidoOracaoResposta, LoteContribuicoesResposta,
+    BuscaLoteMembros, BuscaLoteEventos, BuscaLoteContribuicoes,
+    RelatorioResumoMensal, RelatorioHistoricoMembro, RelatorioComparativoAnual,
+    RelatorioTopContribuintes, RelatorioInadimplentes, RelatorioFluxoCaixa,
+)
+from supabase_client import supabase, criar_cliente_auth, fechar_transporte_http
+from armazenamento import banco, fechar_armazenamento
+from campos_utils import CAMPOS_LISTAGEM, resolver_campos
+from cache_utils import (
+    obter_igreja_por_id, obter_igreja_por_codigo, obter_igrejas_publicas,
+    invalidar_igreja, etag_corresponde, obter_perfil, invalidar_perfil,
+    obter_relatorio, anos_do_periodo, anos_informados,
+    invalidar_relatorios, invalidar_relatorios_igreja,
+)
+from contribuicoes_utils import (
+    TIPOS_CONTRIBUICAO, data_contribuicao, mensagem_duplicacao, contar_duplicadas,
+)
+from metricas_utils import TIPO_MIDIA_METRICAS, MiddlewareMetricas, gerar_metricas
+from compressao_utils import MiddlewareCompressao
+from exportacao_utils import TIPOS_MIDIA, gerar_arquivo, percorrer_em_lotes
+from paginacao_utils import (
+    LIMITE_PADRAO, LIMITE_MAXIMO, CABECALHO_PROXIMO_CURSOR,
+    paginar, montar_pagina,
 )
-from supabase_client import supabase, criar_cliente_auth
 from relatorios_utils import (
     resumo_mensal, historico_membro, comparativo_anual,
-    top_contribuintes, inadimplentes, fluxo_caixa
+    top_contribuintes, inadimplentes, fluxo_caixa, fluxo_caixa_por_dia
 )
 
 # -------------------- Configuração --------------------
+@asynccontextmanager
+async def ciclo_de_vida(app: FastAPI):
+    """Libera o pool HTTP compartilhado com o Supabase e o banco local ao encerrar."""
+    yield
+    fechar_armazenamento()
+    await fechar_transporte_http()
+
+
 app = FastAPI(
     title="CongregaFiel API — Backend Principal",
     description="API REST para gestão de comunidades eclesiásticas. Backend principal acessado via API Gateway Express.",
     version="2.1.0",
+    lifespan=ciclo_de_vida,
+    # JSON serializado pelo orjson; rotas com response_model não passam pelo jsonable_encoder
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -39,19 +75,97 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CABECALHO_PROXIMO_CURSOR],
 )
+app.add_middleware(MiddlewareCompressao)
+app.add_middleware(MiddlewareMetricas)
+
+
+# Clientes e o gateway podem reutilizar a lista do mapa por 1 min e
+# servi-la "vencida" por mais 5 min enquanto revalidam em segundo plano
+CACHE_CONTROL_PUBLICAS = "public, max-age=60, stale-while-revalidate=300"
+
+LIMITE_LOTE_CONTRIBUICOES = 500
+
+# Máximo de ids por busca em lote (~3,7 KB de UUIDs na query string)
+LIMITE_BUSCA_LOTE = 100
 
 
 # =============================================
 # FUNÇÕES AUXILIARES
 # =============================================
 
-def gerar_codigo_igreja(nome_igreja: str) -> str:
-    """Gera um código único para a igreja (2 letras + 4 dígitos)."""
+def exigir_autenticacao() -> None:
+    """As rotas de autenticação dependem do Supabase Auth (ausente no modo SQLite sem credenciais)."""
+    if supabase is None:
+        raise HTTPException(status_code=503, detail="Autenticação indisponível: Supabase não configurado")
+
+
+def validar_periodo(*datas: Optional[str]) -> None:
+    """
+    Confere as datas YYYY-MM-DD (data_inicio, data_fim) da query antes de
+    consultar o banco ou abrir um streaming, que já teria enviado o 200.
+    """
+    for nome, valor in zip(("data_inicio", "data_fim"), datas):
+        if valor is None:
+            continue
+        try:
+            datetime.strptime(valor, "%Y-%m-%d")
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"{nome} inválida (use AAAA-MM-DD)")
+
+
+def uuid_canonico(valor: str) -> Optional[str]:
+    """UUID na forma canônica (minúscula, com hífens), como o Postgres devolve; None se inválido."""
+    try:
+        return str(uuid.UUID(valor))
+    except ValueError:
+        return None
+
+
+async def buscar_em_lote(tabela: str, ids: str, campos: Optional[str]) -> dict:
+    """
+    Busca vários registros por id com uma única consulta (in_).
+    Os itens voltam na ordem pedida (ids repetidos uma vez só) e os ids
+    sem registro são listados em nao_encontrados.
+    """
+    # Deduplica pela forma canônica do UUID (maiúsculas/minúsculas são o
+    # mesmo id); ids que não são UUID deduplicam pelo texto. Vale a 1ª grafia.
+    pedidos = {}
+    for pedido in (i.strip() for i in ids.split(",")):
+        if pedido:
+            pedidos.setdefault(uuid_canonico(pedido) or pedido, pedido)
+    if not pedidos:
+        raise HTTPException(status_code=400, detail="Informe ao menos um id")
+    if len(pedidos) > LIMITE_BUSCA_LOTE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A busca em lote aceita no máximo {LIMITE_BUSCA_LOTE} ids",
+        )
+
+    # ids que não são UUID não vão ao banco (o Postgres recusaria a consulta inteira)
+    canonicos = [chave for chave, pedido in pedidos.items() if uuid_canonico(pedido)]
+
+    por_id = {}
+    if canonicos:
+        resposta = await banco.table(tabela).select(
+            resolver_campos(tabela, campos)
+        ).in_("id", canonicos).execute()
+        por_id = {linha["id"]: linha for linha in resposta.data or []}
+
+    return {
+        "itens": [por_id[chave] for chave in pedidos if chave in por_id],
+        "nao_encontrados": [pedido for chave, pedido in pedidos.items() if chave not in por_id],
+    }
+
+
+def prefixo_codigo_igreja(nome_igreja: str) -> str:
+    """
+    Prefixo do código da igreja (2 primeiras letras do nome). O sufixo
+    numérico é alocado no banco por alocar_codigo_igreja, sem colisões.
+    """
     letras = re.sub(r'[^A-Za-z]', '', nome_igreja).upper()
-    prefixo = letras[:2] if len(letras) >= 2 else "CF"
-    sufixo = random.randint(1000, 9999)
-    return f"{prefixo}{sufixo}"
+    return letras[:2] if len(letras) >= 2 else "CF"
 
 
 # =============================================
@@ -59,11 +173,12 @@ def gerar_codigo_igreja(nome_igreja: str) -> str:
 # =============================================
 
 @app.post("/api/auth/registrar-igreja", status_code=201, tags=["Autenticação"], summary="Registrar nova igreja")
-def registrar_igreja(dados: RegistrarIgrejaReq):
+async def registrar_igreja(dados: RegistrarIgrejaReq):
     """Cria conta de igreja (pastor) com autenticação Supabase."""
+    exigir_autenticacao()
     try:
         # 1. Criar usuário no Supabase Auth
-        auth_resp = supabase.auth.admin.create_user({
+        auth_resp = await supabase.auth.admin.create_user({
             "email": dados.email,
             "password": dados.senha,
             "email_confirm": True,
@@ -74,44 +189,26 @@ def registrar_igreja(dados: RegistrarIgrejaReq):
         })
         usuario_id = auth_resp.user.id
 
-        # 2. Gerar código da igreja
-        codigo = gerar_codigo_igreja(dados.nome_igreja)
-
-        # 3. Inserir na tabela igrejas
+        # 2. Alocar código, inserir igreja e pastor (como membro) na mesma transação
         try:
-            dados_igreja = {
-                "id": usuario_id,
-                "nome": dados.nome_igreja,
-                "nome_pastor": dados.nome_pastor,
-                "email": dados.email,
-                "codigo": codigo,
-            }
-            if dados.endereco:
-                dados_igreja["endereco"] = dados.endereco
-            if dados.latitude is not None:
-                dados_igreja["latitude"] = dados.latitude
-            if dados.longitude is not None:
-                dados_igreja["longitude"] = dados.longitude
-
-            igreja_resp = supabase.table("igrejas").insert(dados_igreja).execute()
-
-            # 4. Inserir pastor como membro
-            supabase.table("membros").insert({
-                "id": usuario_id,
-                "nome_completo": dados.nome_pastor,
-                "email": dados.email,
-                "telefone": "",
-                "tipo": "pastor",
-                "igreja_id": usuario_id,
-                "codigo_igreja": codigo,
+            igreja_resp = await banco.rpc("registrar_igreja", {
+                "p_id": usuario_id,
+                "p_nome": dados.nome_igreja,
+                "p_nome_pastor": dados.nome_pastor,
+                "p_email": dados.email,
+                "p_prefixo": prefixo_codigo_igreja(dados.nome_igreja),
+                "p_endereco": dados.endereco or None,
+                "p_latitude": dados.latitude,
+                "p_longitude": dados.longitude,
             }).execute()
-
         except Exception:
-            # Rollback: remover usuário do Auth se falhar no banco
-            supabase.auth.admin.delete_user(usuario_id)
+            # Nada foi gravado no banco; resta apenas remover o usuário do Auth
+            await supabase.auth.admin.delete_user(usuario_id)
             raise HTTPException(status_code=500, detail="Erro ao salvar dados da igreja. Tente novamente.")
 
-        igreja = igreja_resp.data[0]
+        igreja = igreja_resp.data
+        codigo = igreja["codigo"]
+        invalidar_igreja(igreja)
         return {
             "mensagem": "Igreja registrada com sucesso",
             "usuario": {
@@ -135,18 +232,17 @@ def registrar_igreja(dados: RegistrarIgrejaReq):
 
 
 @app.post("/api/auth/registrar-membro", status_code=201, tags=["Autenticação"], summary="Registrar novo membro")
-def registrar_membro(dados: RegistrarMembroReq):
+async def registrar_membro(dados: RegistrarMembroReq):
     """Cria conta de membro vinculado a uma igreja existente."""
+    exigir_autenticacao()
     try:
         # 1. Verificar se o código da igreja existe
-        igreja_resp = supabase.table("igrejas").select("*").eq("codigo", dados.codigo_igreja).execute()
-        if not igreja_resp.data:
+        igreja = await obter_igreja_por_codigo(dados.codigo_igreja)
+        if igreja is None:
             raise HTTPException(status_code=404, detail="Código de igreja não encontrado")
 
-        igreja = igreja_resp.data[0]
-
         # 2. Criar usuário no Supabase Auth
-        auth_resp = supabase.auth.admin.create_user({
+        auth_resp = await supabase.auth.admin.create_user({
             "email": dados.email,
             "password": dados.senha,
             "email_confirm": True,
@@ -159,7 +255,7 @@ def registrar_membro(dados: RegistrarMembroReq):
 
         # 3. Inserir na tabela membros
         try:
-            supabase.table("membros").insert({
+            await banco.table("membros").insert({
                 "id": usuario_id,
                 "nome_completo": dados.nome_completo,
                 "email": dados.email,
@@ -169,7 +265,7 @@ def registrar_membro(dados: RegistrarMembroReq):
                 "codigo_igreja": dados.codigo_igreja,
             }).execute()
         except Exception:
-            supabase.auth.admin.delete_user(usuario_id)
+            await supabase.auth.admin.delete_user(usuario_id)
             raise HTTPException(status_code=500, detail="Erro ao salvar dados do membro. Tente novamente.")
 
         return {
@@ -195,11 +291,12 @@ def registrar_membro(dados: RegistrarMembroReq):
 
 
 @app.post("/api/auth/login", tags=["Autenticação"], summary="Login de usuário")
-def login(dados: LoginReq):
+async def login(dados: LoginReq):
     """Autentica um usuário (igreja ou membro) e retorna token de acesso."""
+    exigir_autenticacao()
     try:
         auth_client = criar_cliente_auth()
-        auth_resp = auth_client.auth.sign_in_with_password({
+        auth_resp = await auth_client.auth.sign_in_with_password({
             "email": dados.email,
             "password": dados.senha,
         })
@@ -207,44 +304,24 @@ def login(dados: LoginReq):
         usuario_auth = auth_resp.user
         sessao = auth_resp.session
         tipo = usuario_auth.user_metadata.get("tipo", "membro")
-
-        if tipo == "igreja":
-            # Buscar dados da igreja
-            igreja_resp = supabase.table("igrejas").select("*").eq("id", usuario_auth.id).execute()
-            if not igreja_resp.data:
-                raise HTTPException(status_code=404, detail="Dados da igreja não encontrados")
-            igreja = igreja_resp.data[0]
-            usuario = {
-                "id": usuario_auth.id,
-                "tipo": "igreja",
-                "nome": igreja.get("nome_pastor", ""),
-                "email": usuario_auth.email,
-                "igrejaId": igreja["id"],
-                "nomeIgreja": igreja["nome"],
-                "codigoIgreja": igreja.get("codigo", ""),
-            }
-        else:
-            # Buscar dados do membro + nome da igreja
-            membro_resp = supabase.table("membros").select("*").eq("id", usuario_auth.id).execute()
-            if not membro_resp.data:
-                raise HTTPException(status_code=404, detail="Dados do membro não encontrados")
-            membro = membro_resp.data[0]
-
-            nome_igreja = ""
-            if membro.get("igreja_id"):
-                igreja_resp = supabase.table("igrejas").select("nome").eq("id", membro["igreja_id"]).execute()
-                if igreja_resp.data:
-                    nome_igreja = igreja_resp.data[0]["nome"]
-
-            usuario = {
-                "id": usuario_auth.id,
-                "tipo": "membro",
-                "nome": membro.get("nome_completo", ""),
-                "email": usuario_auth.email,
-                "igrejaId": membro.get("igreja_id", ""),
-                "nomeIgreja": nome_igreja,
-                "codigoIgreja": membro.get("codigo_igreja", ""),
-            }
+        if tipo != "igreja":
+            tipo = "membro"
+
+        # Perfil (com nome da igreja) numa única consulta, ou direto do cache
+        perfil = await obter_perfil(usuario_auth.id, tipo)
+        if perfil is None:
+            detalhe = "Dados da igreja não encontrados" if tipo == "igreja" else "Dados do membro não encontrados"
+            raise HTTPException(status_code=404, detail=detalhe)
+
+        usuario = {
+            "id": usuario_auth.id,
+            "tipo": tipo,
+            "nome": perfil["nome"],
+            "email": usuario_auth.email,
+            "igrejaId": perfil["igrejaId"],
+            "nomeIgreja": perfil["nomeIgreja"],
+            "codigoIgreja": perfil["codigoIgreja"],
+        }
 
         return {
             "usuario": usuario,
@@ -261,10 +338,11 @@ def login(dados: LoginReq):
 
 
 @app.post("/api/auth/recuperar-senha", tags=["Autenticação"], summary="Recuperar senha")
-def recuperar_senha(dados: RecuperarSenhaReq):
+async def recuperar_senha(dados: RecuperarSenhaReq):
     """Envia e-mail de recuperação de senha para o usuário."""
+    exigir_autenticacao()
     try:
-        supabase.auth.reset_password_for_email(dados.email)
+        await supabase.auth.reset_password_for_email(dados.email)
         return {"mensagem": "E-mail de recuperação enviado com sucesso"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erro ao enviar e-mail de recuperação: {str(e)}")
@@ -274,33 +352,57 @@ def recuperar_senha(dados: RecuperarSenhaReq):
 # ROTAS — IGREJAS
 # =============================================
 
-@app.get("/api/igrejas/publicas", tags=["Igrejas"], summary="Listar igrejas para o mapa")
-def listar_igrejas_publicas():
-    """Retorna dados públicos das igrejas para exibição no mapa."""
-    resposta = supabase.table("igrejas").select(
-        "id, nome, endereco, codigo, nome_pastor, latitude, longitude"
-    ).order("nome").execute()
-    return resposta.data
-
-
-@app.get("/api/igrejas", tags=["Igrejas"], summary="Listar todas as igrejas")
-def listar_igrejas():
-    """Retorna a lista completa de igrejas cadastradas."""
-    resposta = supabase.table("igrejas").select("*").order("criado_em").execute()
-    return resposta.data
-
-
-@app.get("/api/igrejas/{igreja_id}", tags=["Igrejas"], summary="Buscar igreja por ID")
-def buscar_igreja(igreja_id: str):
+@app.get("/api/igrejas/publicas", tags=["Igrejas"], summary="Listar igrejas para o mapa",
+         response_model=List[IgrejaResposta], response_model_exclude_unset=True)
+async def listar_igrejas_publicas(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Retorna dados públicos das igrejas para exibição no mapa.
+    Suporta GET condicional: com If-None-Match igual ao ETag atual responde 304.
+    """
+    igrejas, etag = await obter_igrejas_publicas()
+    cabecalhos = {"ETag": etag, "Cache-Control": CACHE_CONTROL_PUBLICAS}
+    if etag_corresponde(if_none_match, etag):
+        return Response(status_code=304, headers=cabecalhos)
+    response.headers.update(cabecalhos)
+    return igrejas
+
+
+@app.get("/api/igrejas", tags=["Igrejas"], summary="Listar todas as igrejas",
+         response_model=List[IgrejaResposta], response_model_exclude_unset=True)
+async def listar_igrejas(
+    response: Response,
+    campos: Optional[str] = Query(None, description="Colunas retornadas, separadas por vírgula (ex.: id,nome)"),
+    limite: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO, description="Quantidade máxima de itens por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da página seguinte (cabeçalho X-Proximo-Cursor)"),
+):
+    """Retorna a lista de igrejas cadastradas, paginada por cursor."""
+    query = banco.table("igrejas").select(
+        resolver_campos("igrejas", campos, CAMPOS_LISTAGEM["igrejas"], ("id", "criado_em"))
+    )
+    resposta = await paginar(query, "criado_em", limite, cursor).execute()
+    return montar_pagina(response, resposta.data, "criado_em", limite)
+
+
+@app.get("/api/igrejas/{igreja_id}", tags=["Igrejas"], summary="Buscar igreja por ID",
+         response_model=IgrejaResposta, response_model_exclude_unset=True)
+async def buscar_igreja(
+    igreja_id: str,
+    campos: Optional[str] = Query(None, description="Colunas retornadas, separadas por vírgula (ex.: id,nome)"),
+):
     """Retorna os dados de uma igreja específica pelo seu ID."""
-    resposta = supabase.table("igrejas").select("*").eq("id", igreja_id).execute()
-    if not resposta.data:
+    colunas = resolver_campos("igrejas", campos).split(",")
+    igreja = await obter_igreja_por_id(igreja_id)
+    if igreja is None:
         raise HTTPException(status_code=404, detail="Igreja não encontrada")
-    return resposta.data[0]
+    return {coluna: igreja.get(coluna) for coluna in colunas}
 
 
-@app.post("/api/igrejas", status_code=201, tags=["Igrejas"], summary="Criar nova igreja")
-def criar_igreja(igreja: IgrejaCriar):
+@app.post("/api/igrejas", status_code=201, tags=["Igrejas"], summary="Criar nova igreja",
+          response_model=IgrejaResposta, response_model_exclude_unset=True)
+async def criar_igreja(igreja: IgrejaCriar):
     """Cadastra uma nova igreja no sistema."""
     dados = {
         "nome": igreja.nome,
@@ -310,12 +412,14 @@ def criar_igreja(igreja: IgrejaCriar):
         "nome_pastor": igreja.nome_pastor or "",
         "email": igreja.email,
     }
-    resposta = supabase.table("igrejas").insert(dados).execute()
+    resposta = await banco.table("igrejas").insert(dados).execute()
+    invalidar_igreja(resposta.data[0])
     return resposta.data[0]
 
 
-@app.put("/api/igrejas/{igreja_id}", tags=["Igrejas"], summary="Atualizar igreja")
-def atualizar_igreja(igreja_id: str, atualizacao: IgrejaAtualizar):
+@app.put("/api/igrejas/{igreja_id}", tags=["Igrejas"], summary="Atualizar igreja",
+         response_model=IgrejaResposta, response_model_exclude_unset=True)
+async def atualizar_igreja(igreja_id: str, atualizacao: IgrejaAtualizar):
     """Atualiza os dados de uma igreja existente."""
     campos = {}
     if atualizacao.nome is not None:
@@ -333,16 +437,19 @@ def atualizar_igreja(igreja_id: str, atualizacao: IgrejaAtualizar):
     if atualizacao.longitude is not None:
         campos["longitude"] = atualizacao.longitude
 
-    resposta = supabase.table("igrejas").update(campos).eq("id", igreja_id).execute()
+    resposta = await banco.table("igrejas").update(campos).eq("id", igreja_id).execute()
+    invalidar_igreja(resposta.data[0] if resposta.data else None, igreja_id=igreja_id)
     if not resposta.data:
         raise HTTPException(status_code=404, detail="Igreja não encontrada")
     return resposta.data[0]
 
 
 @app.delete("/api/igrejas/{igreja_id}", tags=["Igrejas"], summary="Remover igreja")
-def remover_igreja(igreja_id: str):
+async def remover_igreja(igreja_id: str):
     """Remove uma igreja do sistema pelo seu ID."""
-    resposta = supabase.table("igrejas").delete().eq("id", igreja_id).execute()
+    resposta = await banco.table("igrejas").delete().eq("id", igreja_id).execute()
+    invalidar_igreja(resposta.data[0] if resposta.data else None, igreja_id=igreja_id)
+    invalidar_relatorios_igreja(igreja_id)
     if not resposta.data:
         raise HTTPException(status_code=404, detail="Igreja não encontrada")
     return {"mensagem": "Igreja removida com sucesso", "igreja": resposta.data[0]}
@@ -352,32 +459,54 @@ def remover_igreja(igreja_id: str):
 # ROTAS — MEMBROS
 # =============================================
 
-@app.get("/api/membros", tags=["Membros"], summary="Listar membros")
-def listar_membros(
+@app.get("/api/membros", tags=["Membros"], summary="Listar membros",
+         response_model=List[MembroResposta], response_model_exclude_unset=True)
+async def listar_membros(
+    response: Response,
     igreja_id: Optional[str] = Query(None, description="Filtrar por igreja (UUID)"),
     tipo: Optional[str] = Query(None, description="Filtrar por tipo: pastor ou membro"),
+    campos: Optional[str] = Query(None, description="Colunas retornadas, separadas por vírgula (ex.: id,nome)"),
+    limite: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO, description="Quantidade máxima de itens por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da página seguinte (cabeçalho X-Proximo-Cursor)"),
 ):
     """Retorna a lista de membros com filtros opcionais."""
-    query = supabase.table("membros").select("*")
+    query = banco.table("membros").select(
+        resolver_campos("membros", campos, CAMPOS_LISTAGEM["membros"], ("id", "criado_em"))
+    )
     if igreja_id is not None:
         query = query.eq("igreja_id", igreja_id)
     if tipo is not None:
         query = query.eq("tipo", tipo)
-    resposta = query.order("criado_em").execute()
-    return resposta.data
+    resposta = await paginar(query, "criado_em", limite, cursor).execute()
+    return montar_pagina(response, resposta.data, "criado_em", limite)
+
+
+@app.get("/api/membros/lote", tags=["Membros"], summary="Buscar membros por IDs",
+         response_model=BuscaLoteMembros, response_model_exclude_unset=True)
+async def buscar_membros_em_lote(
+    ids: str = Query(..., description=f"IDs separados por vírgula (máx. {LIMITE_BUSCA_LOTE})"),
+    campos: Optional[str] = Query(None, description="Colunas retornadas, separadas por vírgula (ex.: id,nome)"),
+):
+    """Retorna os membros pedidos com uma única consulta, na ordem dos ids, e lista os não encontrados."""
+    return await buscar_em_lote("membros", ids, campos)
 
 
-@app.get("/api/membros/{membro_id}", tags=["Membros"], summary="Buscar membro por ID")
-def buscar_membro(membro_id: str):
+@app.get("/api/membros/{membro_id}", tags=["Membros"], summary="Buscar membro por ID",
+         response_model=MembroResposta, response_model_exclude_unset=True)
+async def buscar_membro(
+    membro_id: str,
+    campos: Optional[str] = Query(None, description="Colunas retornadas, separadas por vírgula (ex.: id,nome)"),
+):
     """Retorna os dados de um membro específico."""
-    resposta = supabase.table("membros").select("*").eq("id", membro_id).execute()
+    resposta = await banco.table("membros").select(resolver_campos("membros", campos)).eq("id", membro_id).execute()
     if not resposta.data:
         raise HTTPException(status_code=404, detail="Membro não encontrado")
     return resposta.data[0]
 
 
-@app.post("/api/membros", status_code=201, tags=["Membros"], summary="Criar novo membro")
-def criar_membro(membro: MembroCriar):
+@app.post("/api/membros", status_code=201, tags=["Membros"], summary="Criar novo membro",
+          response_model=MembroResposta, response_model_exclude_unset=True)
+async def criar_membro(membro: MembroCriar):
     """Cadastra um novo membro vinculado a uma igreja."""
     dados = {
         "nome_completo": membro.nome_completo,
@@ -387,12 +516,13 @@ def criar_membro(membro: MembroCriar):
         "igreja_id": membro.igreja_id,
         "codigo_igreja": membro.codigo_igreja,
     }
-    resposta = supabase.table("membros").insert(dados).execute()
+    resposta = await banco.table("membros").insert(dados).execute()
     return resposta.data[0]
 
 
-@app.put("/api/membros/{membro_id}", tags=["Membros"], summary="Atualizar membro")
-def atualizar_membro(membro_id: str, atualizacao: MembroAtualizar):
+@app.put("/api/membros/{membro_id}", tags=["Membros"], summary="Atualizar membro",
+         response_model=MembroResposta, response_model_exclude_unset=True)
+async def atualizar_membro(membro_id: str, atualizacao: MembroAtualizar):
     """Atualiza os dados de um membro existente."""
     campos = {}
     if atualizacao.nome_completo is not None:
@@ -404,18 +534,22 @@ def atualizar_membro(membro_id: str, atualizacao: MembroAtualizar):
     if atualizacao.tipo is not None:
         campos["tipo"] = atualizacao.tipo
 
-    resposta = supabase.table("membros").update(campos).eq("id", membro_id).execute()
+    resposta = await banco.table("membros").update(campos).eq("id", membro_id).execute()
     if not resposta.data:
         raise HTTPException(status_code=404, detail="Membro não encontrado")
+    invalidar_perfil(membro_id)
     return resposta.data[0]
 
 
 @app.delete("/api/membros/{membro_id}", tags=["Membros"], summary="Remover membro")
-def remover_membro(membro_id: str):
+async def remover_membro(membro_id: str):
     """Remove um membro do sistema."""
-    resposta = supabase.table("membros").delete().eq("id", membro_id).execute()
+    resposta = await banco.table("membros").delete().eq("id", membro_id).execute()
     if not resposta.data:
         raise HTTPException(status_code=404, detail="Membro não encontrado")
+    invalidar_perfil(membro_id)
+    # As contribuições do membro saem junto (ON DELETE CASCADE)
+    invalidar_relatorios_igreja(resposta.data[0].get("igreja_id"))
     return {"mensagem": "Membro removido com sucesso", "membro": resposta.data[0]}
 
 
@@ -423,29 +557,51 @@ def remover_membro(membro_id: str):
 # ROTAS — EVENTOS
 # =============================================
 
-@app.get("/api/eventos", tags=["Eventos"], summary="Listar eventos")
-def listar_eventos(
+@app.get("/api/eventos", tags=["Eventos"], summary="Listar eventos",
+         response_model=List[EventoResposta], response_model_exclude_unset=True)
+async def listar_eventos(
+    response: Response,
     igreja_id: Optional[str] = Query(None, description="Filtrar por igreja (UUID)"),
+    campos: Optional[str] = Query(None, description="Colunas retornadas, separadas por vírgula (ex.: id,nome)"),
+    limite: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO, description="Quantidade máxima de itens por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da página seguinte (cabeçalho X-Proximo-Cursor)"),
 ):
     """Retorna a lista de eventos ordenados por data."""
-    query = supabase.table("eventos").select("*")
+    query = banco.table("eventos").select(
+        resolver_campos("eventos", campos, CAMPOS_LISTAGEM["eventos"], ("id", "data"))
+    )
     if igreja_id is not None:
         query = query.eq("igreja_id", igreja_id)
-    resposta = query.order("data").execute()
-    return resposta.data
+    resposta = await paginar(query, "data", limite, cursor).execute()
+    return montar_pagina(response, resposta.data, "data", limite)
+
 
+@app.get("/api/eventos/lote", tags=["Eventos"], summary="Buscar eventos por IDs",
+         response_model=BuscaLoteEventos, response_model_exclude_unset=True)
+async def buscar_eventos_em_lote(
+    ids: str = Query(..., description=f"IDs separados por vírgula (máx. {LIMITE_BUSCA_LOTE})"),
+    campos: Optional[str] = Query(None, description="Colunas retornadas, separadas por vírgula (ex.: id,nome)"),
+):
+    """Retorna os eventos pedidos com uma única consulta, na ordem dos ids, e lista os não encontrados."""
+    return await buscar_em_lote("eventos", ids, campos)
 
-@app.get("/api/eventos/{evento_id}", tags=["Eventos"], summary="Buscar evento por ID")
-def buscar_evento(evento_id: str):
+
+@app.get("/api/eventos/{evento_id}", tags=["Eventos"], summary="Buscar evento por ID",
+         response_model=EventoResposta, response_model_exclude_unset=True)
+async def buscar_evento(
+    evento_id: str,
+    campos: Optional[str] = Query(None, description="Colunas retornadas, separadas por vírgula (ex.: id,nome)"),
+):
     """Retorna os dados de um evento específico."""
-    resposta = supabase.table("eventos").select("*").eq("id", evento_id).execute()
+    resposta = await banco.table("eventos").select(resolver_campos("eventos", campos)).eq("id", evento_id).execute()
     if not resposta.data:
         raise HTTPException(status_code=404, detail="Evento não encontrado")
     return resposta.data[0]
 
 
-@app.post("/api/eventos", status_code=201, tags=["Eventos"], summary="Criar novo evento")
-def criar_evento(evento: EventoCriar):
+@app.post("/api/eventos", status_code=201, tags=["Eventos"], summary="Criar novo evento",
+          response_model=EventoResposta, response_model_exclude_unset=True)
+async def criar_evento(evento: EventoCriar):
     """Cria um novo evento vinculado a uma igreja."""
     dados = {
         "titulo": evento.titulo,
@@ -456,12 +612,13 @@ def criar_evento(evento: EventoCriar):
         "tipo": evento.tipo or "evento",
         "igreja_id": evento.igreja_id,
     }
-    resposta = supabase.table("eventos").insert(dados).execute()
+    resposta = await banco.table("eventos").insert(dados).execute()
     return resposta.data[0]
 
 
-@app.put("/api/eventos/{evento_id}", tags=["Eventos"], summary="Atualizar evento")
-def atualizar_evento(evento_id: str, atualizacao: EventoAtualizar):
+@app.put("/api/eventos/{evento_id}", tags=["Eventos"], summary="Atualizar evento",
+         response_model=EventoResposta, response_model_exclude_unset=True)
+async def atualizar_evento(evento_id: str, atualizacao: EventoAtualizar):
     """Atualiza os dados de um evento existente."""
     campos = {}
     if atualizacao.titulo is not None:
@@ -477,16 +634,16 @@ def atualizar_evento(evento_id: str, atualizacao: EventoAtualizar):
     if atualizacao.tipo is not None:
         campos["tipo"] = atualizacao.tipo
 
-    resposta = supabase.table("eventos").update(campos).eq("id", evento_id).execute()
+    resposta = await banco.table("eventos").update(campos).eq("id", evento_id).execute()
     if not resposta.data:
         raise HTTPException(status_code=404, detail="Evento não encontrado")
     return resposta.data[0]
 
 
 @app.delete("/api/eventos/{evento_id}", tags=["Eventos"], summary="Remover evento")
-def remover_evento(evento_id: str):
+async def remover_evento(evento_id: str):
     """Remove um evento do sistema."""
-    resposta = supabase.table("eventos").delete().eq("id", evento_id).execute()
+    resposta = await banco.table("eventos").delete().eq("id", evento_id).execute()
     if not resposta.data:
         raise HTTPException(status_code=404, detail="Evento não encontrado")
     return {"mensagem": "Evento removido com sucesso", "evento": resposta.data[0]}
@@ -496,72 +653,121 @@ def remover_evento(evento_id: str):
 # ROTAS — CONTRIBUIÇÕES
 # =============================================
 
-@app.get("/api/contribuicoes", tags=["Contribuições"], summary="Listar contribuições")
-def listar_contribuicoes(
+@app.get("/api/contribuicoes", tags=["Contribuições"], summary="Listar contribuições",
+         response_model=List[ContribuicaoResposta], response_model_exclude_unset=True)
+async def listar_contribuicoes(
+    response: Response,
     igreja_id: Optional[str] = Query(None, description="Filtrar por igreja (UUID)"),
     membro_id: Optional[str] = Query(None, description="Filtrar por membro (UUID)"),
     tipo: Optional[str] = Query(None, description="Filtrar por tipo"),
+    campos: Optional[str] = Query(None, description="Colunas retornadas, separadas por vírgula (ex.: id,nome)"),
+    limite: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO, description="Quantidade máxima de itens por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da página seguinte (cabeçalho X-Proximo-Cursor)"),
 ):
     """Retorna a lista de contribuições com filtros opcionais."""
-    query = supabase.table("contribuicoes").select("*")
+    query = banco.table("contribuicoes").select(
+        resolver_campos("contribuicoes", campos, CAMPOS_LISTAGEM["contribuicoes"], ("id", "data"))
+    )
     if igreja_id is not None:
         query = query.eq("igreja_id", igreja_id)
     if membro_id is not None:
         query = query.eq("membro_id", membro_id)
     if tipo is not None:
         query = query.eq("tipo", tipo)
-    resposta = query.order("data", desc=True).execute()
-    return resposta.data
+    resposta = await paginar(query, "data", limite, cursor, desc=True).execute()
+    return montar_pagina(response, resposta.data, "data", limite)
 
 
-@app.get("/api/contribuicoes/{contribuicao_id}", tags=["Contribuições"], summary="Buscar contribuição por ID")
-def buscar_contribuicao(contribuicao_id: str):
+@app.get("/api/contribuicoes/exportar", tags=["Contribuições"], summary="Exportar contribuições (CSV/NDJSON)")
+async def exportar_contribuicoes(
+    igreja_id: Optional[str] = Query(None, description="Filtrar por igreja (UUID)"),
+    membro_id: Optional[str] = Query(None, description="Filtrar por membro (UUID)"),
+    tipo: Optional[str] = Query(None, description="Filtrar por tipo"),
+    data_inicio: Optional[str] = Query(None, description="Data início YYYY-MM-DD (opcional)"),
+    data_fim: Optional[str] = Query(None, description="Data fim YYYY-MM-DD (opcional)"),
+    campos: Optional[str] = Query(None, description="Colunas exportadas, separadas por vírgula"),
+    formato: str = Query("csv", pattern="^(csv|ndjson)$", description="Formato: csv ou ndjson"),
+):
+    """
+    Exporta o histórico de contribuições em streaming.
+    As linhas são lidas do banco em lotes e enviadas à medida que chegam.
+    """
+    validar_periodo(data_inicio, data_fim)
+    colunas = resolver_campos("contribuicoes", campos, CAMPOS_LISTAGEM["contribuicoes"], ("id", "data"))
+
+    def criar_query():
+        query = banco.table("contribuicoes").select(colunas)
+        if igreja_id is not None:
+            query = query.eq("igreja_id", igreja_id)
+        if membro_id is not None:
+            query = query.eq("membro_id", membro_id)
+        if tipo is not None:
+            query = query.eq("tipo", tipo)
+        if data_inicio is not None:
+            query = query.gte("data", data_inicio)
+        if data_fim is not None:
+            query = query.lte("data", data_fim)
+        return query
+
+    linhas = percorrer_em_lotes(criar_query, "data", desc=True)
+    return StreamingResponse(
+        gerar_arquivo(linhas, formato, colunas.split(",")),
+        media_type=TIPOS_MIDIA[formato],
+        headers={"Content-Disposition": f'attachment; filename="contribuicoes.{formato}"'},
+    )
+
+
+@app.get("/api/contribuicoes/lote", tags=["Contribuições"], summary="Buscar contribuições por IDs",
+         response_model=BuscaLoteContribuicoes, response_model_exclude_unset=True)
+async def buscar_contribuicoes_em_lote(
+    ids: str = Query(..., description=f"IDs separados por vírgula (máx. {LIMITE_BUSCA_LOTE})"),
+    campos: Optional[str] = Query(None, description="Colunas retornadas, separadas por vírgula (ex.: id,nome)"),
+):
+    """Retorna as contribuições pedidos com uma única consulta, na ordem dos ids, e lista os não encontrados."""
+    return await buscar_em_lote("contribuicoes", ids, campos)
+
+
+@app.get("/api/contribuicoes/{contribuicao_id}", tags=["Contribuições"], summary="Buscar contribuição por ID",
+         response_model=ContribuicaoResposta, response_model_exclude_unset=True)
+async def buscar_contribuicao(
+    contribuicao_id: str,
+    campos: Optional[str] = Query(None, description="Colunas retornadas, separadas por vírgula (ex.: id,nome)"),
+):
     """Retorna os dados de uma contribuição específica."""
-    resposta = supabase.table("contribuicoes").select("*").eq("id", contribuicao_id).execute()
+    resposta = await banco.table("contribuicoes").select(resolver_campos("contribuicoes", campos)).eq("id", contribuicao_id).execute()
     if not resposta.data:
         raise HTTPException(status_code=404, detail="Contribuição não encontrada")
     return resposta.data[0]
 
 
-@app.post("/api/contribuicoes", status_code=201, tags=["Contribuições"], summary="Registrar contribuição")
-def criar_contribuicao(contribuicao: ContribuicaoCriar):
+@app.post("/api/contribuicoes", status_code=201, tags=["Contribuições"], summary="Registrar contribuição",
+          response_model=ContribuicaoResposta, response_model_exclude_unset=True)
+async def criar_contribuicao(contribuicao: ContribuicaoCriar):
     """Registra uma nova contribuição financeira."""
     # 1. Validar que o membro existe
-    resposta_membro = supabase.table("membros").select("nome_completo").eq("id", contribuicao.membro_id).execute()
+    resposta_membro = await banco.table("membros").select("nome_completo").eq("id", contribuicao.membro_id).execute()
     if not resposta_membro.data:
         raise HTTPException(status_code=404, detail="Membro não encontrado")
     
     nome_membro = resposta_membro.data[0]["nome_completo"]
     
-    # 2. Verificar duplicação (mesmo membro, tipo, valor, data ±1 dia)
-    from datetime import datetime, timedelta
-    data_obj = datetime.strptime(contribuicao.data, "%Y-%m-%d") if contribuicao.data else datetime.now()
-    data_inicio = (data_obj - timedelta(days=1)).strftime("%Y-%m-%d")
-    data_fim = (data_obj + timedelta(days=1)).strftime("%Y-%m-%d")
-    
-    duplicadas = supabase.table("contribuicoes").select("*").eq(
-        "membro_id", contribuicao.membro_id
-    ).eq("tipo", contribuicao.tipo).eq(
-        "valor", contribuicao.valor
-    ).gte("data", data_inicio).lte(
-        "data", data_fim
-    ).execute()
-    
-    aviso_duplicacao = None
-    if duplicadas.data:
-        aviso_duplicacao = f"Aviso: Encontrada {len(duplicadas.data)} contribuição(ões) similar(es) para este membro no período. Confirme se deseja registrar novamente."
-    
-    # 3. Preparar dados da contribuição
+    # 2. Preparar dados da contribuição
     dados = {
         "membro_id": contribuicao.membro_id,
         "igreja_id": contribuicao.igreja_id,
         "membro_nome": nome_membro,
         "tipo": contribuicao.tipo,
         "valor": contribuicao.valor,
-        "data": contribuicao.data or datetime.now().strftime("%Y-%m-%d"),
+        "data": data_contribuicao(contribuicao.data),
         "descricao": contribuicao.descricao or "",
     }
-    resposta = supabase.table("contribuicoes").insert(dados).execute()
+
+    # 3. Verificar duplicação (mesmo membro, tipo, valor, data ±1 dia)
+    [duplicadas] = await contar_duplicadas([dados])
+    aviso_duplicacao = mensagem_duplicacao(duplicadas) if duplicadas else None
+
+    resposta = await banco.table("contribuicoes").insert(dados).execute()
+    invalidar_relatorios(resposta.data[0])
     
     resultado = resposta.data[0]
     if aviso_duplicacao:
@@ -570,11 +776,107 @@ def criar_contribuicao(contribuicao: ContribuicaoCriar):
     return resultado
 
 
-@app.put("/api/contribuicoes/{contribuicao_id}", tags=["Contribuições"], summary="Atualizar contribuição")
-def atualizar_contribuicao(contribuicao_id: str, atualizacao: ContribuicaoAtualizar):
+@app.post("/api/contribuicoes/lote", status_code=201, tags=["Contribuições"], summary="Registrar contribuições em lote",
+          response_model=LoteContribuicoesResposta, response_model_exclude_unset=True)
+async def criar_contribuicoes_lote(contribuicoes: List[ContribuicaoCriar]):
+    """
+    Registra várias contribuições de uma vez (ex.: ofertas de um culto).
+    Membros, duplicações e inserção são resolvidos com uma consulta cada;
+    itens inválidos são reportados sem impedir o registro dos demais.
+    """
+    if len(contribuicoes) > LIMITE_LOTE_CONTRIBUICOES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"O lote aceita no máximo {LIMITE_LOTE_CONTRIBUICOES} contribuições",
+        )
+
+    resultados = [{"indice": i} for i in range(len(contribuicoes))]
+
+    # 1. Validar todos os membros com uma única consulta
+    # (ids fora do formato UUID fariam o Postgres recusar a consulta inteira)
+    membros = {}
+    ids_membros = sorted({uuid_canonico(c.membro_id) for c in contribuicoes} - {None})
+    if ids_membros:
+        resposta_membros = await banco.table("membros").select(
+            "id,nome_completo,igreja_id"
+        ).in_("id", ids_membros).execute()
+        membros = {m["id"]: m for m in resposta_membros.data or []}
+
+    # 2. Preparar os itens válidos
+    validos = []
+    for i, contribuicao in enumerate(contribuicoes):
+        erro = None
+        membro = membros.get(uuid_canonico(contribuicao.membro_id))
+        if membro is None:
+            erro = "Membro não encontrado"
+        elif uuid_canonico(contribuicao.igreja_id) != membro["igreja_id"]:
+            erro = "Membro não pertence à igreja informada"
+        elif contribuicao.tipo not in TIPOS_CONTRIBUICAO:
+            erro = "Tipo inválido"
+        else:
+            try:
+                datetime.strptime(data_contribuicao(contribuicao.data), "%Y-%m-%d")
+            except ValueError:
+                erro = "Data inválida (use AAAA-MM-DD)"
+        if erro:
+            resultados[i].update({"status": "erro", "erro": erro})
+            continue
+        validos.append((i, {
+            "membro_id": membro["id"],
+            "igreja_id": membro["igreja_id"],
+            "membro_nome": membro["nome_completo"],
+            "tipo": contribuicao.tipo,
+            "valor": contribuicao.valor,
+            "data": data_contribuicao(contribuicao.data),
+            "descricao": contribuicao.descricao or "",
+        }))
+
+    criadas = 0
+    if validos:
+        # 3. Detectar duplicações do lote inteiro com uma consulta
+        duplicadas = await contar_duplicadas([dados for _, dados in validos])
+
+        # 4. Inserir todas as linhas válidas de uma vez. O INSERT de várias
+        # linhas é atômico: se o banco recusar alguma, nada foi gravado e
+        # os itens são inseridos um a um para apontar quais falharam
+        try:
+            resposta = await banco.table("contribuicoes").insert(
+                [dados for _, dados in validos]
+            ).execute()
+            inseridas = resposta.data
+        except Exception:
+            inseridas = []
+            for i, dados in validos:
+                try:
+                    resposta = await banco.table("contribuicoes").insert(dados).execute()
+                    inseridas.append(resposta.data[0])
+                except Exception as e:
+                    inseridas.append(None)
+                    resultados[i].update({"status": "erro", "erro": f"Falha ao registrar: {e}"})
+        invalidar_relatorios(*[criada for criada in inseridas if criada])
+
+        for (i, _), criada, qtd in zip(validos, inseridas, duplicadas):
+            if criada is None:
+                continue
+            criadas += 1
+            resultados[i].update({"status": "criada", "contribuicao": criada})
+            if qtd:
+                resultados[i]["aviso"] = mensagem_duplicacao(qtd)
+
+    return {
+        "total": len(contribuicoes),
+        "criadas": criadas,
+        "erros": len(contribuicoes) - criadas,
+        "resultados": resultados,
+    }
+
+
+@app.put("/api/contribuicoes/{contribuicao_id}", tags=["Contribuições"], summary="Atualizar contribuição",
+         response_model=ContribuicaoResposta, response_model_exclude_unset=True)
+async def atualizar_contribuicao(contribuicao_id: str, atualizacao: ContribuicaoAtualizar):
     """Atualiza uma contribuição existente (tipo, valor, data, descrição)."""
     # 1. Buscar contribuição existente
-    resposta_atual = supabase.table("contribuicoes").select("*").eq("id", contribuicao_id).execute()
+    resposta_atual = await banco.table("contribuicoes").select("*").eq("id", contribuicao_id).execute()
     if not resposta_atual.data:
         raise HTTPException(status_code=404, detail="Contribuição não encontrada")
     
@@ -584,7 +886,7 @@ def atualizar_contribuicao(contribuicao_id: str, atualizacao: ContribuicaoAtuali
     }
     
     if atualizacao.tipo is not None:
-        if atualizacao.tipo not in ["dizimo", "oferta", "doacao", "outro"]:
+        if atualizacao.tipo not in TIPOS_CONTRIBUICAO:
             raise HTTPException(status_code=400, detail="Tipo inválido")
         dados_atualizacao["tipo"] = atualizacao.tipo
     
@@ -600,19 +902,21 @@ def atualizar_contribuicao(contribuicao_id: str, atualizacao: ContribuicaoAtuali
         dados_atualizacao["descricao"] = atualizacao.descricao
     
     # 3. Executar atualização
-    resposta = supabase.table("contribuicoes").update(dados_atualizacao).eq("id", contribuicao_id).execute()
+    resposta = await banco.table("contribuicoes").update(dados_atualizacao).eq("id", contribuicao_id).execute()
     if not resposta.data:
         raise HTTPException(status_code=500, detail="Erro ao atualizar contribuição")
+    invalidar_relatorios(resposta_atual.data[0], resposta.data[0])
     
     return resposta.data[0]
 
 
 @app.delete("/api/contribuicoes/{contribuicao_id}", tags=["Contribuições"], summary="Remover contribuição")
-def remover_contribuicao(contribuicao_id: str):
+async def remover_contribuicao(contribuicao_id: str):
     """Remove uma contribuição do sistema."""
-    resposta = supabase.table("contribuicoes").delete().eq("id", contribuicao_id).execute()
+    resposta = await banco.table("contribuicoes").delete().eq("id", contribuicao_id).execute()
     if not resposta.data:
         raise HTTPException(status_code=404, detail="Contribuição não encontrada")
+    invalidar_relatorios(resposta.data[0])
     return {"mensagem": "Contribuição removida com sucesso", "contribuicao": resposta.data[0]}
 
 
@@ -620,29 +924,41 @@ def remover_contribuicao(contribuicao_id: str):
 # ROTAS — COMUNICADOS
 # =============================================
 
-@app.get("/api/comunicados", tags=["Comunicados"], summary="Listar comunicados")
-def listar_comunicados(
+@app.get("/api/comunicados", tags=["Comunicados"], summary="Listar comunicados",
+         response_model=List[ComunicadoResposta], response_model_exclude_unset=True)
+async def listar_comunicados(
+    response: Response,
     igreja_id: Optional[str] = Query(None, description="Filtrar por igreja (UUID)"),
+    campos: Optional[str] = Query(None, description="Colunas retornadas, separadas por vírgula (ex.: id,nome)"),
+    limite: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO, description="Quantidade máxima de itens por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da página seguinte (cabeçalho X-Proximo-Cursor)"),
 ):
     """Retorna a lista de comunicados."""
-    query = supabase.table("comunicados").select("*")
+    query = banco.table("comunicados").select(
+        resolver_campos("comunicados", campos, CAMPOS_LISTAGEM["comunicados"], ("id", "criado_em"))
+    )
     if igreja_id is not None:
         query = query.eq("igreja_id", igreja_id)
-    resposta = query.order("criado_em", desc=True).execute()
-    return resposta.data
+    resposta = await paginar(query, "criado_em", limite, cursor, desc=True).execute()
+    return montar_pagina(response, resposta.data, "criado_em", limite)
 
 
-@app.get("/api/comunicados/{comunicado_id}", tags=["Comunicados"], summary="Buscar comunicado por ID")
-def buscar_comunicado(comunicado_id: str):
+@app.get("/api/comunicados/{comunicado_id}", tags=["Comunicados"], summary="Buscar comunicado por ID",
+         response_model=ComunicadoResposta, response_model_exclude_unset=True)
+async def buscar_comunicado(
+    comunicado_id: str,
+    campos: Optional[str] = Query(None, description="Colunas retornadas, separadas por vírgula (ex.: id,nome)"),
+):
     """Retorna os dados de um comunicado específico."""
-    resposta = supabase.table("comunicados").select("*").eq("id", comunicado_id).execute()
+    resposta = await banco.table("comunicados").select(resolver_campos("comunicados", campos)).eq("id", comunicado_id).execute()
     if not resposta.data:
         raise HTTPException(status_code=404, detail="Comunicado não encontrado")
     return resposta.data[0]
 
 
-@app.post("/api/comunicados", status_code=201, tags=["Comunicados"], summary="Criar comunicado")
-def criar_comunicado(comunicado: ComunicadoCriar):
+@app.post("/api/comunicados", status_code=201, tags=["Comunicados"], summary="Criar comunicado",
+          response_model=ComunicadoResposta, response_model_exclude_unset=True)
+async def criar_comunicado(comunicado: ComunicadoCriar):
     """Cria um novo comunicado para a igreja."""
     dados = {
         "igreja_id": comunicado.igreja_id,
@@ -650,12 +966,13 @@ def criar_comunicado(comunicado: ComunicadoCriar):
         "conteudo": comunicado.conteudo,
         "prioridade": comunicado.prioridade or "normal",
     }
-    resposta = supabase.table("comunicados").insert(dados).execute()
+    resposta = await banco.table("comunicados").insert(dados).execute()
     return resposta.data[0]
 
 
-@app.put("/api/comunicados/{comunicado_id}", tags=["Comunicados"], summary="Atualizar comunicado")
-def atualizar_comunicado(comunicado_id: str, atualizacao: ComunicadoAtualizar):
+@app.put("/api/comunicados/{comunicado_id}", tags=["Comunicados"], summary="Atualizar comunicado",
+         response_model=ComunicadoResposta, response_model_exclude_unset=True)
+async def atualizar_comunicado(comunicado_id: str, atualizacao: ComunicadoAtualizar):
     """Atualiza os dados de um comunicado existente."""
     campos = {}
     if atualizacao.titulo is not None:
@@ -665,16 +982,16 @@ def atualizar_comunicado(comunicado_id: str, atualizacao: ComunicadoAtualizar):
     if atualizacao.prioridade is not None:
         campos["prioridade"] = atualizacao.prioridade
 
-    resposta = supabase.table("comunicados").update(campos).eq("id", comunicado_id).execute()
+    resposta = await banco.table("comunicados").update(campos).eq("id", comunicado_id).execute()
     if not resposta.data:
         raise HTTPException(status_code=404, detail="Comunicado não encontrado")
     return resposta.data[0]
 
 
 @app.delete("/api/comunicados/{comunicado_id}", tags=["Comunicados"], summary="Remover comunicado")
-def remover_comunicado(comunicado_id: str):
+async def remover_comunicado(comunicado_id: str):
     """Remove um comunicado do sistema."""
-    resposta = supabase.table("comunicados").delete().eq("id", comunicado_id).execute()
+    resposta = await banco.table("comunicados").delete().eq("id", comunicado_id).execute()
     if not resposta.data:
         raise HTTPException(status_code=404, detail="Comunicado não encontrado")
     return {"mensagem": "Comunicado removido com sucesso", "comunicado": resposta.data[0]}
@@ -684,35 +1001,47 @@ def remover_comunicado(comunicado_id: str):
 # ROTAS — PEDIDOS DE ORAÇÃO
 # =============================================
 
-@app.get("/api/pedidos-oracao", tags=["Pedidos de Oração"], summary="Listar pedidos de oração")
-def listar_pedidos_oracao(
+@app.get("/api/pedidos-oracao", tags=["Pedidos de Oração"], summary="Listar pedidos de oração",
+         response_model=List[PedidoOracaoResposta], response_model_exclude_unset=True)
+async def listar_pedidos_oracao(
+    response: Response,
     igreja_id: Optional[str] = Query(None, description="Filtrar por igreja (UUID)"),
     membro_id: Optional[str] = Query(None, description="Filtrar por membro (UUID)"),
     status: Optional[str] = Query(None, description="Filtrar por status"),
+    campos: Optional[str] = Query(None, description="Colunas retornadas, separadas por vírgula (ex.: id,nome)"),
+    limite: int = Query(LIMITE_PADRAO, ge=1, le=LIMITE_MAXIMO, description="Quantidade máxima de itens por página"),
+    cursor: Optional[str] = Query(None, description="Cursor da página seguinte (cabeçalho X-Proximo-Cursor)"),
 ):
     """Retorna a lista de pedidos de oração com filtros opcionais."""
-    query = supabase.table("pedidos_oracao").select("*")
+    query = banco.table("pedidos_oracao").select(
+        resolver_campos("pedidos_oracao", campos, CAMPOS_LISTAGEM["pedidos_oracao"], ("id", "criado_em"))
+    )
     if igreja_id is not None:
         query = query.eq("igreja_id", igreja_id)
     if membro_id is not None:
         query = query.eq("membro_id", membro_id)
     if status is not None:
         query = query.eq("status", status)
-    resposta = query.order("criado_em", desc=True).execute()
-    return resposta.data
+    resposta = await paginar(query, "criado_em", limite, cursor, desc=True).execute()
+    return montar_pagina(response, resposta.data, "criado_em", limite)
 
 
-@app.get("/api/pedidos-oracao/{pedido_id}", tags=["Pedidos de Oração"], summary="Buscar pedido por ID")
-def buscar_pedido_oracao(pedido_id: str):
+@app.get("/api/pedidos-oracao/{pedido_id}", tags=["Pedidos de Oração"], summary="Buscar pedido por ID",
+         response_model=PedidoOracaoResposta, response_model_exclude_unset=True)
+async def buscar_pedido_oracao(
+    pedido_id: str,
+    campos: Optional[str] = Query(None, description="Colunas retornadas, separadas por vírgula (ex.: id,nome)"),
+):
     """Retorna os dados de um pedido de oração específico."""
-    resposta = supabase.table("pedidos_oracao").select("*").eq("id", pedido_id).execute()
+    resposta = await banco.table("pedidos_oracao").select(resolver_campos("pedidos_oracao", campos)).eq("id", pedido_id).execute()
     if not resposta.data:
         raise HTTPException(status_code=404, detail="Pedido de oração não encontrado")
     return resposta.data[0]
 
 
-@app.post("/api/pedidos-oracao", status_code=201, tags=["Pedidos de Oração"], summary="Criar pedido de oração")
-def criar_pedido_oracao(pedido: PedidoOracaoCriar):
+@app.post("/api/pedidos-oracao", status_code=201, tags=["Pedidos de Oração"], summary="Criar pedido de oração",
+          response_model=PedidoOracaoResposta, response_model_exclude_unset=True)
+async def criar_pedido_oracao(pedido: PedidoOracaoCriar):
     """Cria um novo pedido de oração."""
     dados = {
         "igreja_id": pedido.igreja_id,
@@ -721,12 +1050,13 @@ def criar_pedido_oracao(pedido: PedidoOracaoCriar):
         "pedido": pedido.pedido,
         "status": "pendente",
     }
-    resposta = supabase.table("pedidos_oracao").insert(dados).execute()
+    resposta = await banco.table("pedidos_oracao").insert(dados).execute()
     return resposta.data[0]
 
 
-@app.put("/api/pedidos-oracao/{pedido_id}", tags=["Pedidos de Oração"], summary="Atualizar pedido de oração")
-def atualizar_pedido_oracao(pedido_id: str, atualizacao: PedidoOracaoAtualizar):
+@app.put("/api/pedidos-oracao/{pedido_id}", tags=["Pedidos de Oração"], summary="Atualizar pedido de oração",
+         response_model=PedidoOracaoResposta, response_model_exclude_unset=True)
+async def atualizar_pedido_oracao(pedido_id: str, atualizacao: PedidoOracaoAtualizar):
     """Atualiza os dados de um pedido de oração."""
     campos = {}
     if atualizacao.pedido is not None:
@@ -741,16 +1071,16 @@ def atualizar_pedido_oracao(pedido_id: str, atualizacao: PedidoOracaoAtualizar):
         from datetime import datetime, timezone
         campos["respondido_em"] = datetime.now(timezone.utc).isoformat()
 
-    resposta = supabase.table("pedidos_oracao").update(campos).eq("id", pedido_id).execute()
+    resposta = await banco.table("pedidos_oracao").update(campos).eq("id", pedido_id).execute()
     if not resposta.data:
         raise HTTPException(status_code=404, detail="Pedido de oração não encontrado")
     return resposta.data[0]
 
 
 @app.delete("/api/pedidos-oracao/{pedido_id}", tags=["Pedidos de Oração"], summary="Remover pedido de oração")
-def remover_pedido_oracao(pedido_id: str):
+async def remover_pedido_oracao(pedido_id: str):
     """Remove um pedido de oração do sistema."""
-    resposta = supabase.table("pedidos_oracao").delete().eq("id", pedido_id).execute()
+    resposta = await banco.table("pedidos_oracao").delete().eq("id", pedido_id).execute()
     if not resposta.data:
         raise HTTPException(status_code=404, detail="Pedido de oração não encontrado")
     return {"mensagem": "Pedido removido com sucesso", "pedido": resposta.data[0]}
@@ -760,26 +1090,38 @@ def remover_pedido_oracao(pedido_id: str):
 # ROTAS — RELATÓRIOS FINANCEIROS
 # =============================================
 
-@app.get("/api/relatorios/resumo-mensal", tags=["Relatórios"], summary="Resumo mensal de contribuições")
-def get_resumo_mensal(
+@app.get("/api/relatorios/resumo-mensal", tags=["Relatórios"], summary="Resumo mensal de contribuições",
+         response_model=RelatorioResumoMensal, response_model_exclude_unset=True)
+async def get_resumo_mensal(
+    igreja_id: str = Query(..., description="Igreja do relatório (UUID)"),
     data_inicio: str = Query(..., description="Data início YYYY-MM-DD"),
     data_fim: str = Query(..., description="Data fim YYYY-MM-DD"),
 ):
     """Retorna resumo mensal de contribuições (total por mês e por tipo)."""
-    resultado = resumo_mensal(data_inicio, data_fim)
+    validar_periodo(data_inicio, data_fim)
+    resultado = await obter_relatorio(
+        "resumo_mensal",
+        {"data_inicio": data_inicio, "data_fim": data_fim},
+        anos_do_periodo(data_inicio, data_fim),
+        lambda: resumo_mensal(igreja_id, data_inicio, data_fim),
+        igreja_id=igreja_id,
+    )
     if "erro" in resultado:
         raise HTTPException(status_code=500, detail=resultado["erro"])
     return resultado
 
 
-@app.get("/api/relatorios/historico/{membro_id}", tags=["Relatórios"], summary="Histórico de membro")
-def get_historico_membro(
+@app.get("/api/relatorios/historico/{membro_id}", tags=["Relatórios"], summary="Histórico de membro",
+         response_model=RelatorioHistoricoMembro, response_model_exclude_unset=True)
+async def get_historico_membro(
     membro_id: str,
+    igreja_id: str = Query(..., description="Igreja do relatório (UUID)"),
     data_inicio: str = Query(None, description="Data início YYYY-MM-DD (opcional)"),
     data_fim: str = Query(None, description="Data fim YYYY-MM-DD (opcional)"),
 ):
     """Retorna histórico de contribuições de um membro específico."""
-    resultado = historico_membro(membro_id, data_inicio, data_fim)
+    validar_periodo(data_inicio, data_fim)
+    resultado = await historico_membro(igreja_id, membro_id, data_inicio, data_fim)
     if "status" in resultado and resultado["status"] == 404:
         raise HTTPException(status_code=404, detail=resultado["erro"])
     if "erro" in resultado:
@@ -787,60 +1129,93 @@ def get_historico_membro(
     return resultado
 
 
-@app.get("/api/relatorios/comparativo-anual", tags=["Relatórios"], summary="Comparativo anual")
-def get_comparativo_anual(
+@app.get("/api/relatorios/comparativo-anual", tags=["Relatórios"], summary="Comparativo anual",
+         response_model=RelatorioComparativoAnual, response_model_exclude_unset=True)
+async def get_comparativo_anual(
+    igreja_id: str = Query(..., description="Igreja do relatório (UUID)"),
     ano1: str = Query(..., description="Primeiro ano YYYY"),
     ano2: str = Query(..., description="Segundo ano YYYY"),
 ):
-    """Compara contribuições entre dois anos (mês a mês)."""
-    resultado = comparativo_anual(ano1, ano2)
+    """Compara contribuições entre dois anos (mês a mês). Anos encerrados ficam em cache."""
+    resultado = await obter_relatorio(
+        "comparativo_anual",
+        {"ano1": ano1, "ano2": ano2},
+        anos_informados(ano1, ano2),
+        lambda: comparativo_anual(igreja_id, ano1, ano2),
+        igreja_id=igreja_id,
+    )
     if "erro" in resultado:
         raise HTTPException(status_code=500, detail=resultado["erro"])
     return resultado
 
 
-@app.get("/api/relatorios/top-contribuintes", tags=["Relatórios"], summary="Top contribuintes")
-def get_top_contribuintes(
+@app.get("/api/relatorios/top-contribuintes", tags=["Relatórios"], summary="Top contribuintes",
+         response_model=RelatorioTopContribuintes, response_model_exclude_unset=True)
+async def get_top_contribuintes(
+    igreja_id: str = Query(..., description="Igreja do relatório (UUID)"),
     limite: int = Query(10, description="Quantidade máxima de resultados"),
     data_inicio: str = Query(None, description="Data início YYYY-MM-DD (opcional)"),
     data_fim: str = Query(None, description="Data fim YYYY-MM-DD (opcional)"),
 ):
     """Retorna ranking dos maiores contribuintes no período."""
-    resultado = top_contribuintes(limite, data_inicio, data_fim)
+    validar_periodo(data_inicio, data_fim)
+    resultado = await top_contribuintes(igreja_id, limite, data_inicio, data_fim)
     if "erro" in resultado:
         raise HTTPException(status_code=500, detail=resultado["erro"])
     return resultado
 
 
-@app.get("/api/relatorios/inadimplentes", tags=["Relatórios"], summary="Membros inadimplentes")
-def get_inadimplentes(
+@app.get("/api/relatorios/inadimplentes", tags=["Relatórios"], summary="Membros inadimplentes",
+         response_model=RelatorioInadimplentes, response_model_exclude_unset=True)
+async def get_inadimplentes(
+    igreja_id: str = Query(..., description="Igreja do relatório (UUID)"),
     dias_atraso: int = Query(30, description="Dias de atraso (padrão 30 dias)"),
 ):
     """Retorna membros com pagamentos atrasados."""
-    resultado = inadimplentes(dias_atraso)
+    resultado = await inadimplentes(igreja_id, dias_atraso)
     if "erro" in resultado:
         raise HTTPException(status_code=500, detail=resultado["erro"])
     return resultado
 
 
-@app.get("/api/relatorios/fluxo-caixa", tags=["Relatórios"], summary="Fluxo de caixa")
-def get_fluxo_caixa(
+@app.get("/api/relatorios/fluxo-caixa", tags=["Relatórios"], summary="Fluxo de caixa",
+         response_model=RelatorioFluxoCaixa, response_model_exclude_unset=True)
+async def get_fluxo_caixa(
+    igreja_id: str = Query(..., description="Igreja do relatório (UUID)"),
     data_inicio: str = Query(..., description="Data início YYYY-MM-DD"),
     data_fim: str = Query(..., description="Data fim YYYY-MM-DD"),
 ):
     """Retorna fluxo de caixa dia a dia com saldo acumulado."""
-    resultado = fluxo_caixa(data_inicio, data_fim)
+    validar_periodo(data_inicio, data_fim)
+    resultado = await fluxo_caixa(igreja_id, data_inicio, data_fim)
     if "erro" in resultado:
         raise HTTPException(status_code=500, detail=resultado["erro"])
     return resultado
 
 
+@app.get("/api/relatorios/fluxo-caixa/exportar", tags=["Relatórios"], summary="Exportar fluxo de caixa (streaming)")
+async def exportar_fluxo_caixa(
+    igreja_id: str = Query(..., description="Igreja do relatório (UUID)"),
+    data_inicio: str = Query(..., description="Data início YYYY-MM-DD"),
+    data_fim: str = Query(..., description="Data fim YYYY-MM-DD"),
+    formato: str = Query("ndjson", pattern="^(csv|ndjson)$", description="Formato: csv ou ndjson"),
+):
+    """Fluxo de caixa dia a dia em streaming (no CSV os detalhes de cada dia são omitidos)."""
+    validar_periodo(data_inicio, data_fim)
+    dias = fluxo_caixa_por_dia(igreja_id, data_inicio, data_fim)
+    return StreamingResponse(
+        gerar_arquivo(dias, formato, ["data", "entrada", "quantidade", "saldo_acumulado"]),
+        media_type=TIPOS_MIDIA[formato],
+        headers={"Content-Disposition": f'attachment; filename="fluxo-caixa.{formato}"'},
+    )
+
+
 # =============================================
 # ROTA RAIZ
 # =============================================
 
 @app.get("/", tags=["Info"], summary="Informações da API")
-def raiz():
+async def raiz():
     """Retorna informações gerais sobre a API."""
     return {
         "nome": "CongregaFiel API — Backend Principal (FastAPI + Supabase)",
@@ -858,5 +1233,12 @@ def raiz():
             "contribuicoes": "/api/contribuicoes",
             "comunicados": "/api/comunicados",
             "pedidos_oracao": "/api/pedidos-oracao",
+            "metricas": "/metrics",
         },
     }
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metricas():
+    """Métricas no formato de exposição do Prometheus."""
+    return Response(content=gerar_metricas(), media_type=TIPO_MIDIA_METRICAS)
@@ -1,23 +1,89 @@
 # =============================================================
 # CongregaFiel — Cliente Supabase (FastAPI)
+# Cliente assíncrono: as rotas aguardam o PostgREST sem ocupar
+# threads do pool do AnyIO.
+# Todos os clientes compartilham um único pool HTTP keep-alive.
 # =============================================================
 
 import os
 from pathlib import Path
+from typing import Optional
+import httpx
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from supabase import AsyncClient, AsyncClientOptions
+from supabase_auth import AsyncMemoryStorage
 
 load_dotenv(Path(__file__).resolve().parent.parent / ".env")
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_SECRET_KEY = os.getenv("SUPABASE_SECRET_KEY")
 
-if not SUPABASE_URL or not SUPABASE_SECRET_KEY:
+SUPABASE_CONFIGURADO = bool(SUPABASE_URL and SUPABASE_SECRET_KEY)
+
+# Com ARMAZENAMENTO=sqlite os dados ficam locais e o Supabase só é
+# necessário para a autenticação (rotas /api/auth respondem 503 sem ele)
+if not SUPABASE_CONFIGURADO and os.getenv("ARMAZENAMENTO", "supabase").lower() != "sqlite":
     raise RuntimeError("SUPABASE_URL e SUPABASE_SECRET_KEY devem estar definidos no .env")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_SECRET_KEY)
+# -------------------- Pool HTTP --------------------
+POOL_MAX_CONEXOES = int(os.getenv("SUPABASE_POOL_MAX_CONEXOES", "100"))
+POOL_MAX_KEEPALIVE = int(os.getenv("SUPABASE_POOL_MAX_KEEPALIVE", "20"))
+POOL_KEEPALIVE_SEGUNDOS = float(os.getenv("SUPABASE_POOL_KEEPALIVE_SEGUNDOS", "30"))
+HTTP_TIMEOUT_SEGUNDOS = float(os.getenv("SUPABASE_HTTP_TIMEOUT_SEGUNDOS", "10"))
+HTTP_CONNECT_TIMEOUT_SEGUNDOS = float(os.getenv("SUPABASE_HTTP_CONNECT_TIMEOUT_SEGUNDOS", "5"))
+HTTP2_HABILITADO = os.getenv("SUPABASE_HTTP2", "true").lower() not in ("0", "false", "nao")
+
+
+def _http2_disponivel() -> bool:
+    """HTTP/2 exige o pacote `h2` (httpx[http2] em requirements.txt); sem ele o httpx usa HTTP/1.1."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def criar_transporte_http() -> httpx.AsyncClient:
+    """Cria o cliente httpx com pool de conexões keep-alive e timeouts configuráveis."""
+    return httpx.AsyncClient(
+        http2=HTTP2_HABILITADO and _http2_disponivel(),
+        limits=httpx.Limits(
+            max_connections=POOL_MAX_CONEXOES,
+            max_keepalive_connections=POOL_MAX_KEEPALIVE,
+            keepalive_expiry=POOL_KEEPALIVE_SEGUNDOS,
+        ),
+        timeout=httpx.Timeout(HTTP_TIMEOUT_SEGUNDOS, connect=HTTP_CONNECT_TIMEOUT_SEGUNDOS),
+        follow_redirects=True,
+    )
+
+
+http_client = criar_transporte_http()
+
+supabase: Optional[AsyncClient] = AsyncClient(
+    SUPABASE_URL,
+    SUPABASE_SECRET_KEY,
+    AsyncClientOptions(httpx_client=http_client),
+) if SUPABASE_CONFIGURADO else None
+
+
+def criar_cliente_auth() -> AsyncClient:
+    """
+    Cria cliente Supabase separado para auth (evita mudar sessão do principal).
+    A sessão fica em memória própria do cliente, mas o transporte HTTP
+    é o pool compartilhado — sem novo handshake TLS por login.
+    """
+    return AsyncClient(
+        SUPABASE_URL,
+        SUPABASE_SECRET_KEY,
+        AsyncClientOptions(
+            httpx_client=http_client,
+            storage=AsyncMemoryStorage(),
+            auto_refresh_token=False,
+            persist_session=False,
+        ),
+    )
 
 
-def criar_cliente_auth() -> Client:
-    """Cria cliente Supabase separado para auth (evita mudar sessão do principal)."""
-    return create_client(SUPABASE_URL, SUPABASE_SECRET_KEY)
+async def fechar_transporte_http() -> None:
+    """Fecha as conexões do pool HTTP compartilhado (shutdown do servidor)."""
+    await http_client.aclose()
@@ -0,0 +1,83 @@
+-- =============================================================
+-- CongregaFiel — Migração: Funções de agregação dos relatórios
+-- Os relatórios financeiros (api-fastapi/relatorios_utils.py) chamam
+-- estas funções via RPC e recebem apenas os totais agrupados,
+-- em vez de trafegar todas as linhas de contribuicoes.
+-- =============================================================
+
+-- Índice para os filtros por período usados em todos os relatórios
+CREATE INDEX IF NOT EXISTS idx_contribuicoes_data ON contribuicoes(data);
+
+-- =============================================
+-- Totais por mês e tipo (resumo_mensal / comparativo_anual)
+-- =============================================
+CREATE OR REPLACE FUNCTION public.relatorio_totais_mensais(
+  p_data_inicio DATE,
+  p_data_fim DATE
+)
+RETURNS TABLE (mes TEXT, tipo VARCHAR, total NUMERIC, quantidade BIGINT) AS $$
+  SELECT to_char(c.data, 'YYYY-MM') AS mes,
+         c.tipo,
+         SUM(c.valor) AS total,
+         COUNT(*) AS quantidade
+    FROM contribuicoes c
+   WHERE c.data BETWEEN p_data_inicio AND p_data_fim
+   GROUP BY 1, 2
+   ORDER BY 1, 2;
+$$ LANGUAGE sql STABLE;
+
+-- =============================================
+-- Ranking de contribuintes (top_contribuintes)
+-- =============================================
+CREATE OR REPLACE FUNCTION public.relatorio_top_contribuintes(
+  p_limite INTEGER DEFAULT 10,
+  p_data_inicio DATE DEFAULT NULL,
+  p_data_fim DATE DEFAULT NULL
+)
+RETURNS TABLE (membro_id UUID, nome VARCHAR, email VARCHAR, total NUMERIC, contribuicoes BIGINT) AS $$
+  SELECT c.membro_id,
+         COALESCE(m.nome_completo, 'Desconhecido') AS nome,
+         COALESCE(m.email, '') AS email,
+         SUM(c.valor) AS total,
+         COUNT(*) AS contribuicoes
+    FROM contribuicoes c
+    LEFT JOIN membros m ON m.id = c.membro_id
+   WHERE (p_data_inicio IS NULL OR c.data >= p_data_inicio)
+     AND (p_data_fim IS NULL OR c.data <= p_data_fim)
+   GROUP BY c.membro_id, m.nome_completo, m.email
+   ORDER BY total DESC
+   LIMIT p_limite;
+$$ LANGUAGE sql STABLE;
+
+-- =============================================
+-- Fluxo de caixa diário com saldo acumulado (fluxo_caixa)
+-- =============================================
+CREATE OR REPLACE FUNCTION public.relatorio_fluxo_caixa(
+  p_data_inicio DATE,
+  p_data_fim DATE
+)
+RETURNS TABLE (dia DATE, entrada NUMERIC, quantidade BIGINT, saldo_acumulado NUMERIC, detalhes JSONB) AS $$
+  SELECT d.dia,
+         d.entrada,
+         d.quantidade,
+         SUM(d.entrada) OVER (ORDER BY d.dia) AS saldo_acumulado,
+         d.detalhes
+    FROM (
+      SELECT c.data AS dia,
+             SUM(c.valor) AS entrada,
+             COUNT(*) AS quantidade,
+             jsonb_agg(jsonb_build_object(
+               'membro_id', c.membro_id,
+               'tipo', c.tipo,
+               'valor', c.valor
+             ) ORDER BY c.criado_em) AS detalhes
+        FROM contribuicoes c
+       WHERE c.data BETWEEN p_data_inicio AND p_data_fim
+       GROUP BY c.data
+    ) d
+   ORDER BY d.dia;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION public.relatorio_totais_mensais IS 'Soma e contagem de contribuições por mês (YYYY-MM) e tipo no período';
+COMMENT ON FUNCTION public.relatorio_top_contribuintes IS 'Ranking dos membros por valor total contribuído no período';
+COMMENT ON FUNCTION public.relatorio_fluxo_caixa IS 'Entradas por dia com saldo acumulado dentro do período';
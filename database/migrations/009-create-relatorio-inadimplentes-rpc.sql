@@ -0,0 +1,29 @@
+-- =============================================================
+-- CongregaFiel — Migração: Função do relatório de inadimplentes
+-- Resolve a última contribuição de todos os membros em uma única
+-- consulta (antes: uma consulta por membro a partir da API).
+-- =============================================================
+
+-- Índice para localizar a contribuição mais recente de cada membro
+CREATE INDEX IF NOT EXISTS idx_contribuicoes_membro_data ON contribuicoes(membro_id, data DESC);
+
+CREATE OR REPLACE FUNCTION public.relatorio_inadimplentes(
+  p_data_limite DATE
+)
+RETURNS TABLE (membro_id UUID, nome VARCHAR, email VARCHAR, ultima_contribuicao DATE) AS $$
+  SELECT m.id AS membro_id,
+         m.nome_completo AS nome,
+         COALESCE(m.email, '') AS email,
+         u.ultima_contribuicao
+    FROM membros m
+    LEFT JOIN LATERAL (
+      SELECT MAX(c.data) AS ultima_contribuicao
+        FROM contribuicoes c
+       WHERE c.membro_id = m.id
+    ) u ON TRUE
+   WHERE u.ultima_contribuicao IS NULL
+      OR u.ultima_contribuicao < p_data_limite
+   ORDER BY m.criado_em;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION public.relatorio_inadimplentes IS 'Membros sem contribuição desde p_data_limite (ou que nunca contribuíram), com a data da última';
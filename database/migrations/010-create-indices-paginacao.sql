@@ -0,0 +1,13 @@
+-- =============================================================
+-- CongregaFiel — Migração: Índices para paginação por cursor
+-- Cada listagem da API ordena por (coluna, id) e filtra a partir
+-- do último item da página anterior; estes índices compostos
+-- atendem o filtro por igreja + ordenação sem ordenar em memória.
+-- =============================================================
+
+CREATE INDEX IF NOT EXISTS idx_igrejas_criado_em_id ON igrejas(criado_em, id);
+CREATE INDEX IF NOT EXISTS idx_membros_igreja_criado_em_id ON membros(igreja_id, criado_em, id);
+CREATE INDEX IF NOT EXISTS idx_eventos_igreja_data_id ON eventos(igreja_id, data, id);
+CREATE INDEX IF NOT EXISTS idx_contribuicoes_igreja_data_id ON contribuicoes(igreja_id, data DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_comunicados_igreja_criado_em_id ON comunicados(igreja_id, criado_em DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_pedidos_oracao_igreja_criado_em_id ON pedidos_oracao(igreja_id, criado_em DESC, id DESC);
@@ -0,0 +1,96 @@
+-- =============================================================
+-- CongregaFiel — Migração: Livro-razão diário de contribuições
+-- Tabela de totais por (igreja, dia, tipo) mantida por trigger a
+-- cada INSERT/UPDATE/DELETE em contribuicoes. Os relatórios por
+-- mês/ano leem daqui e custam O(dias), não O(contribuições).
+-- =============================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.contribuicoes_diarias (
+  igreja_id UUID NOT NULL REFERENCES igrejas(id) ON DELETE CASCADE,
+  dia DATE NOT NULL,
+  tipo VARCHAR(20) NOT NULL,
+  total NUMERIC(14, 2) NOT NULL DEFAULT 0,
+  quantidade INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (igreja_id, dia, tipo)
+);
+
+CREATE INDEX IF NOT EXISTS idx_contribuicoes_diarias_dia ON public.contribuicoes_diarias(dia);
+
+ALTER TABLE public.contribuicoes_diarias ENABLE ROW LEVEL SECURITY;
+
+-- =============================================
+-- Trigger de manutenção incremental
+-- =============================================
+CREATE OR REPLACE FUNCTION public.atualizar_contribuicoes_diarias()
+RETURNS TRIGGER AS $$
+BEGIN
+  -- Remove a linha antiga do dia/tipo (UPDATE e DELETE)
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.data IS NOT NULL THEN
+    UPDATE public.contribuicoes_diarias
+       SET total = total - OLD.valor,
+           quantidade = quantidade - 1
+     WHERE igreja_id = OLD.igreja_id
+       AND dia = OLD.data
+       AND tipo = OLD.tipo;
+
+    DELETE FROM public.contribuicoes_diarias
+     WHERE igreja_id = OLD.igreja_id
+       AND dia = OLD.data
+       AND tipo = OLD.tipo
+       AND quantidade <= 0;
+  END IF;
+
+  -- Soma a linha nova (INSERT e UPDATE)
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.data IS NOT NULL THEN
+    INSERT INTO public.contribuicoes_diarias (igreja_id, dia, tipo, total, quantidade)
+    VALUES (NEW.igreja_id, NEW.data, NEW.tipo, NEW.valor, 1)
+    ON CONFLICT (igreja_id, dia, tipo) DO UPDATE
+       SET total = contribuicoes_diarias.total + EXCLUDED.total,
+           quantidade = contribuicoes_diarias.quantidade + 1;
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_contribuicoes_diarias ON contribuicoes;
+CREATE TRIGGER trigger_contribuicoes_diarias
+  AFTER INSERT OR UPDATE OF igreja_id, data, tipo, valor OR DELETE ON contribuicoes
+  FOR EACH ROW EXECUTE FUNCTION public.atualizar_contribuicoes_diarias();
+
+-- =============================================
+-- Carga inicial a partir das contribuições existentes
+-- =============================================
+LOCK TABLE contribuicoes IN SHARE ROW EXCLUSIVE MODE;
+
+TRUNCATE public.contribuicoes_diarias;
+
+INSERT INTO public.contribuicoes_diarias (igreja_id, dia, tipo, total, quantidade)
+SELECT igreja_id, data, tipo, SUM(valor), COUNT(*)
+  FROM contribuicoes
+ WHERE data IS NOT NULL
+ GROUP BY igreja_id, data, tipo;
+
+-- =============================================
+-- Relatórios mensais passam a ler o livro-razão
+-- =============================================
+CREATE OR REPLACE FUNCTION public.relatorio_totais_mensais(
+  p_data_inicio DATE,
+  p_data_fim DATE
+)
+RETURNS TABLE (mes TEXT, tipo VARCHAR, total NUMERIC, quantidade BIGINT) AS $$
+  SELECT to_char(d.dia, 'YYYY-MM') AS mes,
+         d.tipo,
+         SUM(d.total) AS total,
+         SUM(d.quantidade)::BIGINT AS quantidade
+    FROM public.contribuicoes_diarias d
+   WHERE d.dia BETWEEN p_data_inicio AND p_data_fim
+   GROUP BY 1, 2
+   ORDER BY 1, 2;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON TABLE public.contribuicoes_diarias IS 'Totais diários de contribuições por igreja e tipo, mantidos por trigger';
+
+COMMIT;
@@ -0,0 +1,21 @@
+-- =============================================================
+-- CongregaFiel — Migração: Impressão digital das contribuições
+-- Coluna gerada com o hash de (membro, tipo, valor, dia) usada na
+-- detecção de contribuições duplicadas. A API calcula as impressões
+-- do dia anterior, do próprio dia e do seguinte e consulta o índice
+-- com um único IN, em vez de varrer a tabela por faixa de datas.
+-- =============================================================
+
+-- O dia entra como número de dias desde 2000-01-01: subtração de datas
+-- é IMMUTABLE (date::text depende do DateStyle e não pode ser usado
+-- em coluna gerada).
+ALTER TABLE contribuicoes
+  ADD COLUMN IF NOT EXISTS impressao TEXT GENERATED ALWAYS AS (
+    md5(
+      membro_id::text || '|' || tipo || '|' || valor::text || '|' || (data - DATE '2000-01-01')::text
+    )
+  ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_contribuicoes_impressao ON contribuicoes(impressao);
+
+COMMENT ON COLUMN contribuicoes.impressao IS 'md5(membro_id|tipo|valor|dias desde 2000-01-01) — detecção de duplicadas';
@@ -0,0 +1,34 @@
+-- =============================================================
+-- CongregaFiel — Migração: Registro de igreja transacional
+-- Insere a igreja e o pastor (como membro) numa única chamada.
+-- Por ser uma função, as duas inserções rodam na mesma transação:
+-- ou as duas acontecem, ou nenhuma (antes: duas requisições e
+-- remoção compensatória do usuário do Auth a cada falha).
+-- =============================================================
+
+CREATE OR REPLACE FUNCTION public.registrar_igreja(
+  p_id UUID,
+  p_nome VARCHAR,
+  p_nome_pastor VARCHAR,
+  p_email VARCHAR,
+  p_codigo VARCHAR,
+  p_endereco TEXT DEFAULT NULL,
+  p_latitude DOUBLE PRECISION DEFAULT NULL,
+  p_longitude DOUBLE PRECISION DEFAULT NULL
+)
+RETURNS JSONB AS $$
+DECLARE
+  v_igreja igrejas;
+BEGIN
+  INSERT INTO igrejas (id, nome, nome_pastor, email, codigo, endereco, latitude, longitude)
+  VALUES (p_id, p_nome, p_nome_pastor, p_email, p_codigo, COALESCE(p_endereco, ''), p_latitude, p_longitude)
+  RETURNING * INTO v_igreja;
+
+  INSERT INTO membros (id, nome_completo, email, telefone, tipo, igreja_id, codigo_igreja)
+  VALUES (p_id, p_nome_pastor, p_email, '', 'pastor', p_id, p_codigo);
+
+  RETURN to_jsonb(v_igreja) - 'senha_hash';
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION public.registrar_igreja IS 'Cria a igreja e o pastor como membro na mesma transação; retorna a igreja criada';
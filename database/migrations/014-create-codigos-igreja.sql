@@ -0,0 +1,108 @@
+-- =============================================================
+-- CongregaFiel — Migração: Alocador de códigos de igreja
+-- Cada prefixo (2 letras) tem um contador; o n-ésimo código do
+-- prefixo é uma permutação do contador no espaço de sufixos
+-- (1000–9999), então nunca se repete e não precisa de novas
+-- tentativas. Quando o prefixo esgota o espaço, o sufixo ganha
+-- mais um dígito (10000–99999 e assim por diante, até 8).
+-- =============================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.codigos_igreja_prefixos (
+  prefixo VARCHAR(2) PRIMARY KEY,
+  digitos SMALLINT NOT NULL DEFAULT 4,
+  proximo BIGINT NOT NULL DEFAULT 0
+);
+
+ALTER TABLE public.codigos_igreja_prefixos ENABLE ROW LEVEL SECURITY;
+
+-- =============================================
+-- Alocação
+-- =============================================
+CREATE OR REPLACE FUNCTION public.alocar_codigo_igreja(
+  p_prefixo VARCHAR
+)
+RETURNS VARCHAR AS $$
+DECLARE
+  v_prefixo VARCHAR := upper(p_prefixo);
+  v_digitos SMALLINT;
+  v_n BIGINT;
+  v_base BIGINT;
+  v_capacidade BIGINT;
+  v_codigo VARCHAR;
+BEGIN
+  INSERT INTO public.codigos_igreja_prefixos (prefixo)
+  VALUES (v_prefixo)
+  ON CONFLICT (prefixo) DO NOTHING;
+
+  LOOP
+    -- O UPDATE trava a linha do prefixo: alocações concorrentes ficam em fila
+    UPDATE public.codigos_igreja_prefixos
+       SET proximo = proximo + 1
+     WHERE prefixo = v_prefixo
+    RETURNING digitos, proximo - 1 INTO v_digitos, v_n;
+
+    v_base := power(10, v_digitos - 1)::BIGINT;
+    v_capacidade := 9 * v_base;
+
+    IF v_n >= v_capacidade THEN
+      -- Prefixo esgotado: amplia o espaço com mais um dígito
+      IF v_digitos >= 8 THEN
+        RAISE EXCEPTION 'Códigos esgotados para o prefixo %', v_prefixo;
+      END IF;
+      UPDATE public.codigos_igreja_prefixos
+         SET digitos = digitos + 1,
+             proximo = 0
+       WHERE prefixo = v_prefixo;
+      CONTINUE;
+    END IF;
+
+    -- Permutação afim (7919 é primo com 2, 3 e 5, logo com a capacidade);
+    -- o deslocamento varia por prefixo para os códigos não começarem iguais
+    v_codigo := v_prefixo || (v_base + (7919 * v_n + abs(hashtext(v_prefixo)::BIGINT) % v_capacidade) % v_capacidade)::TEXT;
+
+    -- Pula códigos antigos, sorteados antes do alocador (índice UNIQUE de igrejas.codigo)
+    EXIT WHEN NOT EXISTS (SELECT 1 FROM igrejas WHERE codigo = v_codigo);
+  END LOOP;
+
+  RETURN v_codigo;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION public.alocar_codigo_igreja IS 'Próximo código livre do prefixo (2 letras + sufixo numérico), sem colisões';
+
+-- =============================================
+-- Registro de igreja passa a alocar o código
+-- =============================================
+DROP FUNCTION IF EXISTS public.registrar_igreja(UUID, VARCHAR, VARCHAR, VARCHAR, VARCHAR, TEXT, DOUBLE PRECISION, DOUBLE PRECISION);
+
+CREATE OR REPLACE FUNCTION public.registrar_igreja(
+  p_id UUID,
+  p_nome VARCHAR,
+  p_nome_pastor VARCHAR,
+  p_email VARCHAR,
+  p_prefixo VARCHAR,
+  p_endereco TEXT DEFAULT NULL,
+  p_latitude DOUBLE PRECISION DEFAULT NULL,
+  p_longitude DOUBLE PRECISION DEFAULT NULL
+)
+RETURNS JSONB AS $$
+DECLARE
+  v_codigo VARCHAR := public.alocar_codigo_igreja(p_prefixo);
+  v_igreja igrejas;
+BEGIN
+  INSERT INTO igrejas (id, nome, nome_pastor, email, codigo, endereco, latitude, longitude)
+  VALUES (p_id, p_nome, p_nome_pastor, p_email, v_codigo, COALESCE(p_endereco, ''), p_latitude, p_longitude)
+  RETURNING * INTO v_igreja;
+
+  INSERT INTO membros (id, nome_completo, email, telefone, tipo, igreja_id, codigo_igreja)
+  VALUES (p_id, p_nome_pastor, p_email, '', 'pastor', p_id, v_codigo);
+
+  RETURN to_jsonb(v_igreja) - 'senha_hash';
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION public.registrar_igreja IS 'Cria a igreja (com código alocado) e o pastor como membro na mesma transação; retorna a igreja criada';
+
+COMMIT;
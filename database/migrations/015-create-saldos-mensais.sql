@@ -0,0 +1,161 @@
+-- =============================================================
+-- CongregaFiel — Migração: Pontos de saldo acumulado por mês
+-- Para cada igreja e mês, o saldo acumulado de todas as
+-- contribuições até o fim daquele mês. É mantido a partir do
+-- livro-razão diário (contribuicoes_diarias), então depende de
+-- 011-create-contribuicoes-diarias.sql.
+-- O saldo de abertura de qualquer período passa a ser o último
+-- ponto anterior ao mês de início mais os dias desse mês até a
+-- véspera: no máximo ~30 linhas do livro-razão, não o histórico.
+-- =============================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS public.saldos_mensais (
+  igreja_id UUID NOT NULL REFERENCES igrejas(id) ON DELETE CASCADE,
+  mes DATE NOT NULL,                      -- primeiro dia do mês
+  saldo NUMERIC(14, 2) NOT NULL DEFAULT 0, -- acumulado até o fim do mês
+  PRIMARY KEY (igreja_id, mes)
+);
+
+ALTER TABLE public.saldos_mensais ENABLE ROW LEVEL SECURITY;
+
+-- =============================================
+-- Manutenção incremental
+-- =============================================
+
+-- Soma p_delta ao mês de p_dia e a todos os pontos seguintes da igreja
+-- (lançamentos no mês corrente tocam uma única linha)
+CREATE OR REPLACE FUNCTION public.aplicar_saldo_mensal(
+  p_igreja_id UUID,
+  p_dia DATE,
+  p_delta NUMERIC
+)
+RETURNS VOID AS $$
+DECLARE
+  v_mes DATE := date_trunc('month', p_dia)::DATE;
+BEGIN
+  IF p_delta = 0 THEN
+    RETURN;
+  END IF;
+
+  -- Mês ainda sem ponto: começa do saldo do ponto anterior
+  INSERT INTO public.saldos_mensais (igreja_id, mes, saldo)
+  SELECT p_igreja_id,
+         v_mes,
+         COALESCE((
+           SELECT s.saldo
+             FROM public.saldos_mensais s
+            WHERE s.igreja_id = p_igreja_id
+              AND s.mes < v_mes
+            ORDER BY s.mes DESC
+            LIMIT 1
+         ), 0)
+  ON CONFLICT (igreja_id, mes) DO NOTHING;
+
+  UPDATE public.saldos_mensais
+     SET saldo = saldo + p_delta
+   WHERE igreja_id = p_igreja_id
+     AND mes >= v_mes;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION public.atualizar_saldos_mensais()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM public.aplicar_saldo_mensal(OLD.igreja_id, OLD.dia, -OLD.total);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM public.aplicar_saldo_mensal(NEW.igreja_id, NEW.dia, NEW.total);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_saldos_mensais ON public.contribuicoes_diarias;
+CREATE TRIGGER trigger_saldos_mensais
+  AFTER INSERT OR UPDATE OF igreja_id, dia, total OR DELETE ON public.contribuicoes_diarias
+  FOR EACH ROW EXECUTE FUNCTION public.atualizar_saldos_mensais();
+
+-- =============================================
+-- Carga inicial a partir do livro-razão
+-- =============================================
+LOCK TABLE public.contribuicoes_diarias IN SHARE ROW EXCLUSIVE MODE;
+
+TRUNCATE public.saldos_mensais;
+
+INSERT INTO public.saldos_mensais (igreja_id, mes, saldo)
+SELECT m.igreja_id,
+       m.mes,
+       SUM(m.total) OVER (PARTITION BY m.igreja_id ORDER BY m.mes) AS saldo
+  FROM (
+    SELECT igreja_id, date_trunc('month', dia)::DATE AS mes, SUM(total) AS total
+      FROM public.contribuicoes_diarias
+     GROUP BY 1, 2
+  ) m;
+
+-- =============================================
+-- Saldo acumulado até o fim de um dia
+-- =============================================
+CREATE OR REPLACE FUNCTION public.relatorio_saldo_ate(
+  p_data DATE
+)
+RETURNS NUMERIC AS $$
+  SELECT COALESCE((
+           -- Último ponto de cada igreja antes do mês de p_data
+           SELECT SUM(p.saldo)
+             FROM (
+               SELECT DISTINCT ON (s.igreja_id) s.saldo
+                 FROM public.saldos_mensais s
+                WHERE s.mes < date_trunc('month', p_data)::DATE
+                ORDER BY s.igreja_id, s.mes DESC
+             ) p
+         ), 0)
+       + COALESCE((
+           -- Dias do próprio mês até p_data
+           SELECT SUM(d.total)
+             FROM public.contribuicoes_diarias d
+            WHERE d.dia >= date_trunc('month', p_data)::DATE
+              AND d.dia <= p_data
+         ), 0);
+$$ LANGUAGE sql STABLE;
+
+-- =============================================
+-- Fluxo de caixa: saldo acumulado desde o início do histórico
+-- =============================================
+CREATE OR REPLACE FUNCTION public.relatorio_fluxo_caixa(
+  p_data_inicio DATE,
+  p_data_fim DATE
+)
+RETURNS TABLE (dia DATE, entrada NUMERIC, quantidade BIGINT, saldo_acumulado NUMERIC, detalhes JSONB) AS $$
+  WITH abertura AS (
+    SELECT public.relatorio_saldo_ate(p_data_inicio - 1) AS saldo
+  )
+  SELECT d.dia,
+         d.entrada,
+         d.quantidade,
+         a.saldo + SUM(d.entrada) OVER (ORDER BY d.dia) AS saldo_acumulado,
+         d.detalhes
+    FROM abertura a
+   CROSS JOIN (
+      SELECT c.data AS dia,
+             SUM(c.valor) AS entrada,
+             COUNT(*) AS quantidade,
+             jsonb_agg(jsonb_build_object(
+               'membro_id', c.membro_id,
+               'tipo', c.tipo,
+               'valor', c.valor
+             ) ORDER BY c.criado_em) AS detalhes
+        FROM contribuicoes c
+       WHERE c.data BETWEEN p_data_inicio AND p_data_fim
+       GROUP BY c.data
+    ) d
+   ORDER BY d.dia;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON TABLE public.saldos_mensais IS 'Saldo acumulado de contribuições por igreja até o fim de cada mês, mantido por trigger';
+COMMENT ON FUNCTION public.relatorio_saldo_ate IS 'Saldo acumulado de todas as contribuições até o fim do dia informado';
+COMMENT ON FUNCTION public.relatorio_fluxo_caixa IS 'Entradas por dia com saldo acumulado desde o início do histórico';
+
+COMMIT;
@@ -0,0 +1,163 @@
+-- =============================================================
+-- CongregaFiel — Migração: Relatórios por igreja
+-- Todas as funções de relatório passam a receber p_igreja_id e
+-- filtram por ele primeiro, pelos índices compostos já existentes:
+--   contribuicoes(igreja_id, data DESC, id DESC)  (010-create-indices-paginacao.sql)
+--   contribuicoes_diarias(igreja_id, dia, tipo)   (chave primária)
+--   saldos_mensais(igreja_id, mes)                (chave primária)
+--   membros(igreja_id, criado_em, id)             (010-create-indices-paginacao.sql)
+-- O custo de cada relatório passa a depender só da igreja, não da
+-- plataforma inteira.
+-- Aplicar depois de 008-create-relatorios-rpc.sql,
+-- 009-create-relatorio-inadimplentes-rpc.sql, 011-create-contribuicoes-diarias.sql
+-- e 015-create-saldos-mensais.sql (substitui as funções deles).
+-- =============================================================
+
+BEGIN;
+
+-- Assinaturas antigas (sem igreja): removidas para não haver sobrecarga no PostgREST
+DROP FUNCTION IF EXISTS public.relatorio_totais_mensais(DATE, DATE);
+DROP FUNCTION IF EXISTS public.relatorio_top_contribuintes(INTEGER, DATE, DATE);
+DROP FUNCTION IF EXISTS public.relatorio_inadimplentes(DATE);
+DROP FUNCTION IF EXISTS public.relatorio_fluxo_caixa(DATE, DATE);
+DROP FUNCTION IF EXISTS public.relatorio_saldo_ate(DATE);
+
+-- =============================================
+-- Totais por mês e tipo (resumo_mensal / comparativo_anual)
+-- =============================================
+CREATE OR REPLACE FUNCTION public.relatorio_totais_mensais(
+  p_igreja_id UUID,
+  p_data_inicio DATE,
+  p_data_fim DATE
+)
+RETURNS TABLE (mes TEXT, tipo VARCHAR, total NUMERIC, quantidade BIGINT) AS $$
+  SELECT to_char(d.dia, 'YYYY-MM') AS mes,
+         d.tipo,
+         SUM(d.total) AS total,
+         SUM(d.quantidade)::BIGINT AS quantidade
+    FROM public.contribuicoes_diarias d
+   WHERE d.igreja_id = p_igreja_id
+     AND d.dia BETWEEN p_data_inicio AND p_data_fim
+   GROUP BY 1, 2
+   ORDER BY 1, 2;
+$$ LANGUAGE sql STABLE;
+
+-- =============================================
+-- Ranking de contribuintes (top_contribuintes)
+-- =============================================
+CREATE OR REPLACE FUNCTION public.relatorio_top_contribuintes(
+  p_igreja_id UUID,
+  p_limite INTEGER DEFAULT 10,
+  p_data_inicio DATE DEFAULT NULL,
+  p_data_fim DATE DEFAULT NULL
+)
+RETURNS TABLE (membro_id UUID, nome VARCHAR, email VARCHAR, total NUMERIC, contribuicoes BIGINT) AS $$
+  SELECT c.membro_id,
+         COALESCE(m.nome_completo, 'Desconhecido') AS nome,
+         COALESCE(m.email, '') AS email,
+         SUM(c.valor) AS total,
+         COUNT(*) AS contribuicoes
+    FROM contribuicoes c
+    LEFT JOIN membros m ON m.id = c.membro_id
+   WHERE c.igreja_id = p_igreja_id
+     AND (p_data_inicio IS NULL OR c.data >= p_data_inicio)
+     AND (p_data_fim IS NULL OR c.data <= p_data_fim)
+   GROUP BY c.membro_id, m.nome_completo, m.email
+   ORDER BY total DESC
+   LIMIT p_limite;
+$$ LANGUAGE sql STABLE;
+
+-- =============================================
+-- Inadimplentes (membros da igreja sem contribuição recente)
+-- =============================================
+CREATE OR REPLACE FUNCTION public.relatorio_inadimplentes(
+  p_igreja_id UUID,
+  p_data_limite DATE
+)
+RETURNS TABLE (membro_id UUID, nome VARCHAR, email VARCHAR, ultima_contribuicao DATE) AS $$
+  SELECT m.id AS membro_id,
+         m.nome_completo AS nome,
+         COALESCE(m.email, '') AS email,
+         u.ultima_contribuicao
+    FROM membros m
+    LEFT JOIN LATERAL (
+      SELECT MAX(c.data) AS ultima_contribuicao
+        FROM contribuicoes c
+       WHERE c.membro_id = m.id
+         AND c.igreja_id = p_igreja_id
+    ) u ON TRUE
+   WHERE m.igreja_id = p_igreja_id
+     AND (u.ultima_contribuicao IS NULL
+          OR u.ultima_contribuicao < p_data_limite)
+   ORDER BY m.criado_em;
+$$ LANGUAGE sql STABLE;
+
+-- =============================================
+-- Saldo acumulado da igreja até o fim de um dia
+-- =============================================
+CREATE OR REPLACE FUNCTION public.relatorio_saldo_ate(
+  p_igreja_id UUID,
+  p_data DATE
+)
+RETURNS NUMERIC AS $$
+  SELECT COALESCE((
+           -- Último ponto antes do mês de p_data
+           SELECT s.saldo
+             FROM public.saldos_mensais s
+            WHERE s.igreja_id = p_igreja_id
+              AND s.mes < date_trunc('month', p_data)::DATE
+            ORDER BY s.mes DESC
+            LIMIT 1
+         ), 0)
+       + COALESCE((
+           -- Dias do próprio mês até p_data
+           SELECT SUM(d.total)
+             FROM public.contribuicoes_diarias d
+            WHERE d.igreja_id = p_igreja_id
+              AND d.dia >= date_trunc('month', p_data)::DATE
+              AND d.dia <= p_data
+         ), 0);
+$$ LANGUAGE sql STABLE;
+
+-- =============================================
+-- Fluxo de caixa diário com saldo acumulado (fluxo_caixa)
+-- =============================================
+CREATE OR REPLACE FUNCTION public.relatorio_fluxo_caixa(
+  p_igreja_id UUID,
+  p_data_inicio DATE,
+  p_data_fim DATE
+)
+RETURNS TABLE (dia DATE, entrada NUMERIC, quantidade BIGINT, saldo_acumulado NUMERIC, detalhes JSONB) AS $$
+  WITH abertura AS (
+    SELECT public.relatorio_saldo_ate(p_igreja_id, p_data_inicio - 1) AS saldo
+  )
+  SELECT d.dia,
+         d.entrada,
+         d.quantidade,
+         a.saldo + SUM(d.entrada) OVER (ORDER BY d.dia) AS saldo_acumulado,
+         d.detalhes
+    FROM abertura a
+   CROSS JOIN (
+      SELECT c.data AS dia,
+             SUM(c.valor) AS entrada,
+             COUNT(*) AS quantidade,
+             jsonb_agg(jsonb_build_object(
+               'membro_id', c.membro_id,
+               'tipo', c.tipo,
+               'valor', c.valor
+             ) ORDER BY c.criado_em) AS detalhes
+        FROM contribuicoes c
+       WHERE c.igreja_id = p_igreja_id
+         AND c.data BETWEEN p_data_inicio AND p_data_fim
+       GROUP BY c.data
+    ) d
+   ORDER BY d.dia;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION public.relatorio_totais_mensais IS 'Soma e contagem de contribuições da igreja por mês (YYYY-MM) e tipo no período';
+COMMENT ON FUNCTION public.relatorio_top_contribuintes IS 'Ranking dos membros da igreja por valor total contribuído no período';
+COMMENT ON FUNCTION public.relatorio_inadimplentes IS 'Membros da igreja sem contribuição desde p_data_limite (ou que nunca contribuíram), com a data da última';
+COMMENT ON FUNCTION public.relatorio_saldo_ate IS 'Saldo acumulado das contribuições da igreja até o fim do dia informado';
+COMMENT ON FUNCTION public.relatorio_fluxo_caixa IS 'Entradas da igreja por dia com saldo acumulado desde o início do histórico';
+
+COMMIT;
@@ -196,7 +196,7 @@ class RelatoriosApp {
         }
 
         return await fetch(
-            `/api/relatorios/resumo-mensal?data_inicio=${dataInicio}&data_fim=${dataFim}`,
+            `/api/relatorios/resumo-mensal?igreja_id=${this.igrejaId}&data_inicio=${dataInicio}&data_fim=${dataFim}`,
             {
                 headers: { 'Authorization': `Bearer ${this.apiServico.token}` }
             }
@@ -213,10 +213,10 @@ class RelatoriosApp {
         }
 
         let url = `/api/relatorios/historico/${membroId}`;
-        const params = new URLSearchParams();
+        const params = new URLSearchParams({ igreja_id: this.igrejaId });
         if (dataInicio) params.append('data_inicio', dataInicio);
         if (dataFim) params.append('data_fim', dataFim);
-        if (params.toString()) url += `?${params.toString()}`;
+        url += `?${params.toString()}`;
 
         return await fetch(url, {
             headers: { 'Authorization': `Bearer ${this.apiServico.token}` }
@@ -232,7 +232,7 @@ class RelatoriosApp {
         }
 
         return await fetch(
-            `/api/relatorios/comparativo-anual?ano1=${ano1}&ano2=${ano2}`,
+            `/api/relatorios/comparativo-anual?igreja_id=${this.igrejaId}&ano1=${ano1}&ano2=${ano2}`,
             {
                 headers: { 'Authorization': `Bearer ${this.apiServico.token}` }
             }
@@ -244,7 +244,7 @@ class RelatoriosApp {
         const dataInicio = document.getElementById('data-inicio').value;
         const dataFim = document.getElementById('data-fim').value;
 
-        let url = `/api/relatorios/top-contribuintes?limite=${limite}`;
+        let url = `/api/relatorios/top-contribuintes?igreja_id=${this.igrejaId}&limite=${limite}`;
         if (dataInicio) url += `&data_inicio=${dataInicio}`;
         if (dataFim) url += `&data_fim=${dataFim}`;
 
@@ -257,7 +257,7 @@ class RelatoriosApp {
         const diasAtraso = document.getElementById('dias-atraso').value || 30;
 
         return await fetch(
-            `/api/relatorios/inadimplentes?dias_atraso=${diasAtraso}`,
+            `/api/relatorios/inadimplentes?igreja_id=${this.igrejaId}&dias_atraso=${diasAtraso}`,
             {
                 headers: { 'Authorization': `Bearer ${this.apiServico.token}` }
             }
@@ -273,7 +273,7 @@ class RelatoriosApp {
         }
 
         return await fetch(
-            `/api/relatorios/fluxo-caixa?data_inicio=${dataInicio}&data_fim=${dataFim}`,
+            `/api/relatorios/fluxo-caixa?igreja_id=${this.igrejaId}&data_inicio=${dataInicio}&data_fim=${dataFim}`,
             {
                 headers: { 'Authorization': `Bearer ${this.apiServico.token}` }
             }